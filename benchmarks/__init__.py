@@ -0,0 +1,19 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of the client hot paths. The bench_*.py modules follow the
+airspeed velocity (asv) layout: classes with `params`/`param_names`,
+`setup`/`teardown` and `time_*` methods, each parameterized by the
+size of a synthetic workload. Anything that needs a server runs
+against the in-process stand-in server of tests/standin.py.
+
+Run them from the repository root with
+
+    python -m benchmarks.run                 # all benchmarks, stored by commit
+    python -m benchmarks.run -b ssd --quick  # the smallest sizes only
+    python -m benchmarks.run --compare HEAD~1
+
+The results are kept in benchmarks/results/<machine>/<commit>.json so
+that the timings of different commits can be compared.
+"""
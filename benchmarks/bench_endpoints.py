@@ -0,0 +1,35 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of listing the endpoints of the stand-in server
+"""
+from .common import clear, client, dataset_file, ontology_file, server
+
+
+class TimeListing(object):
+    """Listing `items` datasets and ontologies"""
+    params = [10, 100]
+    param_names = ['items']
+
+    def setup(self, items):
+        store = server().store
+        with open(dataset_file(10, 20), 'rb') as f:
+            content = f.read()
+        with open(ontology_file(10), 'rb') as f:
+            owl = f.read()
+        for i in range(items):
+            store.post_dataset({}, {'file': ("bench{}.csv".format(i), content)})
+            store.post_owl({}, {'file': ("bench{}.ttl".format(i), owl)})
+        self.sn = client()
+
+    def teardown(self, items):
+        clear()
+
+    def time_datasets(self, items):
+        type(self.sn.datasets).items.fget.cache_clear()
+        self.sn.datasets.items
+
+    def time_ontologies(self, items):
+        type(self.sn.ontologies).items.fget.cache_clear()
+        self.sn.ontologies.items
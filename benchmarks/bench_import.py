@@ -0,0 +1,17 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of the import time of the package, in a fresh interpreter
+"""
+import subprocess
+import sys
+
+
+class TimeImport(object):
+    """`import <module>` in a new python process"""
+    params = ['serene', 'serene.core']
+    param_names = ['module']
+
+    def time_import(self, module):
+        subprocess.check_call([sys.executable, '-c', 'import {}'.format(module)])
@@ -0,0 +1,34 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of the materialization of datasets as RDF
+"""
+import io
+
+from serene.elements import SSD
+
+from .common import build_ssd, clear, client, dataset_file, ontology_file
+
+
+class TimeMaterialize(object):
+    """N-Triples of `rows` rows of a 10 column dataset"""
+    params = [1000, 100000]
+    param_names = ['rows']
+
+    def setup(self, rows):
+        self.sn = client()
+        dataset = self.sn.datasets.upload(dataset_file(10, 20))
+        ontology = self.sn.ontologies.upload(ontology_file(10))
+        self.ssd = build_ssd(SSD(dataset, [ontology]), 10)
+        # the same columns as the uploaded dataset, with more rows...
+        self.source = dataset_file(10, rows)
+
+    def teardown(self, rows):
+        clear()
+
+    def time_ntriples(self, rows):
+        self.ssd.materialize(self.source, io.StringIO())
+
+    def time_turtle(self, rows):
+        self.ssd.materialize(self.source, io.StringIO(), fmt='ttl')
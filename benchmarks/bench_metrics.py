@@ -0,0 +1,43 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of the schema matcher evaluation metrics
+"""
+import numpy as np
+import pandas as pd
+
+from serene.matcher.eval import average_accuracy, error_rate, precision_at_k, mrr
+from serene.matcher.eval import get_sorted_label_candidates
+
+
+class TimeMetrics(object):
+    """The metrics of `columns` predictions over 20 labels"""
+    params = [100, 1000, 10000]
+    param_names = ['columns']
+
+    def setup(self, columns):
+        rng = np.random.RandomState(0)
+        labels = np.array(["label{}".format(i) for i in range(20)], dtype=object)
+        self.y_true = labels[rng.randint(0, len(labels), columns)].tolist()
+        self.y_pred = labels[rng.randint(0, len(labels), columns)].tolist()
+
+        scores = rng.rand(columns, len(labels))
+        self.predictions = pd.DataFrame(scores, columns=["scores_" + l for l in labels])
+        self.predictions['column_id'] = np.arange(columns)
+        self.candidates = get_sorted_label_candidates(self.predictions, k=5)
+
+    def time_average_accuracy(self, columns):
+        average_accuracy(self.y_true, self.y_pred)
+
+    def time_error_rate(self, columns):
+        error_rate(self.y_true, self.y_pred)
+
+    def time_precision_at_k(self, columns):
+        precision_at_k(self.y_true, self.candidates, k=3)
+
+    def time_mrr(self, columns):
+        mrr(self.y_true, self.candidates)
+
+    def time_sorted_label_candidates(self, columns):
+        get_sorted_label_candidates(self.predictions, k=5)
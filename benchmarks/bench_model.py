@@ -0,0 +1,41 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of the conversion of the model predictions
+"""
+from serene.matcher.model import Model
+from serene.matcher.prediction import Prediction
+
+from .common import clear, client, dataset_file, server
+
+
+class TimePredictions(object):
+    """The predictions of a model for a dataset of `columns` columns"""
+    params = [10, 100, 1000]
+    param_names = ['columns']
+
+    def setup(self, columns):
+        store = server().store
+        self.sn = client()
+        dataset = self.sn.datasets.upload(dataset_file(columns, 20))
+
+        # label every other column with one of 10 classes...
+        classes = ["class{}".format(i) for i in range(10)] + ["unknown"]
+        labels = {str(c.id): classes[i % 10] for i, c in enumerate(dataset.columns) if i % 2 == 0}
+        key = store.post_model({"classes": classes, "labelData": labels})['id']
+        store.train('model', key)
+
+        self.model = Model(store.item('model', key), self.sn.session, self.sn.datasets)
+        self.json = store.predict_model(key, dataset.id)
+        self.names = {c.id: c.name for c in dataset.columns}
+        self.user_labels = {int(k): v for k, v in labels.items()}
+
+    def teardown(self, columns):
+        clear()
+
+    def time_predictions(self, columns):
+        self.model._predictions(self.json)
+
+    def time_compact_predictions(self, columns):
+        Prediction.from_json(self.json, column_names=self.names, user_labels=self.user_labels)
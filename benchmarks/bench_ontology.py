@@ -0,0 +1,25 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of the ontology parsing and serialization
+"""
+from serene.elements.semantics.ontology import RDFReader
+
+from .common import ontology_file
+
+
+class TimeOntology(object):
+    """Reading and writing an ontology of `classes` classes, with subclass chains of `depth`"""
+    params = [[10, 100, 1000], [1, 4]]
+    param_names = ['classes', 'depth']
+
+    def setup(self, classes, depth):
+        self.path = ontology_file(classes, depth=depth)
+        self.ontology = RDFReader().to_ontology(self.path)
+
+    def time_to_ontology(self, classes, depth):
+        RDFReader().to_ontology(self.path)
+
+    def time_to_bytes(self, classes, depth):
+        self.ontology.to_bytes()
@@ -0,0 +1,24 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of the local data quality profiling
+"""
+from serene.api.data_quality import DataProfiler
+
+from .common import dataset_file
+
+
+class TimeProfile(object):
+    """The profile of `rows` rows of a 10 column dataset"""
+    params = [1000, 100000]
+    param_names = ['rows']
+
+    def setup(self, rows):
+        self.source = dataset_file(10, rows)
+
+    def time_profile(self, rows):
+        DataProfiler().profile(self.source)
+
+    def time_small_chunks(self, rows):
+        DataProfiler(chunk_size=10000).profile(self.source)
@@ -0,0 +1,42 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of building, reading, writing and evaluating SSDs
+"""
+from serene.elements import SSD
+from serene.elements.semantics.ssd import ResolutionContext
+
+from .common import build_ssd, clear, client, dataset_file, ontology_file
+
+
+class TimeSSD(object):
+    """An SSD mapping `columns` columns to a chain of as many classes"""
+    params = [10, 50, 100]
+    param_names = ['columns']
+
+    def setup(self, columns):
+        self.sn = client()
+        self.dataset = self.sn.datasets.upload(dataset_file(columns, 20))
+        self.ontology = self.sn.ontologies.upload(ontology_file(columns))
+        self.ssd = build_ssd(SSD(self.dataset, [self.ontology]), columns)
+        self.blob = self.sn.session.ssd_api.item(self.sn.ssds.upload(self.ssd).id)
+        self.truth = build_ssd(SSD(self.dataset, [self.ontology]), columns)
+
+        self.context = ResolutionContext(self.sn.datasets, self.sn.ontologies)
+        self.context.add([self.dataset], [self.ontology])
+
+    def teardown(self, columns):
+        clear()
+
+    def time_map_link(self, columns):
+        build_ssd(SSD(self.dataset, [self.ontology]), columns)
+
+    def time_to_json(self, columns):
+        self.ssd.json
+
+    def time_from_json(self, columns):
+        SSD().update(self.blob, self.sn.datasets, self.sn.ontologies, self.context)
+
+    def time_evaluate(self, columns):
+        self.ssd.evaluate(self.truth)
@@ -0,0 +1,37 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Benchmarks of the local label suggestions
+"""
+import random
+
+from serene.matcher.suggest import LabelSuggester
+
+WORDS = ['birth', 'date', 'name', 'city', 'postal', 'code', 'phone', 'email', 'street', 'state',
+         'country', 'salary', 'company', 'title', 'age', 'first', 'last', 'zip', 'number', 'id']
+
+
+class TimeSuggest(object):
+    """Suggestions from an index of `labels` labelled columns"""
+    params = [100, 10000]
+    param_names = ['labels']
+
+    def setup(self, labels):
+        rand = random.Random(0)
+        self.suggester = LabelSuggester()
+        for i in range(labels):
+            a, b = rand.sample(WORDS, 2)
+            values = [str(rand.randint(0, 100)) for _ in range(20)]
+            self.suggester.add("{}_{}{}".format(a, b, i % 10), "{}{}".format(a, b.title()), values)
+        self.names = ["{}{}".format(a, b.title()) for a, b in zip(WORDS, reversed(WORDS))]
+        # the signatures are stacked on the first lookup...
+        self.suggester.suggest(self.names[0])
+
+    def time_suggest(self, labels):
+        for name in self.names:
+            self.suggester.suggest(name)
+
+    def time_suggest_values(self, labels):
+        for name in self.names:
+            self.suggester.suggest(name, values=['1', '2', '3'])
@@ -0,0 +1,87 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Shared stand-in server and synthetic workloads for the benchmarks
+"""
+import atexit
+import os
+import tempfile
+
+from serene import Serene
+from tests.standin import StandInServer
+from tests.synthetic import SyntheticGenerator
+
+_server = None
+_tempdir = None
+
+
+def server():
+    """The stand-in server shared by all the benchmarks, started on first use"""
+    global _server
+    if _server is None:
+        _server = StandInServer(seed=0, train_time=0.0).start()
+        atexit.register(_server.stop)
+    return _server
+
+
+def client():
+    """A new Serene client of the stand-in server"""
+    s = server()
+    return Serene(s.host, s.port, None, None, False)
+
+
+def clear():
+    """Removes everything stored on the stand-in server"""
+    store = server().store
+    for resource in ('octopus', 'ssd', 'model', 'dataset', 'owl'):
+        for key in store.keys(resource):
+            store.delete(resource, key)
+
+
+def tempdir():
+    """A scratch directory for the workload files, removed at exit"""
+    global _tempdir
+    if _tempdir is None:
+        _tempdir = tempfile.TemporaryDirectory(prefix='serene-bench-')
+        atexit.register(_tempdir.cleanup)
+    return _tempdir.name
+
+
+def generator(columns, rows=20, classes=None, props=2):
+    """The synthetic corpus of a workload with `columns` columns and `rows` rows"""
+    return SyntheticGenerator(num_classes=classes or columns,
+                              num_props=props,
+                              num_columns=columns,
+                              num_rows=rows)
+
+
+def ontology_file(classes, props=2, depth=1):
+    """The path of the synthetic ontology with `classes` classes, written once per size"""
+    path = os.path.join(tempdir(), "bench_{}_{}_{}.ttl".format(classes, props, depth))
+    if not os.path.exists(path):
+        gen = SyntheticGenerator(num_classes=classes, num_props=props, depth=depth, num_columns=1)
+        with open(path, 'w') as f:
+            f.write(gen.ontology_turtle())
+    return path
+
+
+def dataset_file(columns, rows):
+    """The path of the synthetic dataset of generator(columns, rows), written once per size"""
+    path = os.path.join(tempdir(), "bench_{}x{}.csv".format(columns, rows))
+    if not os.path.exists(path):
+        generator(columns, rows).write_csv(0, path)
+    return path
+
+
+def build_ssd(ssd, columns):
+    """
+    Adds the mappings and links of the generator(columns) dataset to
+    an SSD of dataset_file(columns, ...) and ontology_file(columns)
+    """
+    gen = generator(columns)
+    for column, _, node in gen.map_rows(0):
+        ssd.map(column, node)
+    for _, src, link, dst in gen.link_rows(0):
+        ssd.link(src, link, dst)
+    return ssd
@@ -0,0 +1,242 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Runs the asv-style benchmarks of this package without asv, stores the
+timings under the current git commit and compares them with the
+results of an earlier commit.
+
+    python -m benchmarks.run [-b REGEX] [--quick] [--compare COMMIT] [--threshold 1.2]
+"""
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+
+def git_commit(ref='HEAD'):
+    """The full hash of a git reference, or None outside of a repository"""
+    try:
+        out = subprocess.check_output(['git', 'rev-parse', ref],
+                                      cwd=BENCH_DIR,
+                                      stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.decode('ascii').strip()
+
+
+def results_path(commit, results_dir=RESULTS_DIR):
+    """The results file of a commit on this machine"""
+    return os.path.join(results_dir, platform.node() or 'unknown', '{}.json'.format(commit[:12]))
+
+
+def discover(pattern=None):
+    """
+    Finds the benchmarks in the bench_* modules
+
+    :param pattern: Optional regex on the 'module.Class.method' names
+    :return: List of (name, class, method name)
+    """
+    found = []
+    for info in sorted(pkgutil.iter_modules([BENCH_DIR]), key=lambda m: m.name):
+        if not info.name.startswith('bench_'):
+            continue
+        module = importlib.import_module('benchmarks.' + info.name)
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for method in sorted(m for m in dir(cls) if m.startswith('time_')):
+                name = '.'.join([info.name, cls_name, method])
+                if pattern is None or re.search(pattern, name):
+                    found.append((name, cls, method))
+    return found
+
+
+def param_sets(cls, quick=False):
+    """The parameter combinations of a benchmark class, as tuples"""
+    params = getattr(cls, 'params', [])
+    if not params:
+        return [()]
+    # a flat list is the values of a single parameter...
+    if not isinstance(params[0], (list, tuple)):
+        params = [params]
+    if quick:
+        params = [p[:1] for p in params]
+    return list(itertools.product(*params))
+
+
+def measure(func, repeat=5, min_time=0.05, max_time=10.0):
+    """
+    Times func as timeit does: the number of calls per sample is raised
+    until a sample takes at least `min_time`, then up to `repeat`
+    samples are taken, stopping early once `max_time` seconds have
+    been spent on the samples.
+
+    :return: dict with the min and median seconds per call
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 10 ** 6:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    # the last calibration run is the first sample...
+    samples = [elapsed / number]
+    spent = elapsed
+    while len(samples) < repeat and spent < max_time:
+        elapsed = timer.timeit(number)
+        samples.append(elapsed / number)
+        spent += elapsed
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'number': number,
+        'repeat': len(samples)
+    }
+
+
+def run(benchmarks, quick=False, repeat=5, min_time=0.05, max_time=10.0, out=sys.stdout):
+    """
+    Runs the benchmarks, calling setup and teardown once per class and
+    parameter set.
+
+    :return: dict of 'name(params)' -> timing dict
+    """
+    results = {}
+    groups = itertools.groupby(benchmarks, key=lambda b: b[1])
+    for cls, items in groups:
+        methods = [(name, method) for name, _, method in items]
+        for params in param_sets(cls, quick):
+            instance = cls()
+            if hasattr(instance, 'setup'):
+                instance.setup(*params)
+            try:
+                for name, method in methods:
+                    key = '{}({})'.format(name, ', '.join(repr(p) for p in params))
+                    func = getattr(instance, method)
+                    results[key] = measure(lambda: func(*params),
+                                           repeat=1 if quick else repeat,
+                                           min_time=0.0 if quick else min_time,
+                                           max_time=max_time)
+                    print('{:<70} {:>12}'.format(key, format_time(results[key]['min'])), file=out)
+            finally:
+                if hasattr(instance, 'teardown'):
+                    instance.teardown(*params)
+    return results
+
+
+def format_time(seconds):
+    """Human readable duration"""
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.3f}{}'.format(seconds / scale, unit)
+    return '{:.3f}ns'.format(seconds / 1e-9)
+
+
+def save(results, commit, results_dir=RESULTS_DIR):
+    """Stores the results of a commit, merged with earlier runs of the same commit"""
+    path = results_path(commit, results_dir)
+    stored = load(path) or {}
+    stored.update({
+        'commit': commit,
+        'date': datetime.now().isoformat(),
+        'machine': platform.node(),
+        'python': platform.python_version(),
+    })
+    stored.setdefault('results', {}).update(results)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(stored, f, indent=2, sort_keys=True)
+    return path
+
+
+def load(path):
+    """Reads a results file, None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(base, current, threshold=1.2, out=sys.stdout):
+    """
+    Prints the ratio current/base of the benchmarks in both results
+
+    :param base: The results dict of the earlier commit
+    :param current: The results dict of the current run
+    :param threshold: The ratio above which a benchmark has regressed
+    :return: The names of the regressed benchmarks
+    """
+    regressed = []
+    for key in sorted(set(base) & set(current)):
+        ratio = current[key]['min'] / base[key]['min'] if base[key]['min'] else float('inf')
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressed.append(key)
+        elif ratio < 1.0 / threshold:
+            flag = '  improved'
+        print('{:<70} {:>12} {:>12} {:>7.2f}x{}'.format(key,
+                                                      format_time(base[key]['min']),
+                                                      format_time(current[key]['min']),
+                                                      ratio,
+                                                      flag), file=out)
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the serene client benchmarks")
+    parser.add_argument('-b', '--bench', help="Regex on the benchmark names to run")
+    parser.add_argument('--quick', action='store_true',
+                        help="Run the smallest workloads once, without storing the results")
+    parser.add_argument('--repeat', type=int, default=5, help="The number of samples per benchmark")
+    parser.add_argument('--min-time', type=float, default=0.05, help="The minimum seconds per sample")
+    parser.add_argument('--max-time', type=float, default=10.0,
+                        help="The seconds after which no more samples are taken")
+    parser.add_argument('--results-dir', default=RESULTS_DIR, help="Where the results are stored")
+    parser.add_argument('--compare', metavar='COMMIT', help="Compare with the stored results of a commit")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="The slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    benchmarks = discover(args.bench)
+    start = time.time()
+    results = run(benchmarks,
+                  quick=args.quick,
+                  repeat=args.repeat,
+                  min_time=args.min_time,
+                  max_time=args.max_time)
+    print("{} benchmarks in {:.1f}s".format(len(results), time.time() - start))
+
+    commit = git_commit()
+    if commit is not None and not args.quick:
+        print("Results stored in {}".format(save(results, commit, args.results_dir)))
+
+    if args.compare:
+        base_commit = git_commit(args.compare) or args.compare
+        base = load(results_path(base_commit, args.results_dir))
+        if base is None:
+            print("No stored results for {}".format(args.compare))
+            return 1
+        if compare(base['results'], results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -34,17 +34,7 @@ print("benchmark_path: ", benchmark_path)
 
 print("========Optional cleaning=============")
 # Removes all server elements
-for octo in sn.octopii.items:
-    sn.octopii.remove(octo)
-
-for ssd in sn.ssds.items:
-    sn.ssds.remove(ssd)
-
-for ds in sn.datasets.items:
-    sn.datasets.remove(ds)
-
-for on in sn.ontologies.items:
-    sn.ontologies.remove(on)
+sn.purge()
 
 # =======================
 #
@@ -90,7 +80,7 @@ for ds in os.listdir(dataset_dir):
     ssd_f = os.path.join(ssd_dir, ds_name + ".ssd")
 
     print("Adding dataset: " + str(ds_f))
-    dataset = sn.datasets.upload(ds_f, description="museum_benchmark")
+    dataset = sn.datasets.upload(ds_f, description="museum_benchmark", dedup=True)
     datasets.append(dataset)
 
     print("Adding ssd: " + str(ssd_f))
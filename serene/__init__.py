@@ -5,10 +5,47 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 Serene Python client: Data Integration Software
 """
 from serene.const import CODE_VERSION
-from .api import Session
-from .core import Serene
-from .elements import *
-from .matcher import *
+from serene.lazy import lazy_attributes
+
+# the public objects are imported on first use, so that importing
+# serene does not load pandas, networkx, rdflib etc. up front...
+lazy_attributes(__name__, {
+    'Session': '.api.session',
+    'Serene': '.core',
+    'Column': '.elements.elements',
+    'Mapping': '.elements.elements',
+    'Class': '.elements.elements',
+    'DataProperty': '.elements.elements',
+    'ObjectProperty': '.elements.elements',
+    'ObjectPropertyList': '.elements.elements',
+    'DataNode': '.elements.elements',
+    'ClassNode': '.elements.elements',
+    'DataLink': '.elements.elements',
+    'ObjectLink': '.elements.elements',
+    'ColumnLink': '.elements.elements',
+    'ClassInstanceLink': '.elements.elements',
+    'SubClassLink': '.elements.elements',
+    'Octopus': '.elements.octopus',
+    'Ontology': '.elements.semantics.ontology',
+    'SSD': '.elements.semantics.ssd',
+    'RDFMaterializer': '.elements.semantics.materialize',
+    'RowSampler': '.sampling',
+    'DataSet': '.elements.dataset',
+    'DataSetList': '.elements.dataset',
+    'DEFAULT_NS': '.elements.semantics.base',
+    'KARMA_DEFAULT_NS': '.elements.semantics.base',
+    'ALL_CN': '.elements.semantics.base',
+    'OBJ_PROP': '.elements.semantics.base',
+    'UNKNOWN_DN': '.elements.semantics.base',
+    'UNKNOWN_CN': '.elements.semantics.base',
+    'Model': '.matcher.model',
+    'Status': '.matcher.model',
+    'ModelState': '.matcher.model',
+    'ModelType': '.matcher.model',
+    'SamplingStrategy': '.matcher.model',
+    'Prediction': '.matcher.prediction',
+    'LabelSuggester': '.matcher.suggest',
+})
 
 
 __version__ = CODE_VERSION
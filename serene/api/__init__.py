@@ -4,9 +4,19 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 Serene Python client: Data Integration Software
 """
-from .data_api import DataSetAPI
-from .session import Session
-from .model_api import ModelAPI
-from .ontology_api import OntologyAPI, OwlFormat
-from .ssd_api import SsdAPI
-from .octopus_api import OctopusAPI
+from serene.lazy import lazy_attributes
+
+lazy_attributes(__name__, {
+    'DataSetAPI': '.data_api',
+    'Session': '.session',
+    'ModelAPI': '.model_api',
+    'OntologyAPI': '.ontology_api',
+    'OwlFormat': '.ontology_api',
+    'SsdAPI': '.ssd_api',
+    'OctopusAPI': '.octopus_api',
+    'MetricsRegistry': '.metrics',
+    'HistogramExporter': '.metrics',
+    'RequestRecord': '.metrics',
+    'DataProfiler': '.data_quality',
+    'DataProfile': '.data_quality',
+})
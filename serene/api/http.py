@@ -1,6 +1,18 @@
 import logging
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 
 from serene.api.exceptions import BadRequestError, NotFoundError, OtherError
+from serene.api.metrics import MetricsRegistry, RequestRecord, endpoint_template
+
+# HTTP methods that can safely be retried by the connection pool
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'])
+
+# the default (connect, read) timeout of the requests, in seconds
+DEFAULT_TIMEOUT = (10, 300)
 
 
 class HTTPObject(object):
@@ -43,4 +55,130 @@ class HTTPObject(object):
     @staticmethod
     def join_urls(*args):
         """Crude url joiner"""
-        return '/'.join(args)
\ No newline at end of file
+        return '/'.join(args)
+
+
+class PooledSession(requests.Session):
+    """
+    A requests Session with a tuned connection pool. All the *API
+    classes share one PooledSession, so that connections to the
+    Serene server are kept alive and reused across endpoints.
+
+    Idempotent requests are retried with an exponential backoff,
+    and every request receives a default timeout, DEFAULT_TIMEOUT
+    unless set: 10 seconds to connect and 300 seconds between bytes
+    of the response, so that a stalled server does not hang the
+    client. Long training or prediction runs can use a larger read
+    timeout. Each request is reported to the `metrics` registry hooks.
+    """
+    def __init__(self,
+                 pool_connections=10,
+                 pool_maxsize=10,
+                 max_retries=3,
+                 backoff_factor=0.3,
+                 timeout=DEFAULT_TIMEOUT):
+        """
+        :param pool_connections: The number of host pools to cache
+        :param pool_maxsize: The maximum number of connections kept alive per host
+        :param max_retries: The number of retries for idempotent requests
+        :param backoff_factor: The backoff factor between retries (in seconds)
+        :param timeout: The default (connect, read) timeout for every request, in seconds,
+                        or None to wait forever
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.metrics = MetricsRegistry()
+
+        retry = self._retry(max_retries, backoff_factor)
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              max_retries=retry)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    @staticmethod
+    def _retry(max_retries, backoff_factor):
+        """Builds the retry strategy, only idempotent methods are retried"""
+        try:
+            return Retry(total=max_retries,
+                         backoff_factor=backoff_factor,
+                         allowed_methods=IDEMPOTENT_METHODS,
+                         raise_on_status=False)
+        except TypeError:
+            # older urllib3 versions...
+            return Retry(total=max_retries,
+                         backoff_factor=backoff_factor,
+                         method_whitelist=IDEMPOTENT_METHODS,
+                         raise_on_status=False)
+
+    def request(self, method, url, **kwargs):
+        """Sends the request, with the default timeout if none is given"""
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().request(method, url, **kwargs)
+
+    def send(self, request, **kwargs):
+        """Sends the prepared request, recording it in the metrics registry"""
+        if not self.metrics.active:
+            return super().send(request, **kwargs)
+
+        self.metrics.before(request)
+
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except Exception as e:
+            self.metrics.record(self._record(request, None, time.perf_counter() - start, e))
+            raise
+        duration = time.perf_counter() - start
+
+        self.metrics.record(self._record(request, response, duration, None, kwargs.get('stream', False)))
+        return response
+
+    @staticmethod
+    def _record(request, response, duration, error, stream=False):
+        """Builds the RequestRecord for a prepared request and its response"""
+        bytes_out = request.headers.get('Content-Length')
+        if bytes_out is None:
+            bytes_out = len(request.body) if isinstance(request.body, (bytes, str)) else 0
+
+        if response is None:
+            status = None
+            bytes_in = 0
+        else:
+            status = response.status_code
+            if stream:
+                # do not consume a streamed body...
+                bytes_in = response.headers.get('Content-Length', 0)
+            else:
+                bytes_in = len(response.content)
+
+        return RequestRecord(method=request.method,
+                             endpoint=endpoint_template(request.url),
+                             url=request.url,
+                             status=status,
+                             duration=duration,
+                             bytes_out=int(bytes_out),
+                             bytes_in=int(bytes_in),
+                             error=type(error).__name__ if error is not None else None)
+
+    def connection_stats(self):
+        """
+        Returns the connection reuse metrics across all the host pools
+
+        :return: dict with the number of requests, connections opened and
+                 the number of requests which reused an existing connection
+        """
+        requests_made = 0
+        connections = 0
+        for adapter in set(self.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                requests_made += pool.num_requests
+                connections += pool.num_connections
+        return {
+            "requests": requests_made,
+            "connections": connections,
+            "reused": max(requests_made - connections, 0)
+        }
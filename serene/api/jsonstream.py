@@ -0,0 +1,206 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Incremental decoding of large json responses from the Serene server
+"""
+import codecs
+import json
+import re
+
+# whitespace between json tokens
+_WS = re.compile(r'[ \t\n\r]*')
+# the characters that open or close a container or string, and those that end a string
+_STRUCTURE = re.compile(r'[{}\[\]"]')
+_STRING = re.compile(r'["\\]')
+
+
+class JsonStream(object):
+    """
+    Minimal pull parser over a stream of byte chunks. Only the structure
+    needed to walk into a top level object is parsed here, the values
+    themselves are decoded with the standard json decoder as soon as
+    they are complete in the buffer.
+
+    The end of an object, array or string is found by scanning each new
+    chunk once for its brackets and quotes, so a large value is decoded
+    once, when it is complete, rather than retried after every chunk.
+    """
+    def __init__(self, chunks, encoding='utf-8'):
+        """
+        :param chunks: Iterable of bytes e.g. response.iter_content()
+        :param encoding: The text encoding of the stream
+        """
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder(encoding)()
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read(self):
+        """The text of the next chunk, or None at the end of the stream"""
+        if self._eof:
+            return None
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                return text
+        self._eof = True
+        return self._text.decode(b'', final=True)
+
+    def _fill(self):
+        """Reads the next chunk into the buffer, returns False at the end of the stream"""
+        text = self._read()
+        if text is None:
+            return False
+        # drop the consumed part of the buffer...
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it"""
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of json stream")
+
+    def take(self, char):
+        """Consumes the next non-whitespace character, which must be `char`"""
+        found = self.peek()
+        if found != char:
+            msg = "Expected '{}' in json stream, found '{}'".format(char, found)
+            raise ValueError(msg)
+        self._pos += 1
+
+    @staticmethod
+    def _scan(text, pos, state):
+        """
+        Scans `text` from `pos` for the end of an object, array or string
+
+        :param text: The text to scan
+        :param pos: The position to start from
+        :param state: [nesting depth, inside a string, after a backslash], updated in place
+        :return: The position after the end of the value, or None if it is not in `text`
+        """
+        depth, in_string, escaped = state
+        if escaped and pos < len(text):
+            pos += 1
+            escaped = False
+        end = None
+        while end is None:
+            if in_string:
+                m = _STRING.search(text, pos)
+                if m is None:
+                    break
+                pos = m.end()
+                if m.group() == '\\':
+                    if pos == len(text):
+                        # the escaped character is in the next chunk...
+                        escaped = True
+                        break
+                    pos += 1
+                    continue
+                in_string = False
+                if depth == 0:
+                    end = pos
+            else:
+                m = _STRUCTURE.search(text, pos)
+                if m is None:
+                    break
+                pos = m.end()
+                char = m.group()
+                if char == '"':
+                    in_string = True
+                elif char in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        end = pos
+        state[:] = [depth, in_string, escaped]
+        return end
+
+    def _complete(self):
+        """
+        Reads chunks until the object, array or string at the current
+        position is complete in the buffer. Each chunk is scanned once,
+        keeping the nesting depth and string state between chunks, and
+        the chunks are joined to the buffer once at the end.
+        """
+        state = [0, False, False]
+        if self._scan(self._buf, self._pos, state) is not None:
+            return
+        parts = []
+        while True:
+            text = self._read()
+            if text is None:
+                break
+            parts.append(text)
+            if self._scan(text, 0, state) is not None:
+                break
+        self._buf = self._buf[self._pos:] + ''.join(parts)
+        self._pos = 0
+        if text is None:
+            raise ValueError("Unexpected end of json stream")
+
+    def value(self):
+        """Decodes and consumes the next complete json value"""
+        if self.peek() in '{["':
+            self._complete()
+            obj, self._pos = self._decoder.raw_decode(self._buf, self._pos)
+            return obj
+
+        # a number or literal, short enough to retry...
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except ValueError:
+                # the value is not complete yet...
+                if not self._fill():
+                    raise
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end < len(self._buf) or not self._fill():
+                self._pos = end
+                return obj
+
+
+def iter_json_array(response, key, chunk_size=64 * 1024):
+    """
+    Yields the elements of the array stored under `key` in the top
+    level json object of a streamed response, e.g. for
+
+        {"predictions": [{...}, {...}, ...]}
+
+    each prediction is returned as soon as it has been received, so
+    the whole body never needs to be held or decoded at once. The
+    response is closed once the generator is exhausted or closed.
+
+    :param response: A requests Response opened with stream=True
+    :param key: The key of the array in the top level object
+    :param chunk_size: The number of bytes to read at a time
+    :return: Generator of the decoded array elements
+    """
+    stream = JsonStream(response.iter_content(chunk_size=chunk_size))
+    try:
+        stream.take('{')
+        while stream.peek() != '}':
+            name = stream.value()
+            stream.take(':')
+            if name == key:
+                stream.take('[')
+                while stream.peek() != ']':
+                    yield stream.value()
+                    if stream.peek() == ',':
+                        stream.take(',')
+                return
+            # skip the other values...
+            stream.value()
+            if stream.peek() == ',':
+                stream.take(',')
+    finally:
+        response.close()
@@ -0,0 +1,197 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Request-level instrumentation for the calls made to the Serene server
+"""
+import bisect
+import collections
+import logging
+import re
+import threading
+from urllib.parse import urlsplit
+
+
+# A single instrumented request to the server
+RequestRecord = collections.namedtuple(
+    'RequestRecord',
+    'method endpoint url status duration bytes_out bytes_in error'
+)
+
+# path segments which are object keys, replaced in the endpoint template
+_KEY_SEGMENT = re.compile(r'^-?\d+$')
+
+
+def endpoint_template(url):
+    """
+    Converts a request url into its endpoint template by replacing
+    the object keys with a placeholder e.g.
+
+        http://localhost:8080/v1.0/dataset/1234 -> /v1.0/dataset/{id}
+
+    :param url: The full request url
+    :return: The endpoint template string
+    """
+    path = urlsplit(url).path
+    return '/'.join('{id}' if _KEY_SEGMENT.match(s) else s for s in path.split('/'))
+
+
+class MetricsRegistry(object):
+    """
+    The MetricsRegistry dispatches the request records of a session
+    to the registered hooks. Pre hooks are called with the outgoing
+    prepared request, post hooks with the RequestRecord once the
+    response (or error) is returned.
+
+    Exporters such as the HistogramExporter are simply post hooks.
+    """
+    def __init__(self):
+        self._pre_hooks = []
+        self._post_hooks = []
+
+    @property
+    def active(self):
+        """True if there are any hooks to call"""
+        return bool(self._pre_hooks or self._post_hooks)
+
+    def add_pre_hook(self, hook):
+        """
+        Adds a hook called before each request
+
+        :param hook: function(PreparedRequest)
+        :return: The hook
+        """
+        self._pre_hooks.append(hook)
+        return hook
+
+    def add_hook(self, hook):
+        """
+        Adds a hook called after each request
+
+        :param hook: function(RequestRecord)
+        :return: The hook
+        """
+        self._post_hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        """
+        Removes a pre or post hook
+        :param hook: The hook to remove
+        :return: None
+        """
+        if hook in self._pre_hooks:
+            self._pre_hooks.remove(hook)
+        if hook in self._post_hooks:
+            self._post_hooks.remove(hook)
+
+    def before(self, request):
+        """Calls the pre hooks with the prepared request"""
+        for hook in self._pre_hooks:
+            self._call(hook, request)
+
+    def record(self, record):
+        """Calls the post hooks with the request record"""
+        for hook in self._post_hooks:
+            self._call(hook, record)
+
+    @staticmethod
+    def _call(hook, value):
+        """Instrumentation must never break the actual request"""
+        try:
+            hook(value)
+        except Exception as e:
+            logging.error("Metrics hook {} failed: {}".format(hook, e))
+
+
+class HistogramExporter(object):
+    """
+    In-memory exporter which aggregates the request records per
+    (method, endpoint) into a latency histogram with call, error
+    and byte counts. Add it to a session with:
+
+        exporter = HistogramExporter()
+        session.metrics.add_hook(exporter)
+        ...
+        exporter.summary()
+    """
+    # default latency bucket upper bounds in seconds
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=None):
+        """
+        :param buckets: Optional sorted list of bucket upper bounds in seconds
+        """
+        self.buckets = tuple(sorted(buckets)) if buckets is not None else self.BUCKETS
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def __call__(self, record):
+        """Post hook to aggregate a RequestRecord"""
+        key = (record.method, record.endpoint)
+        with self._lock:
+            if key not in self._stats:
+                self._stats[key] = {
+                    'count': 0,
+                    'errors': 0,
+                    'total': 0.0,
+                    'max': 0.0,
+                    'bytes_out': 0,
+                    'bytes_in': 0,
+                    'histogram': [0] * (len(self.buckets) + 1)
+                }
+            stats = self._stats[key]
+            stats['count'] += 1
+            if record.error is not None or record.status is None or record.status >= 400:
+                stats['errors'] += 1
+            stats['total'] += record.duration
+            stats['max'] = max(stats['max'], record.duration)
+            stats['bytes_out'] += record.bytes_out
+            stats['bytes_in'] += record.bytes_in
+            stats['histogram'][bisect.bisect_left(self.buckets, record.duration)] += 1
+
+    def histogram(self, method, endpoint):
+        """
+        Returns the latency histogram for an endpoint
+
+        :param method: The HTTP method e.g. 'GET'
+        :param endpoint: The endpoint template e.g. '/v1.0/dataset/{id}'
+        :return: list of (bucket upper bound, count), the last bound is inf
+        """
+        with self._lock:
+            counts = list(self._stats[(method, endpoint)]['histogram'])
+        return list(zip(self.buckets + (float('inf'),), counts))
+
+    def reset(self):
+        """Clears all the recorded values"""
+        with self._lock:
+            self._stats = {}
+
+    def summary(self):
+        """
+        Summary table of the recorded requests, ordered by the total
+        time spent per endpoint.
+
+        :return: Pandas DataFrame
+        """
+        import pandas as pd
+
+        with self._lock:
+            rows = [(method, endpoint, s['count'], s['errors'],
+                     s['errors'] / s['count'], s['total'], s['total'] / s['count'],
+                     s['max'], s['bytes_out'], s['bytes_in'])
+                    for (method, endpoint), s in self._stats.items()]
+
+        df = pd.DataFrame(rows, columns=[
+            'method',
+            'endpoint',
+            'count',
+            'errors',
+            'error_rate',
+            'total_time',
+            'mean_time',
+            'max_time',
+            'bytes_out',
+            'bytes_in'
+        ])
+        return df.sort_values('total_time', ascending=False).reset_index(drop=True)
@@ -4,6 +4,7 @@ import json
 
 from .exceptions import InternalError
 from .http import HTTPObject
+from .jsonstream import iter_json_array
 
 
 class OctopusAPI(HTTPObject):
@@ -140,14 +141,18 @@ class OctopusAPI(HTTPObject):
         uri = urljoin(self._uri, str(key)+"/")
         uri = urljoin(uri, "alignment")
         try:
-            print("alignment uri: ", uri)
             r = self.connection.get(uri)
         except Exception as e:
             logging.error(e)
             raise InternalError("Failed to get octopus ", e)
         self._handle_errors(r, "GET " + uri)
-        # server returns a string which we load with json
-        return json.loads(r.json())
+        # the raw bytes are decoded directly, skipping the charset
+        # detection of r.json() on the large body...
+        blob = json.loads(r.content.decode('utf-8'))
+        if isinstance(blob, str):
+            # older servers return the graph as a json encoded string
+            blob = json.loads(blob)
+        return blob
 
     def delete(self, key):
         """
@@ -186,7 +191,7 @@ class OctopusAPI(HTTPObject):
         self._handle_errors(r, "POST " + uri)
         return True
 
-    def predict(self, key, dataset_key):
+    def predict(self, key, dataset_key, stream=False):
         """
         Post request to perform prediction based on the octopus, using the dataset `dataset_key`
         as input.
@@ -194,8 +199,10 @@ class OctopusAPI(HTTPObject):
         Args:
             key: integer which is the key of the octopus in the repository
             dataset_key: integer key for the dataset to predict
+            stream: if True the response body is decoded incrementally
 
-        Returns: JSON object with predicted semantic models and associated scores in there
+        Returns: JSON object with predicted semantic models and associated scores in there.
+                 If stream is True, a generator over the entries of the 'predictions' list.
 
         """
         logging.debug('Sending request to the Serene server to perform '
@@ -203,13 +210,19 @@ class OctopusAPI(HTTPObject):
         uri = urljoin(self._uri, self.join_urls(str(key), "predict", str(dataset_key)))
 
         try:
-            r = self.connection.post(uri)
+            if stream:
+                r = self.connection.post(uri, stream=True)
+            else:
+                r = self.connection.post(uri)
         except Exception as e:
             logging.error(e)
             raise InternalError("Failed to predict octopus ", e)
 
         self._handle_errors(r, "POST " + uri)
 
+        if stream:
+            return iter_json_array(r, 'predictions')
+
         return r.json()
 
     def keys(self):
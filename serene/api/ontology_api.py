@@ -1,13 +1,14 @@
+import hashlib
+import json
 import logging
 import random
 import string
 import tempfile
+import threading
 import os
 from enum import unique, Enum
 from urllib.parse import urljoin
 
-import requests
-
 from .exceptions import InternalError
 from .http import HTTPObject
 
@@ -25,17 +26,26 @@ class OntologyAPI(HTTPObject):
     """
     Handles the Ontology endpoint requests
     """
-    def __init__(self, uri, conn):
+    # the index file of the download cache
+    CACHE_INDEX = "index.json"
+
+    def __init__(self, uri, conn, cache_dir=None):
         """
         Requires a valid session object
 
         :param uri: The base URI of the Serene server
         :param conn: The live connection object
+        :param cache_dir: The directory of the OWL file download cache
         """
         self.connection = conn
         self._uri = urljoin(uri, 'owl/')
         self.OWL_FORMATS = {x.value for x in OwlFormat}
 
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(), "serene-owl-cache")
+        self.cache_dir = cache_dir
+        self._cache_lock = threading.Lock()
+
     def keys(self):
         """
         List ids of all ontologies in the repository at the Serene server.
@@ -80,45 +90,95 @@ class OntologyAPI(HTTPObject):
     def _create_local_owl_file(self, path):
         return open(path, "wb")
 
-    def owl_file(self, key):
+    def owl_file(self, key, info=None):
         """
         Get the actual owl file from the repository on the Serene server.
+
+        The files are stored in a content-addressed cache, named by the
+        sha256 of the file contents. The cache index maps each ontology
+        version (server, key and dateModified) to its file, so an unchanged
+        ontology is only downloaded once. The cache can be shared by the
+        clients of different servers, as the ids of one server say nothing
+        about the ontologies of another.
+
         Args:
              key: integer which is the key of the Ontology.
+             info: the ontology json from `item`, fetched if None
 
-        Returns: dictionary.
+        Returns: The local path of the owl file.
         """
-        logging.debug("Inferring extension pof the ontology...")
-        owl_json = self.item(key)
+        if info is None:
+            info = self.item(key)
 
+        logging.debug("Inferring extension pof the ontology...")
         try:
-            extension = os.path.splitext(owl_json["name"])[1]
+            extension = os.path.splitext(info["name"])[1]
         except:
             logging.debug("...setting default owl extension")
-            extension = "owl"
+            extension = ".owl"
+
+        version = "{}{}@{}".format(self._uri, key, info.get("dateModified"))
+        with self._cache_lock:
+            path = self._read_cache_index().get(version)
+        if path is not None and os.path.exists(path):
+            logging.debug("Ontology {} found in the download cache".format(version))
+            return path
 
         logging.debug('Sending request to Serene server to get the ontology file.')
         uri = "{}{}/file".format(self._uri, str(key))
         try:
-            # extension of the ontology matters!
-            path = os.path.join(
-                tempfile.gettempdir(),
-                "{}{}".format(self._gen_id(), extension))
+            os.makedirs(self.cache_dir, exist_ok=True)
 
-            r = requests.get(uri, stream=True)
+            # download into a temporary file while hashing the contents...
+            tmp_path = os.path.join(self.cache_dir, "{}.part".format(self._gen_id()))
+            digest = hashlib.sha256()
+
+            r = self.connection.get(uri, stream=True)
 
             if r.status_code == 200:
-                with self._create_local_owl_file(path) as f:
+                with self._create_local_owl_file(tmp_path) as f:
                     for chunk in r.iter_content(1024):
+                        digest.update(chunk)
                         f.write(chunk)
             else:
                 raise Exception("Failed to get ontology file. Status code: {}".format(r.url))
+
+            path = os.path.join(self.cache_dir, digest.hexdigest() + extension)
+            os.replace(tmp_path, path)
         except Exception as e:
             logging.error(e)
             raise InternalError("Failed to list ontology", e)
 
+        with self._cache_lock:
+            index = self._read_cache_index()
+            index[version] = path
+            self._write_cache_index(index)
+
         return path
 
+    def _read_cache_index(self):
+        """Reads the ontology version -> path index of the download cache"""
+        try:
+            with open(os.path.join(self.cache_dir, self.CACHE_INDEX)) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def _write_cache_index(self, index):
+        """Writes the download cache index, replacing the file atomically"""
+        path = os.path.join(self.cache_dir, self.CACHE_INDEX)
+        tmp_path = "{}.{}".format(path, self._gen_id())
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _open(file_path):
+        """Opens the OWL file for upload, file objects are used as they are"""
+        if isinstance(file_path, str):
+            return open(file_path, "rb")
+        return file_path
+
     @staticmethod
     def process_format(owl_format):
         """
@@ -137,7 +197,8 @@ class OntologyAPI(HTTPObject):
         Post a new ontology to the Serene server.
         Args:
              description: string which describes the ontology to be posted
-             file_path: string which indicates the location of the OWL file
+             file_path: string which indicates the location of the OWL file,
+                     or a binary file object e.g. from Ontology.to_buffer()
              owl_format: type of ontology format
                      e.g. 'turtle', 'jsonld', 'rdfxml', 'owl'
         Returns: Dictionary.
@@ -152,12 +213,12 @@ class OntologyAPI(HTTPObject):
                   "Use one of: {}".format(owl_format, self.OWL_FORMATS)
             raise ValueError(msg)
         try:
-            f = {"file": open(file_path, "rb")}
             data = {
                 "description": str(description),
                 "format": owl_format
             }
-            r = self.connection.post(uri, data=data, files=f)
+            with self._open(file_path) as f:
+                r = self.connection.post(uri, data=data, files={"file": f})
         except Exception as e:
             logging.error(e)
             raise InternalError("Failed to create ontology", e)
@@ -172,30 +233,31 @@ class OntologyAPI(HTTPObject):
         Args:
              key: integer ontology id
              description: string which describes the dataset to be posted
-             type_map: dictionary with type map for the dataset
+             file_path: string location of the new OWL file, or a binary file object
+             owl_format: type of ontology format
 
         :return:
         """
         logging.debug('Sending request to the schema matcher server to post a dataset.')
         uri = urljoin(self._uri, str(key))
+        owl_format = self.process_format(owl_format)
 
         if owl_format is not None and owl_format not in self.OWL_FORMATS:
             msg = "Ontology format value {} is not supported. " \
                   "Use one of: {}".format(owl_format, self.OWL_FORMATS)
             raise ValueError(msg)
         try:
-            if file_path is None:
-                f = None
-            else:
-                f = {"file": open(file_path, "rb")}
-
             data = {
                 "description": str(description) if description is not None else None,
                 "format": owl_format
             }
             data = {k: v for k, v in data.items() if v is not None}
 
-            r = self.connection.post(uri, data=data, files=f)
+            if file_path is None:
+                r = self.connection.post(uri, data=data, files=None)
+            else:
+                with self._open(file_path) as f:
+                    r = self.connection.post(uri, data=data, files={"file": f})
         except Exception as e:
             logging.error(e)
             raise InternalError("Failed to update ontology", e)
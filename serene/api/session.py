@@ -9,7 +9,7 @@ from urllib.parse import urljoin
 
 import requests
 
-from .http import HTTPObject
+from .http import HTTPObject, PooledSession, DEFAULT_TIMEOUT
 from .data_api import DataSetAPI
 from .model_api import ModelAPI
 from .ontology_api import OntologyAPI
@@ -31,7 +31,9 @@ class Session(HTTPObject):
             _uri_model: uri for the model endpoint of the schema matcher API
     """
     def __init__(self, host, port,
-                 auth=None, cert=None, trust_env=None):
+                 auth=None, cert=None, trust_env=None,
+                 pool_connections=10, pool_maxsize=10,
+                 max_retries=3, backoff_factor=0.3, timeout=DEFAULT_TIMEOUT):
         """
         Initialize and maintain a session with the Serene backend
         :param host: The address of the Serene backend
@@ -39,10 +41,21 @@ class Session(HTTPObject):
         :param auth: The authentication token (None if non-secure connection)
         :param cert: The security certificate
         :param trust_env: The trusted environment token
+        :param pool_connections: The number of connection pools to cache
+        :param pool_maxsize: The maximum number of keep-alive connections in the pool
+        :param max_retries: The number of retries for idempotent requests (GET, PUT, DELETE...)
+        :param backoff_factor: The backoff factor between retries (in seconds)
+        :param timeout: The default timeout for every request, as seconds or a (connect, read) tuple.
+                        The default is (10, 300), a larger read timeout can be given for long
+                        training or prediction runs, or None to wait forever.
         """
         logging.info('Initialising session to connect to Serene.')
 
-        self.session = requests.Session()
+        self.session = PooledSession(pool_connections=pool_connections,
+                                     pool_maxsize=pool_maxsize,
+                                     max_retries=max_retries,
+                                     backoff_factor=backoff_factor,
+                                     timeout=timeout)
         self.session.trust_env = trust_env
         self.session.auth = auth
         self.session.cert = cert
@@ -105,6 +118,21 @@ class Session(HTTPObject):
     def uri(self):
         return self._uri
 
+    @property
+    def metrics(self):
+        """
+        The MetricsRegistry for all requests made through this session.
+        Use metrics.add_hook(HistogramExporter()) to aggregate latencies.
+        """
+        return self.session.metrics
+
+    def connection_stats(self):
+        """
+        Returns the connection reuse metrics for the shared pooled session
+        :return: dict with the number of requests, connections and reused connections
+        """
+        return self.session.connection_stats()
+
     def __repr__(self):
         return "<Session at (" + str(self._uri) + ")>"
 
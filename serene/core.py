@@ -1,13 +1,19 @@
 """
 License...
 """
+import collections
+import concurrent.futures
 import logging
 import os
+import time
 import pandas as pd
 
+from .api.http import DEFAULT_TIMEOUT
 from .api.session import Session
 from .elements import Octopus, SSD
+from .elements.semantics.ssd import ResolutionContext
 from .endpoints import DataSetEndpoint, OntologyEndpoint, SSDEndpoint, OctopusEndpoint, ModelEndpoint
+from .utils import StageTimer
 
 import json
 
@@ -40,16 +46,33 @@ class Serene(object):
                  port=8080,
                  auth=None,
                  cert=None,
-                 trust_env=None):
+                 trust_env=None,
+                 pool_connections=10,
+                 pool_maxsize=10,
+                 max_retries=3,
+                 backoff_factor=0.3,
+                 timeout=DEFAULT_TIMEOUT):
         """
         Builds the SemanticModeller from a list of known
         ontologies and the config parameters.
 
         :param config: Arguments to configure the Schema Modeller
         :param ontologies: List of ontologies to use for mapping
+        :param pool_connections: The number of connection pools to cache
+        :param pool_maxsize: The maximum number of keep-alive connections to the server
+        :param max_retries: The number of retries for idempotent requests
+        :param backoff_factor: The backoff factor between retries (in seconds)
+        :param timeout: The default timeout for every request to the server, as seconds or a
+                        (connect, read) tuple, (10, 300) by default. Long training or prediction
+                        runs can need a larger read timeout, None waits forever.
 
         """
-        self._session = Session(host, port, auth, cert, trust_env)
+        self._session = Session(host, port, auth, cert, trust_env,
+                                pool_connections=pool_connections,
+                                pool_maxsize=pool_maxsize,
+                                max_retries=max_retries,
+                                backoff_factor=backoff_factor,
+                                timeout=timeout)
 
         if self._session is None:
             msg = "Failed to initialize session at {}:{}".format(host, port)
@@ -65,6 +88,9 @@ class Serene(object):
 
         self._octopii = OctopusEndpoint(self._session, self._datasets, self._models, self._ontologies, self._ssds)
 
+        # the per-stage timings of the last `load`
+        self.load_timings = None
+
     def SSD(self, dataset, ontology, name):
         """
         Here we have the SSD class that the user can use to build SSDs.
@@ -120,7 +146,13 @@ class Serene(object):
             modeling_props=modeling_props
         )
 
-    def load(self, ontology=None, datasets=None, map_file=None, link_file=None):
+    def load(self,
+             ontology=None,
+             datasets=None,
+             map_file=None,
+             link_file=None,
+             dedup=False,
+             max_workers=8):
         """
         Load sets up the server with training data from files. The user must specify
         the list of datasets, the list of ontologies, a map file in the format:
@@ -138,51 +170,104 @@ class Serene(object):
         filename, source_class, link_label, destination_class
         filename, source_class, link_label, destination_class
 
+        The uploads are pipelined: the ontologies and datasets are
+        uploaded concurrently, and the SSD of each dataset is built and
+        uploaded as soon as its dataset is on the server. The time
+        spent in each stage is logged and kept in `load_timings`.
+
         :param ontology: A list of ontologies, or a single ontology
         :param datasets: A list of CSV datasets
         :param map_file: A CSV file with the column - data_node mappings as above
         :param link_file: A CSV file with the class-class links as above
+        :param dedup: Reuse datasets already uploaded with the same content
+        :param max_workers: The number of concurrent uploads
         :return: (dataset list, ontology list, ssd list)
         """
         if type(ontology) == str:
             ontology = [ontology]
 
-        uploaded_ontologies = []
-        uploaded_datasets = []
-        uploaded_ssds = []
-
-        # first upload the ontologies...
         for o in ontology:
             if not os.path.exists(o):
                 msg = "Ontology {} does not exist.".format(o)
                 raise ValueError(msg)
-            uploaded_ontologies.append(self._ontologies.upload(o))
 
-        # secondly upload the datasets....
         for d in datasets:
             if not os.path.exists(d):
                 msg = "Dataset {} does not exist.".format(d)
                 raise ValueError(msg)
-            uploaded_datasets.append(self._datasets.upload(d))
 
-        # now build the ssds from the files...
+        # ensure that the map files are ok before uploading anything
         map_df = self._read_input_file(map_file)
         link_df = self._read_input_file(link_file)
+        self._check_parsed_input(map_df, link_df, [os.path.basename(d) for d in datasets])
+
+        maps = {f: df for f, df in map_df.groupby('filename')}
+        links = {f: df for f, df in link_df.groupby('filename')}
+
+        timer = StageTimer()
+        context = ResolutionContext(self._datasets, self._ontologies)
+        start = time.perf_counter()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            upload_ontology = timer.timed('ontologies', self._ontologies.upload)
+            upload_dataset = timer.timed('datasets', self._datasets.upload)
+            build_ssd = timer.timed('build', self._build_ssd)
+            upload_ssd = timer.timed('ssds', self._ssds.upload)
+
+            ontology_futures = [pool.submit(upload_ontology, o) for o in ontology]
+            dataset_futures = [pool.submit(upload_dataset, d, dedup=dedup) for d in datasets]
+            # with dedup the server dataset can have another filename, the maps use the local one...
+            filenames = {f: os.path.basename(d) for f, d in zip(dataset_futures, datasets)}
+
+            # the ssds need all the ontologies...
+            uploaded_ontologies = [f.result() for f in ontology_futures]
+            context.add(ontologies=uploaded_ontologies)
+
+            ssd_futures = {}
+            for f in concurrent.futures.as_completed(dataset_futures):
+                ds = f.result()
+                context.add(datasets=[ds])
+                ssd = build_ssd(ds,
+                                uploaded_ontologies,
+                                maps.get(filenames[f]),
+                                links.get(filenames[f]))
+                ssd_futures[f] = pool.submit(upload_ssd, ssd, context)
+
+            uploaded_datasets = [f.result() for f in dataset_futures]
+            uploaded_ssds = [ssd_futures[f].result() for f in dataset_futures]
+
+        timer.record('total', start, time.perf_counter())
+        self.load_timings = timer.summary
+        _logger.info("Load timings (seconds):\n{}".format(self.load_timings))
 
-        # ensure that these files are ok
-        self._check_parsed_input(map_df, link_df, uploaded_datasets)
-
-        # build up a map of SSDs...
-        ssd_map = self._build_ssd_map(uploaded_ontologies,
-                                      uploaded_datasets,
-                                      map_df,
-                                      link_df)
+        return uploaded_datasets, uploaded_ontologies, uploaded_ssds
 
-        # now attempt to upload all the ssds..
-        for ssd in ssd_map.values():
-            uploaded_ssds.append(self._ssds.upload(ssd))
+    def purge(self, max_workers=8):
+        """
+        Removes all the elements from the server. The elements are
+        removed in dependency order (octopii, models, SSDs, then the
+        datasets and ontologies), each with concurrent DELETE requests.
 
-        return uploaded_datasets, uploaded_ontologies, uploaded_ssds
+        :param max_workers: The number of concurrent requests
+        :return: Dictionary of endpoint name -> list of removed keys
+        """
+        removed = collections.OrderedDict()
+        removed['octopii'] = self._octopii.remove_many(self._octopii._api.keys(), max_workers=max_workers)
+        removed['models'] = self._models.remove_many(self._models._api.keys(), max_workers=max_workers)
+        removed['ssds'] = self._ssds.remove_many(self._ssds._api.keys(), max_workers=max_workers)
+
+        # datasets and ontologies do not depend on each other...
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            datasets = pool.submit(self._datasets.remove_many,
+                                   self._datasets._api.keys(),
+                                   max_workers=max_workers)
+            ontologies = pool.submit(self._ontologies.remove_many,
+                                     self._ontologies._api.keys(),
+                                     max_workers=max_workers)
+        removed['datasets'] = datasets.result()
+        removed['ontologies'] = ontologies.result()
+
+        return removed
 
     @staticmethod
     def _read_input_file(filename):
@@ -195,19 +280,19 @@ class Serene(object):
                            comment='#')
 
     @staticmethod
-    def _check_parsed_input(map_df, link_df, uploaded_datasets):
+    def _check_parsed_input(map_df, link_df, filenames):
         """
         Checks that the parsed inputs are valid...
 
         :param map_df: The parsed mapping file
         :param link_df: The parsed link file
-        :param uploaded_datasets: The datasets uploaded to the server
+        :param filenames: The filenames of the datasets to upload
         :return: None
         """
         # check that the datasets match
         map_datasets = set(list(map_df['filename'].unique()))
         link_datasets = set(list(link_df['filename'].unique()))
-        server_datasets = set([x.filename for x in uploaded_datasets])
+        server_datasets = set(filenames)
         if map_datasets != server_datasets:
             msg = "Map file datasets not equal to server datasets: \n {} \n {}".format(map_datasets, server_datasets)
             raise Exception(msg)
@@ -218,39 +303,30 @@ class Serene(object):
         assert(link_datasets == server_datasets)
 
     @staticmethod
-    def _build_ssd_map(uploaded_ontologies,
-                       uploaded_datasets,
-                       map_df,
-                       link_df):
+    def _build_ssd(dataset, uploaded_ontologies, map_df, link_df):
         """
-        Builds the ssd map from the uploaded ontologies and datasets
+        Builds the ssd of an uploaded dataset
+        :param dataset: The uploaded dataset
         :param uploaded_ontologies: List of uploaded ontologies
-        :param uploaded_datasets: List of uploaded datasets
-        :param map_df: The parsed mapping file
-        :param link_df: The parsed link file
-        :return: A dict of filename -> SSD()
+        :param map_df: The rows of the mapping file for the dataset
+        :param link_df: The rows of the link file for the dataset
+        :return: SSD()
         """
-        ssd_map = {ds.filename: SSD(ds, uploaded_ontologies)
-                   for ds in uploaded_datasets}
+        if map_df is None or link_df is None:
+            msg = "Dataset {} is not in the map and link files".format(dataset.filename)
+            raise Exception(msg)
 
-        # first go through the map file...
-        for _, row in map_df.iterrows():
-            column = row['column']
-            file = row['filename']
-            data_node = row['class']
-            # now add the map...
-            ssd_map[file].map(column, data_node)
+        ssd = SSD(dataset, uploaded_ontologies)
 
         # first go through the map file...
-        for _, row in link_df.iterrows():
-            file = row['filename']
-            src = row['src']
-            link = row['link']
-            dst = row['dst']
-            # now add the links...
-            ssd_map[file].link(src, link, dst)
-
-        return ssd_map
+        for column, data_node in zip(map_df['column'], map_df['class']):
+            ssd.map(column, data_node)
+
+        # now add the links...
+        for src, link, dst in zip(link_df['src'], link_df['link'], link_df['dst']):
+            ssd.link(src, link, dst)
+
+        return ssd
 
     @property
     def ontologies(self):
@@ -4,11 +4,32 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 Serene Python client: Data Integration Software
 """
-from .elements import Column, Mapping
-from .elements import Class, DataProperty, ObjectProperty, ObjectPropertyList
-from .elements import DataNode, ClassNode, DataLink, ObjectLink, ColumnLink, ClassInstanceLink, SubClassLink
-from .octopus import Octopus
-from .semantics.ontology import Ontology
-from .semantics.ssd import SSD
-from .dataset import DataSet, DataSetList
-from .semantics.base import DEFAULT_NS, KARMA_DEFAULT_NS, ALL_CN, OBJ_PROP, UNKNOWN_DN, UNKNOWN_CN
+from serene.lazy import lazy_attributes
+
+lazy_attributes(__name__, {
+    'Column': '.elements',
+    'Mapping': '.elements',
+    'Class': '.elements',
+    'DataProperty': '.elements',
+    'ObjectProperty': '.elements',
+    'ObjectPropertyList': '.elements',
+    'DataNode': '.elements',
+    'ClassNode': '.elements',
+    'DataLink': '.elements',
+    'ObjectLink': '.elements',
+    'ColumnLink': '.elements',
+    'ClassInstanceLink': '.elements',
+    'SubClassLink': '.elements',
+    'Octopus': '.octopus',
+    'Ontology': '.semantics.ontology',
+    'SSD': '.semantics.ssd',
+    'RDFMaterializer': '.semantics.materialize',
+    'DataSet': '.dataset',
+    'DataSetList': '.dataset',
+    'DEFAULT_NS': '.semantics.base',
+    'KARMA_DEFAULT_NS': '.semantics.base',
+    'ALL_CN': '.semantics.base',
+    'OBJ_PROP': '.semantics.base',
+    'UNKNOWN_DN': '.semantics.base',
+    'UNKNOWN_CN': '.semantics.base',
+})
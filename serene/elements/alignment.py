@@ -0,0 +1,222 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Code for the compact Karma alignment graph of an Octopus
+"""
+import logging
+
+import networkx as nx
+import numpy as np
+
+from ..utils import get_label, get_prefix
+
+_logger = logging.getLogger()
+_logger.setLevel(logging.WARN)
+
+
+class AlignmentGraph(object):
+    """
+    Compact, array-backed form of the Karma alignment graph. The nodes
+    are numbered 0..n-1 in the order of the server json, and the links
+    are held in compressed sparse row (CSR) form, sorted by source:
+
+        indptr: (n + 1,) the links of node i are indptr[i]:indptr[i + 1]
+        indices: (m,) the target node of each link
+        weight: (m,) the link weights
+
+    The node and link labels are held in object arrays of interned
+    strings, and the types as small integer codes. Use `to_networkx`
+    for the MultiDiGraph returned by Octopus.convert_karma_graph.
+    """
+    NODE_TYPES = ("ClassNode", "DataNode")
+
+    def __init__(self,
+                 ids,
+                 node_type,
+                 node_label,
+                 node_lab,
+                 node_prefix,
+                 indptr,
+                 indices,
+                 weight,
+                 link_type,
+                 link_types,
+                 link_label,
+                 link_prefix):
+        """
+        Initialize from pre-built arrays. Use AlignmentGraph.from_karma
+        to build one from the server json.
+        """
+        self.ids = ids
+        self.node_type = node_type
+        self.node_label = node_label
+        self.node_lab = node_lab
+        self.node_prefix = node_prefix
+        self.indptr = indptr
+        self.indices = indices
+        self.weight = weight
+        self.link_type = link_type
+        self.link_types = link_types
+        self.link_label = link_label
+        self.link_prefix = link_prefix
+
+    @classmethod
+    def from_karma(cls, data):
+        """
+        Builds the graph from the alignment json returned by the server
+
+        :param data: json read dictionary with 'nodes' and 'links'
+        :return: AlignmentGraph
+        """
+        nodes = data["nodes"]
+        links = data["links"]
+        n = len(nodes)
+        m = len(links)
+        intern = _Interner()
+
+        node_map = {}
+        node_type = np.empty(n, dtype=np.int8)
+        node_label = np.empty(n, dtype=object)
+        node_lab = np.empty(n, dtype=object)
+        node_prefix = np.empty(n, dtype=object)
+        for i, node in enumerate(nodes):
+            node_map[node["id"]] = i
+            if node["type"] == "InternalNode":
+                uri = node["label"]["uri"]
+                node_type[i] = 0
+                node_label[i] = intern(get_label(uri))
+                node_lab[i] = intern(get_label(node["id"]))
+                node_prefix[i] = intern(get_prefix(uri))
+            else:
+                node_type[i] = 1
+                node_label[i] = node_lab[i] = node_prefix[i] = ""
+
+        link_types = []
+        type_codes = {}
+        src = np.empty(m, dtype=np.int64)
+        dst = np.empty(m, dtype=np.int64)
+        weight = np.empty(m, dtype=np.float64)
+        link_type = np.empty(m, dtype=np.int8)
+        link_label = np.empty(m, dtype=object)
+        link_prefix = np.empty(m, dtype=object)
+        for j, link in enumerate(links):
+            source, uri, target = link["id"].split("---")
+            s = node_map[source]
+            t = node_map[target]
+            src[j] = s
+            dst[j] = t
+            weight[j] = link["weight"]
+            if link["type"] not in type_codes:
+                type_codes[link["type"]] = len(link_types)
+                link_types.append(link["type"])
+            link_type[j] = type_codes[link["type"]]
+            link_label[j] = intern(get_label(uri))
+            link_prefix[j] = intern(get_prefix(uri))
+
+            if link["type"] in ("DataPropertyLink", "ClassInstanceLink"):
+                # the data nodes take their names from the link...
+                node_label[t] = node_label[s] + "---" + link_label[j]
+                node_lab[t] = node_lab[s] + "---" + link_label[j]
+                node_prefix[t] = node_prefix[s]
+
+        # sort the links by source, keeping the server order otherwise...
+        order = np.argsort(src, kind='stable')
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+        _logger.info("Karma alignment graph read: {} nodes, {} links".format(n, m))
+
+        return cls(ids=np.array([node["id"] for node in nodes], dtype=object),
+                   node_type=node_type,
+                   node_label=node_label,
+                   node_lab=node_lab,
+                   node_prefix=node_prefix,
+                   indptr=indptr,
+                   indices=dst[order],
+                   weight=weight[order],
+                   link_type=link_type[order],
+                   link_types=tuple(link_types),
+                   link_label=link_label[order],
+                   link_prefix=link_prefix[order])
+
+    @property
+    def num_nodes(self):
+        return len(self.node_type)
+
+    @property
+    def num_links(self):
+        return len(self.indices)
+
+    def out_degree(self):
+        """The number of outgoing links of each node"""
+        return np.diff(self.indptr)
+
+    def in_degree(self):
+        """The number of incoming links of each node"""
+        return np.bincount(self.indices, minlength=self.num_nodes)
+
+    def successors(self, i):
+        """The target nodes of the links from node i"""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def class_nodes(self):
+        """The indices of the class nodes"""
+        return np.flatnonzero(self.node_type == 0)
+
+    def data_nodes(self):
+        """The indices of the data nodes"""
+        return np.flatnonzero(self.node_type == 1)
+
+    def node_data(self, i):
+        """The attribute dictionary of node i"""
+        return {
+            "type": self.NODE_TYPES[self.node_type[i]],
+            "label": self.node_label[i],
+            "lab": self.node_lab[i],
+            "prefix": self.node_prefix[i]
+        }
+
+    def links(self):
+        """
+        Iterates over the links
+
+        :return: Generator of (source, target, attribute dict)
+        """
+        sources = np.repeat(np.arange(self.num_nodes), self.out_degree())
+        for j in range(self.num_links):
+            yield int(sources[j]), int(self.indices[j]), {
+                "type": self.link_types[self.link_type[j]],
+                "weight": float(self.weight[j]),
+                "label": self.link_label[j],
+                "prefix": self.link_prefix[j]
+            }
+
+    def to_networkx(self):
+        """
+        Exports the graph to a new networkx MultiDiGraph, with the
+        same node and link attributes as Octopus.convert_karma_graph
+
+        :return: networkx MultiDiGraph
+        """
+        g = nx.MultiDiGraph()
+        for i in range(self.num_nodes):
+            g.add_node(i, **self.node_data(i))
+        for s, t, data in self.links():
+            g.add_edge(s, t, **data)
+        return g
+
+    @property
+    def nbytes(self):
+        """The number of bytes held by the numeric arrays"""
+        arrays = [self.node_type, self.indptr, self.indices, self.weight, self.link_type]
+        return sum(a.nbytes for a in arrays)
+
+    def __repr__(self):
+        return "AlignmentGraph(nodes={}, links={})".format(self.num_nodes, self.num_links)
+
+
+class _Interner(dict):
+    """Shares a single copy of the repeated label and prefix strings"""
+    def __call__(self, value):
+        return self.setdefault(value, value)
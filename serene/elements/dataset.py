@@ -13,6 +13,7 @@ import pandas as pd
 import logging
 import os.path
 import json
+import threading
 
 from serene.utils import convert_datetime
 from serene.elements import Column
@@ -28,22 +29,97 @@ class DataSet(object):
     """
     def __init__(self, json):
         """
-        Initialize a DataSet object with a json response
+        Initialize a DataSet object with a json response. Only the
+        scalar fields are read here, the Column objects, the sample
+        DataFrame and the dates are built on first access.
+
         :param json:
         """
         self.id = json['id']
-        self.columns = [Column('--').update(c, self) for c in json['columns']]
         self.filename = json['filename']
         self.path = json['path']
         self.type_map = json['typeMap']
         self.description = json['description']
-        self.date_created = convert_datetime(json['dateCreated'])
-        self.date_modified = convert_datetime(json['dateModified'])
-        self.sample = pd.DataFrame({
-            c.name: c.sample for c in self.columns
-        })
         self._stored = True
 
+        # raw values for the lazy properties...
+        self._columns_json = json['columns']
+        self._date_created_json = json['dateCreated']
+        self._date_modified_json = json['dateModified']
+
+        self._columns = None
+        self._columns_lock = threading.Lock()
+        self._sample = None
+        self._date_created = None
+        self._date_modified = None
+
+    @property
+    def columns(self):
+        """The Column objects, built once on first access"""
+        columns = self._columns
+        if columns is None:
+            with self._columns_lock:
+                if self._columns is None:
+                    self._columns = [Column('--').update(c, self) for c in self._columns_json]
+                    # the columns now hold the samples, the json is dropped
+                    # only once they are set...
+                    self._columns_json = None
+                columns = self._columns
+        return columns
+
+    def _column_state(self):
+        """
+        The Column objects if built, else the column json. The json is read
+        first, so it is still there if the columns are not built yet.
+        """
+        raw = self._columns_json
+        columns = self._columns
+        return columns, raw
+
+    @property
+    def sample(self):
+        """The sample DataFrame built from the column samples on first access"""
+        if self._sample is None:
+            self._sample = pd.DataFrame({
+                c.name: c.sample for c in self.columns
+            })
+        return self._sample
+
+    @property
+    def date_created(self):
+        if self._date_created is None:
+            self._date_created = convert_datetime(self._date_created_json)
+        return self._date_created
+
+    @property
+    def date_modified(self):
+        if self._date_modified is None:
+            self._date_modified = convert_datetime(self._date_modified_json)
+        return self._date_modified
+
+    @property
+    def num_columns(self):
+        """The number of columns, without building the Column objects"""
+        columns, raw = self._column_state()
+        if columns is not None:
+            return len(columns)
+        return len(raw)
+
+    @property
+    def num_rows(self):
+        """The number of rows, without building the Column objects"""
+        columns, raw = self._column_state()
+        if columns is not None:
+            return max((c.size for c in columns), default=0)
+        return max((c['size'] for c in raw), default=0)
+
+    def column_ids(self):
+        """The column ids, without building the Column objects"""
+        columns, raw = self._column_state()
+        if columns is not None:
+            return [c.id for c in columns]
+        return [c['id'] for c in raw]
+
     @property
     def stored(self):
         return self._stored
@@ -55,7 +131,7 @@ class DataSet(object):
         return self.columns.__iter__()
 
     def __len__(self):
-        return len(self.columns)
+        return self.num_columns
 
     def __eq__(self, other):
         return all([
@@ -70,7 +146,10 @@ class DataSet(object):
         ])
 
     def column_names(self):
-        return [z.name for z in self.columns]
+        columns, raw = self._column_state()
+        if columns is None:
+            return [c['name'] for c in raw]
+        return [z.name for z in columns]
 
     def column(self, name):
         candidates = [c for c in self.columns if c.name == name]
@@ -270,24 +349,34 @@ class DataSetList(collections.MutableSequence):
 
     @property
     def summary(self):
-        df = pd.DataFrame(columns=[
-            'id',
-            'name',
-            'description',
-            'created',
-            'modified',
-            'rows',
-            'cols'
-        ])
-        for elem in self.list:
-            df.loc[len(df)] = [
-                elem.id,
-                elem.filename,
-                elem.description,
-                elem.date_created,
-                elem.date_modified,
-                max(c.size for c in elem.columns),
-                len(elem.columns)
-            ]
-        return df
+        return summary_frame(self.list)
+
 
+def summary_frame(datasets):
+    """
+    Builds the summary table for a list of DataSet objects. This
+    only reads the scalar dataset fields, so the Column objects and
+    sample DataFrames are not built.
+
+    :param datasets: The DataSet objects
+    :return: Pandas DataFrame
+    """
+    return pd.DataFrame([
+        [
+            elem.id,
+            elem.filename,
+            elem.description,
+            elem.date_created,
+            elem.date_modified,
+            elem.num_rows,
+            elem.num_columns
+        ] for elem in datasets
+    ], columns=[
+        'id',
+        'name',
+        'description',
+        'created',
+        'modified',
+        'rows',
+        'cols'
+    ])
@@ -20,6 +20,22 @@ class Column(Searchable):
     """
     Holds a reference to the original data column
     """
+    # Columns are created for every dataset on the server, so the
+    # instance dict is dropped and the (name, id, datasetID) hash cached...
+    __slots__ = (
+        '_name',
+        '_id',
+        '_datasetID',
+        '_hash',
+        'size',
+        'dataset',
+        'sample',
+        'logicalType',
+        'df',
+        'filename',
+        'index'
+    )
+
     # now we setup the search parameters...
     getters = [
         lambda col: col.name,
@@ -35,18 +51,46 @@ class Column(Searchable):
         :param filename:
         :param index:
         """
-        self.id = None
+        self._hash = None
+        self._id = None
         self.size = None
-        self.datasetID = None
+        self._datasetID = None
         self.dataset = None
         self.sample = None
         self.logicalType = None
         self.df = df
         self.filename = filename
-        self.name = name
+        self._name = name
         self.index = index
         super().__init__()
 
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+        self._hash = None
+
+    @property
+    def id(self):
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+        self._hash = None
+
+    @property
+    def datasetID(self):
+        return self._datasetID
+
+    @datasetID.setter
+    def datasetID(self, value):
+        self._datasetID = value
+        self._hash = None
+
     def update(self, json, dataset):
         """
         Update a Column object using a json table...
@@ -55,12 +99,13 @@ class Column(Searchable):
         """
         self.index = json['index']
         self.filename = json['path']
-        self.name = json['name']
-        self.id = json['id']
+        self._name = json['name']
+        self._id = json['id']
         self.size = json['size']
-        self.datasetID = json['datasetID']
+        self._datasetID = json['datasetID']
         self.sample = json['sample']
         self.logicalType = json['logicalType']
+        self._hash = None
 
         self.dataset = dataset
 
@@ -74,6 +119,8 @@ class Column(Searchable):
         return "Column({})".format(self.name)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (
             (other.name == self.name) and
             (other.id == self.id) and
@@ -81,7 +128,9 @@ class Column(Searchable):
         )
 
     def __hash__(self):
-        return hash((self.name, self.id, self.datasetID))
+        if self._hash is None:
+            self._hash = hash((self._name, self._id, self._datasetID))
+        return self._hash
 
 
 class Mapping(object):
@@ -116,6 +165,8 @@ class Class(Searchable):
         attribute or a column in a dataset.
         A ClassNode can link to another ClassNode via a Link.
     """
+    __slots__ = ('label', 'prefix', 'parent', 'idx', 'nodes')
+
     # the search parameters...
     getters = [
         lambda node: node.label,
@@ -169,6 +220,8 @@ class Class(Searchable):
         return "Class({}, [{}])".format(self.label, ", ".join(nodes))
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (self.label == other.label) \
                and (self.prefix == other.prefix)
 
@@ -181,6 +234,8 @@ class DataProperty(Searchable):
         A DataNode is an attribute of a ClassNode. This can correspond to a
         column in a dataset.
     """
+    __slots__ = ('dtype', 'prefix', 'label', 'parent')
+
     # the search parameters...
     getters = [
         lambda node: node.label,
@@ -246,6 +301,8 @@ class DataProperty(Searchable):
         return not self.__eq__(other)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if type(other) is type(self):
             if self.parent is not None and other.parent is not None:
                 return self.label == other.label and \
@@ -271,6 +328,8 @@ class ObjectProperty(Searchable):
     """
         A Link is a relationship between Class->Class or Class->DataProperty.
     """
+    __slots__ = ('label', 'src', 'dst', 'prefix', 'link_type')
+
     @staticmethod
     def node_match(node):
         if node.src is None:
@@ -345,6 +404,8 @@ class ObjectProperty(Searchable):
         return not self.__eq__(other)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (self.label == other.label) and \
                (self.src == other.src) and \
                (self.dst == other.dst)
@@ -389,10 +450,13 @@ class ObjectPropertyList(collections.MutableSequence):
 
 
 class SSDSearchable(Searchable):
-    pass
+    __slots__ = ()
 
 
 class ClassNode(SSDSearchable):
+    # the nodes are immutable, so the hash is computed once
+    # and used to short-circuit the SSDGraph lookups...
+    __slots__ = ('_label', '_index', '_prefix', '_hash')
 
     # the search parameters...
     getters = [
@@ -401,11 +465,13 @@ class ClassNode(SSDSearchable):
         lambda node: node.prefix if node.prefix else None
     ]
 
+    _type = "ClassNode"
+
     def __init__(self, label, index=None, prefix=None):
         self._label = label
         self._index = index
         self._prefix = prefix
-        self._type = "ClassNode"
+        self._hash = hash((index, label, str(prefix), type(self)))
 
         super().__init__()
 
@@ -439,16 +505,21 @@ class ClassNode(SSDSearchable):
         return not self.__eq__(other)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (type(self) == type(other)) \
+               and (self._hash == other._hash) \
                and (self.label == other.label) \
                and (str(self.prefix) == str(other.prefix)) \
                and (self.index == other.index)
 
     def __hash__(self):
-        return hash((self.index, self.label, str(self.prefix), type(self)))
+        return self._hash
 
 
 class DataNode(SSDSearchable):
+    # as with the ClassNode, the hash is computed once...
+    __slots__ = ('_dtype', '_prefix', '_class_node', '_label', '_index', '_hash')
 
     # the search parameters...
     getters = [
@@ -458,6 +529,8 @@ class DataNode(SSDSearchable):
         lambda node: node.class_node if node.class_node else None
     ]
 
+    _type = "DataNode"
+
     def __init__(self, class_node, label, index=None, prefix=None, dtype=str):
         """
         A DataNode is initialized with name and a parent Class object.
@@ -478,8 +551,8 @@ class DataNode(SSDSearchable):
 
         self._class_node = class_node
         self._label = label
-        self._type = "DataNode"
         self._index = index
+        self._hash = hash((label, str(prefix), class_node, index))
 
         super().__init__()
 
@@ -521,43 +594,76 @@ class DataNode(SSDSearchable):
         return not self.__eq__(other)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (type(self) == type(other)) \
+               and (self._hash == other._hash) \
                and (self.label == other.label) \
                and (str(self.prefix) == str(other.prefix)) \
                and (self.index == other.index) \
                and (self.class_node == other.class_node)
 
     def __hash__(self):
-        return hash((self.label, str(self.prefix), self.class_node, self.index))
+        return self._hash
 
 
 class SSDLink(object):
     """
     Link objects for the SSD semantic model
     """
+    __slots__ = ('_label', '_prefix', '_hash')
+
+    type = None
+
     def __init__(self, label, prefix):
-        self.label = label
-        self.prefix = prefix
-        self.type = None
+        self._label = label
+        self._prefix = prefix
+        self._hash = None
+
+    @property
+    def label(self):
+        return self._label
+
+    @label.setter
+    def label(self, value):
+        self._label = value
+        self._hash = None
+
+    @property
+    def prefix(self):
+        return self._prefix
+
+    @prefix.setter
+    def prefix(self, value):
+        # the SSD fills in missing prefixes with the default namespace...
+        self._prefix = value
+        self._hash = None
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (self.label == other.label) \
                and (str(self.prefix) == str(other.prefix))
 
     def __hash__(self):
-        return hash((self.label, str(self.prefix)))
+        if self._hash is None:
+            self._hash = hash((self._label, str(self._prefix)))
+        return self._hash
 
 
 class DataLink(SSDLink):
     """
     Link between ClassNode -> DataNode
     """
+    __slots__ = ()
+
+    type = "DataPropertyLink"
+
     def __init__(self, label, prefix=None):
         super().__init__(label, prefix)
-        self.type = "DataPropertyLink"
 
     def __repr__(self):
         return "DataLink({})".format(self.label)
@@ -567,9 +673,9 @@ class ObjectLink(SSDLink):
     """
     Link between ClassNode -> ClassNode
     """
-    def __init__(self, label, prefix):
-        super().__init__(label, prefix)
-        self.type = "ObjectPropertyLink"
+    __slots__ = ()
+
+    type = "ObjectPropertyLink"
 
     def __repr__(self):
         return "ObjectLink({})".format(self.label)
@@ -579,14 +685,19 @@ class ColumnLink(SSDLink):
     """
     Link between DataNode -> Column
     """
+    __slots__ = ()
+
+    type = "ColumnLink"
+
     def __init__(self, label, prefix=None):
         super().__init__(label, prefix)
-        self.type = "ColumnLink"
 
     def __repr__(self):
         return "ColumnLink({}, {})".format(self.label, self.prefix)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (self.label == other.label) and (self.type == other.type)
 
 
@@ -594,9 +705,12 @@ class ClassInstanceLink(DataLink):
     """
     Link between ClassNode -> DataNode
     """
+    __slots__ = ()
+
+    type = "ClassInstanceLink"
+
     def __init__(self, label, prefix):
         super().__init__(label, prefix)
-        self.type = "ClassInstanceLink"
 
     def __repr__(self):
         return "ClassLink({})".format(self.label)
@@ -606,9 +720,9 @@ class SubClassLink(SSDLink):
     """
     Link between ClassNode -> ClassNode of type subclass
     """
-    def __init__(self, label, prefix):
-        super().__init__(label, prefix)
-        self.type = "SubClassLink"
+    __slots__ = ()
+
+    type = "SubClassLink"
 
     def __repr__(self):
         return "SubClassLink({})".format(self.label)
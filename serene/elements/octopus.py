@@ -4,15 +4,19 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 Code for the Octopus object
 """
+import collections
+import concurrent.futures
+import itertools
 import logging
 import time
+from functools import lru_cache
 
 from ..matcher import ModelState, Status, ModelType, SamplingStrategy
-from ..utils import convert_datetime, get_label, get_prefix
+from ..utils import convert_datetime
+from .alignment import AlignmentGraph
 from .dataset import DataSet
 from .semantics.ontology import Ontology
-from .semantics.ssd import SSD
-import networkx as nx
+from .semantics.ssd import SSD, ResolutionContext
 try:
     from math import inf
 except ImportError:
@@ -22,6 +26,15 @@ _logger = logging.getLogger()
 _logger.setLevel(logging.WARN)
 
 
+@lru_cache(maxsize=8)
+def _alignment(api, key, date_modified):
+    """
+    Downloads the alignment graph of an octopus. The modification
+    date is part of the cache key, so a retrained octopus is fetched again.
+    """
+    return AlignmentGraph.from_karma(api.alignment(key))
+
+
 class OctopusScore(object):
     """
     The score object from the prediction
@@ -55,23 +68,122 @@ class OctopusScore(object):
 
 
 class SSDResult(object):
-    """Octopus Prediction result object"""
-    def __init__(self, ssd, score):
+    """
+    Octopus Prediction result object. The SSD can be held as the
+    raw json blob and is only decoded on first access.
+    """
+    def __init__(self, ssd, score, blob=None, decoder=None):
+        """
+        :param ssd: The SSD object, or None if it is decoded from `blob`
+        :param score: The OctopusScore
+        :param blob: The SSD json blob, decoded on first access
+        :param decoder: function(blob) -> SSD used to decode the blob
+        """
         self._score = score
         self._ssd = ssd
+        self._blob = blob
+        self._decoder = decoder
 
     @property
     def score(self):
         return self._score
 
+    @property
+    def decoded(self):
+        """True if the SSD has been built"""
+        return self._ssd is not None
+
     @property
     def ssd(self):
+        if self._ssd is None and self._blob is not None:
+            self._ssd = self._decoder(self._blob)
+            # the blob is no longer needed...
+            self._blob = None
+            self._decoder = None
         return self._ssd
 
     def __repr__(self):
         return "SSDResult({})".format(self.score.karmaRank)
 
 
+class SSDResultList(collections.Sequence):
+    """
+    The ranked list of SSDResult objects returned by Octopus.predict.
+    The scores are available straight away, while the SSD graphs are
+    only built when a result's `ssd` is accessed.
+    """
+    def __init__(self, results):
+        self._results = list(results)
+
+    @property
+    def scores(self):
+        """The OctopusScore of each result"""
+        return [r.score for r in self._results]
+
+    @property
+    def ssds(self):
+        """The SSD of each result. Note that this decodes all the results"""
+        return [r.ssd for r in self._results]
+
+    def top(self, k=1):
+        """Returns the first k results"""
+        return SSDResultList(self._results[:k])
+
+    def decode(self, k=None):
+        """Decodes the SSDs of the first k results (all if None)"""
+        for r in self._results[:k]:
+            r.ssd
+        return self
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return SSDResultList(self._results[i])
+        return self._results[i]
+
+    def __len__(self):
+        return len(self._results)
+
+    def __repr__(self):
+        return "[{}]".format(", ".join(repr(r) for r in self._results))
+
+
+class PredictionBatch(collections.Mapping):
+    """
+    The results of Octopus.predict_many, a read-only mapping of
+    dataset id -> SSDResultList. The datasets which failed are not
+    in the mapping, their exceptions are held in `errors` instead.
+    """
+    def __init__(self, results, errors):
+        """
+        :param results: dict of dataset id -> SSDResultList
+        :param errors: dict of dataset id -> Exception
+        """
+        self._results = results
+        self._errors = errors
+
+    @property
+    def errors(self):
+        """dict of dataset id -> Exception for the failed predictions"""
+        return self._errors
+
+    @property
+    def failed(self):
+        """The ids of the datasets which failed"""
+        return list(self._errors.keys())
+
+    def __getitem__(self, key):
+        return self._results[key]
+
+    def __len__(self):
+        return len(self._results)
+
+    def __iter__(self):
+        return iter(self._results)
+
+    def __repr__(self):
+        return "PredictionBatch(ok={}, failed={})".format(len(self._results), len(self._errors))
+
+
 class Octopus(object):
     """
         Octopus is the central integration map for a collection of DataSets.
@@ -246,33 +358,110 @@ class Octopus(object):
         logging.info("Training complete for {}.".format(self.id))
         return state().status == Status.COMPLETE
 
-    def predict(self, dataset):
+    def predict(self, dataset, top_k=None, stream=False):
         """
+        Predicts the semantic models for `dataset`. The candidate SSDs
+        are decoded lazily, on first access of SSDResult.ssd.
+
         :param dataset: The dataset to perform a prediction
-        :return: List of (SSD, OctopusScore), ordered by best Karma rank
+        :param top_k: If set, only the first k candidates are kept
+        :param stream: If True the server response is decoded incrementally,
+                       and with `top_k` the download stops after k candidates
+        :return: SSDResultList of SSDResult(SSD, OctopusScore), ordered by best Karma rank
         """
-        if not dataset.stored:
-            msg = "{} is not stored on the server.".format(dataset)
-            raise ValueError(msg)
+        key = self._dataset_key(dataset)
+
+        # the candidates all share the same dataset and ontologies...
+        context = ResolutionContext(self._dataset_endpoint, self._ontology_endpoint)
 
+        return self._predict(key, top_k, stream, context)
+
+    def predict_many(self, datasets, max_workers=4, top_k=None, stream=False, decode_top=0):
+        """
+        Runs the predictions for many datasets at once. The prediction
+        requests are sent concurrently, at most `max_workers` at a time,
+        and a failed dataset does not stop the others.
+
+        Note that the session connection pool should hold at least
+        `max_workers` connections, see Serene(pool_maxsize=...).
+
+        :param datasets: List of DataSet objects or dataset ids
+        :param max_workers: The maximum number of concurrent requests
+        :param top_k: If set, only the first k candidates are kept for each dataset
+        :param stream: If True each server response is decoded incrementally
+        :param decode_top: The number of top candidate SSDs to decode for each dataset
+                           in the worker pool, the others are decoded on access
+        :return: PredictionBatch of dataset id -> SSDResultList, with the errors
+                 for the failed datasets in PredictionBatch.errors
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        # the lookups are shared across all the datasets...
+        context = ResolutionContext(self._dataset_endpoint, self._ontology_endpoint)
+
+        def run(dataset):
+            key = self._dataset_key(dataset)
+            results = self._predict(key, top_k, stream, context)
+            if decode_top:
+                results.decode(decode_top)
+            return results
+
+        results = collections.OrderedDict()
+        errors = collections.OrderedDict()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = collections.OrderedDict(
+                (pool.submit(run, ds), ds) for ds in datasets
+            )
+            for future, ds in futures.items():
+                key = ds.id if issubclass(type(ds), DataSet) else ds
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    logging.error("Prediction failed for dataset {}: {}".format(key, e))
+                    errors[key] = e
+
+        return PredictionBatch(results, errors)
+
+    @staticmethod
+    def _dataset_key(dataset):
+        """Helper function to get the dataset id from a DataSet or key"""
         if issubclass(type(dataset), DataSet):
-            key = dataset.id
-        else:
-            key = int(dataset)
+            if not dataset.stored:
+                msg = "{} is not stored on the server.".format(dataset)
+                raise ValueError(msg)
+            return dataset.id
+        return int(dataset)
 
-        blob = self._session.octopus_api.predict(self.id, key)
+    def _predict(self, key, top_k, stream, context):
+        """
+        Helper function to request the prediction for the dataset `key`
+        and build the lazy result list. The SSDs are decoded with the
+        lookups in `context`.
+        """
+        if stream:
+            prediction_list = self._session.octopus_api.predict(self.id, key, stream=True)
+        else:
+            blob = self._session.octopus_api.predict(self.id, key)
+            prediction_list = blob['predictions']
 
-        prediction_list = blob['predictions']
+        def decode(ssd_blob):
+            return SSD().update(ssd_blob,
+                                self._dataset_endpoint,
+                                self._ontology_endpoint,
+                                context)
 
         output = []
-        for pred in prediction_list:
-            ssd = SSD().update(pred['ssd'],
-                               self._dataset_endpoint,
-                               self._ontology_endpoint)
-            score = OctopusScore(pred['score'])
-            output.append(SSDResult(ssd, score))
+        try:
+            for pred in itertools.islice(prediction_list, top_k):
+                score = OctopusScore(pred['score'])
+                output.append(SSDResult(None, score, pred['ssd'], decode))
+        finally:
+            if stream:
+                # stops the download if top_k was reached...
+                prediction_list.close()
 
-        return output
+        return SSDResultList(output)
 
     @staticmethod
     def convert_karma_graph(data):
@@ -282,53 +471,32 @@ class Octopus(object):
         :return:
         """
         logging.info("Converting karma alignment graph...")
+        return AlignmentGraph.from_karma(data).to_networkx()
 
-        nodes = data["nodes"]
-        links = data["links"]
-
-        g = nx.MultiDiGraph()
-
-        cur_id = 0
-        node_map = {}
-        for node in nodes:
-            # filling in the nodes
-            node_map[node["id"]] = cur_id
-            node_data = {
-                "type": "ClassNode" if node["type"] == "InternalNode" else "DataNode",
-                "label": get_label(node["label"]["uri"]) if node["type"] == "InternalNode" else "",
-                "lab": get_label(node["id"]) if node["type"] == "InternalNode" else "",
-                "prefix": get_prefix(node["label"]["uri"]) if node["type"] == "InternalNode" else ""
-            }
-            g.add_node(cur_id, attr_dict=node_data)
-            cur_id += 1
-
-        cur_id = 0
-        for link in links:
-            # filling in the links
-            source, uri, target = link["id"].split("---")
-            link_data = {
-                "type": link["type"],
-                "weight": link["weight"],
-                "label": get_label(uri),
-                "prefix": get_prefix(uri)
-            }
-            g.add_edge(node_map[source], node_map[target], attr_dict=link_data)
-            cur_id += 1
-            if link["type"] in ["DataPropertyLink", "ClassInstanceLink"]:
-                # change data nodes
-                g.node[node_map[target]]["label"] = g.node[node_map[source]]["label"] + "---" + link_data["label"]
-                g.node[node_map[target]]["lab"] = g.node[node_map[source]]["lab"] + "---" + link_data["label"]
-                g.node[node_map[target]]["prefix"] = g.node[node_map[source]]["prefix"]
-
-        logging.info("Karma alignment graph read: {} nodes, {} links".format(g.number_of_nodes(), g.number_of_edges()))
-        print("Karma alignment graph read: {} nodes, {} links".format(g.number_of_nodes(), g.number_of_edges()))
-
-        return g
-
-    def get_alignment(self):
-        """Get alignment graph for octopus at position key and convert it to networkx MultiDiGraph!"""
-        blob = self._session.octopus_api.alignment(self.id)
-        return self.convert_karma_graph(blob)
+    def get_alignment(self, compact=False, refresh=False):
+        """
+        Get alignment graph for octopus at position key. The graph is cached
+        for the octopus id and modification date, so it is only downloaded
+        again once the octopus has changed on the server.
+
+        :param compact: If True return the compact AlignmentGraph, otherwise
+                        a new networkx MultiDiGraph exported from it
+        :param refresh: If True check the server for a newer octopus first
+        :return: AlignmentGraph or networkx MultiDiGraph
+        """
+        if refresh:
+            json = self._session.octopus_api.item(self.id)
+            self.update(json,
+                        self._session,
+                        self._dataset_endpoint,
+                        self._model_endpoint,
+                        self._ontology_endpoint,
+                        self._ssd_endpoint)
+
+        graph = _alignment(self._session.octopus_api, self.id, self.date_modified)
+        if compact:
+            return graph
+        return graph.to_networkx()
 
     def matcher_predict(self, dataset, scores=True, features=False):
         """
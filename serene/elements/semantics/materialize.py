@@ -0,0 +1,331 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Streams the rows of a dataset out as RDF triples, following the
+semantic model of an SSD
+"""
+import collections
+import concurrent.futures
+import logging
+import re
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from .base import DEFAULT_NS, UNKNOWN_CN, ALL_CN
+from .ontology import RDFWriter
+from ..elements import ClassNode
+from ..elements import DataLink, ObjectLink, ClassInstanceLink, ColumnLink
+
+_logger = logging.getLogger()
+_logger.setLevel(logging.WARN)
+
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+
+# the local names that can be written as prefixed names in turtle
+TURTLE_LOCAL = re.compile(r'^[A-Za-z_][A-Za-z0-9_\-]*$')
+
+# The rendering instructions for the chunks. All the terms are already
+# in their output form, so the plan can be sent to the worker processes:
+#   classes: list of (subject prefix, class term, instance column or None)
+#   data: list of (class position, predicate term, column, datatype suffix, is boolean)
+#   links: list of (source class position, predicate term, target class position)
+MaterializationPlan = collections.namedtuple(
+    'MaterializationPlan', 'type_term classes data links'
+)
+
+
+def _escape(values):
+    """Escapes an object array of strings for N-Triples/Turtle string literals"""
+    # most columns need no escapes, which is quicker to check on the joined text...
+    text = '\x00'.join(values)
+    if not any(c in text for c in ('\\', '"', '\n', '\r')):
+        return values
+    return pd.Series(values).str.replace('\\', '\\\\', regex=False) \
+                            .str.replace('"', '\\"', regex=False) \
+                            .str.replace('\n', '\\n', regex=False) \
+                            .str.replace('\r', '\\r', regex=False) \
+                            .to_numpy(dtype=object)
+
+
+def _strings(df, column):
+    """The non-empty values of a column as an object array, and their mask"""
+    values = df[column].to_numpy(dtype=object)
+    mask = pd.notna(values)
+    return values[mask], mask
+
+
+def render_chunk(plan, df, offset):
+    """
+    Renders the triples of the rows in `df`. The URIs and literals are
+    built a whole column at a time, on object arrays. Empty values give
+    no triples.
+
+    :param plan: The MaterializationPlan
+    :param df: DataFrame with the mapped columns as strings
+    :param offset: The row number of the first row of `df` in the source
+    :return: (text, number of triples)
+    """
+    rows = np.arange(offset, offset + len(df)).astype(str).astype(object)
+
+    subjects = []
+    for prefix, _, column in plan.classes:
+        subject = ('<' + prefix) + rows + '>'
+        if column is not None:
+            values, mask = _strings(df, column)
+            subject[mask] = '<' + values + '>'
+        subjects.append(subject)
+
+    parts = []
+    for subject, (_, term, _) in zip(subjects, plan.classes):
+        parts.append(subject + (' ' + plan.type_term + ' ' + term + ' .'))
+
+    for i, pred, column, suffix, boolean in plan.data:
+        values, mask = _strings(df, column)
+        if boolean:
+            values = np.char.lower(values.astype(str)).astype(object)
+        parts.append(subjects[i][mask] + (' ' + pred + ' "') + _escape(values) + ('"' + suffix + ' .'))
+
+    for i, pred, j in plan.links:
+        parts.append(subjects[i] + (' ' + pred + ' ') + subjects[j] + ' .')
+
+    lines = np.concatenate(parts) if parts else []
+    if not len(lines):
+        return '', 0
+    return '\n'.join(lines) + '\n', len(lines)
+
+
+class RDFMaterializer(object):
+    """
+    Turns a dataset into RDF with the semantic model of an SSD. Each
+    row gives an instance of every class node, typed with the class,
+    with the mapped column values as data property literals, and joined
+    to the other instances of the row by the object links.
+
+        m = RDFMaterializer(ssd, fmt='ttl')
+        m.write('big.csv', 'big.ttl', chunk_size=100000, processes=4)
+
+    The source is read chunk by chunk, so only a few chunks are held
+    in memory at a time. The instance URIs are {base}{ssd name}/{class}/{row},
+    unless the class node has a ClassInstanceLink, in which case the
+    column values are the instance URIs. The All and Unknown nodes added
+    by SSD.fill_unknown are left out.
+    """
+    FORMATS = ('nt', 'ttl')
+
+    def __init__(self, ssd, fmt='nt', base=DEFAULT_NS, typed=True):
+        """
+        :param ssd: The SSD with the mappings to the source columns
+        :param fmt: The output format, 'nt' for N-Triples or 'ttl' for Turtle
+        :param base: The namespace of the instance URIs
+        :param typed: If True the literals take the xsd type of the data property
+                      ranges in the SSD ontologies
+        """
+        if fmt not in self.FORMATS:
+            msg = "Unknown RDF format {}, use one of {}".format(fmt, self.FORMATS)
+            raise ValueError(msg)
+
+        self._ssd = ssd
+        self._fmt = fmt
+        self._base = base
+        self._prefixes = collections.OrderedDict()  # namespace -> prefix name
+        if fmt == 'ttl':
+            self._prefixes[XSD_NS] = 'xsd'
+        self._plan = self._build_plan(typed)
+
+    @property
+    def plan(self):
+        return self._plan
+
+    @property
+    def columns(self):
+        """The names of the source columns read by the plan"""
+        names = [c for _, _, c in self._plan.classes if c is not None]
+        names += [c for _, _, c, _, _ in self._plan.data]
+        return list(collections.OrderedDict.fromkeys(names))
+
+    def _term(self, iri):
+        """The output form of an ontology URI"""
+        if self._fmt == 'ttl':
+            for ns in sorted(self._prefixes, key=len, reverse=True):
+                local = iri[len(ns):]
+                if iri.startswith(ns) and TURTLE_LOCAL.match(local):
+                    return "{}:{}".format(self._prefixes[ns], local)
+        return '<' + iri + '>'
+
+    def _namespace(self, prefix):
+        """Registers the turtle prefix name of an ontology namespace"""
+        prefix = str(prefix)
+        if self._fmt == 'ttl' and prefix not in self._prefixes:
+            self._prefixes[prefix] = "ns{}".format(len(self._prefixes))
+        return prefix
+
+    def _datatypes(self):
+        """(class label, property label) -> python type of the ontology data properties"""
+        types = {}
+        for onto in self._ssd.ontology:
+            for cls in onto.class_nodes:
+                # the subclasses inherit the data properties of the parents...
+                parent = cls
+                while parent is not None:
+                    for dp in parent.nodes:
+                        types.setdefault((cls.label, dp.label), dp.dtype)
+                    parent = parent.parent
+        return types
+
+    def _build_plan(self, typed):
+        """Reads the class nodes, data nodes and links of the SSD semantic model"""
+        model = self._ssd.semantic_model
+        graph = model.graph
+        default_ns = self._ssd.default_namespace
+
+        def skip(node):
+            return type(node) == ClassNode and node.label in (ALL_CN, UNKNOWN_CN)
+
+        # the column of each data node...
+        columns = {}
+        for x, y, link in graph.edges(data=True):
+            if type(link[model.DATA_KEY]) == ColumnLink:
+                columns[x] = model.node_data(y)
+
+        # the class nodes, in graph order...
+        class_pos = collections.OrderedDict()
+        for n in sorted(graph.nodes()):
+            node = model.node_data(n)
+            if type(node) == ClassNode and not skip(node):
+                class_pos[n] = len(class_pos)
+
+        types = self._datatypes() if typed else {}
+        # plain literals for str, otherwise the xsd types written by RDFWriter...
+        suffixes = {k: "^^" + self._term(str(v)) for k, v in RDFWriter().TYPE_MAP.items() if k is not str}
+
+        name = quote(str(self._ssd.name), safe='')
+        instance_cols = {}
+        data = []
+        links = []
+        for x, y, link in graph.edges(data=True):
+            item = link[model.DATA_KEY]
+            src = model.node_data(x)
+            if skip(src) or skip(model.node_data(y)) or x not in class_pos:
+                continue
+
+            if type(item) == ClassInstanceLink and y in columns:
+                instance_cols[x] = columns[y].name
+            elif type(item) == DataLink and y in columns:
+                dn = model.node_data(y)
+                pred = self._term(self._namespace(item.prefix or default_ns) + item.label)
+                dtype = types.get((src.label, dn.label), dn.dtype)
+                data.append((class_pos[x], pred, columns[y].name, suffixes.get(dtype, ''), dtype == bool))
+            elif type(item) == ObjectLink and y in class_pos:
+                pred = self._term(self._namespace(item.prefix or default_ns) + item.label)
+                links.append((class_pos[x], pred, class_pos[y]))
+
+        classes = []
+        seen = collections.Counter()
+        for n in class_pos:
+            node = model.node_data(n)
+            seen[node.label] += 1
+            # a class with several nodes gets Person, Person2, ...
+            local = node.label if seen[node.label] == 1 else "{}{}".format(node.label, seen[node.label])
+            prefix = "{}{}/{}/".format(self._base, name, quote(local, safe=''))
+            term = self._term(self._namespace(node.prefix or default_ns) + node.label)
+            classes.append((prefix, term, instance_cols.get(n)))
+
+        type_term = 'a' if self._fmt == 'ttl' else '<' + RDF_TYPE + '>'
+        return MaterializationPlan(type_term, classes, data, links)
+
+    @property
+    def header(self):
+        """The text written before the triples, the turtle prefixes"""
+        if self._fmt != 'ttl':
+            return ''
+        return ''.join("@prefix {}: <{}> .\n".format(p, ns) for ns, p in self._prefixes.items()) + '\n'
+
+    def frames(self, source, chunk_size=100000):
+        """
+        The source rows as DataFrames of up to chunk_size rows, with only
+        the mapped columns, as strings with NaN for the empty values.
+
+        :param source: The csv file path or a DataFrame
+        :param chunk_size: The number of rows of each chunk
+        :return: Generator of DataFrames
+        """
+        columns = self.columns
+        if issubclass(type(source), pd.DataFrame):
+            missing = [c for c in columns if c not in source.columns]
+            if missing:
+                msg = "The source is missing the mapped columns {}".format(missing)
+                raise ValueError(msg)
+            for start in range(0, len(source), chunk_size):
+                df = source.iloc[start:start + chunk_size]
+                df = df[columns].astype(object)
+                yield df.where(df.isna(), df.astype(str))
+        else:
+            # only the empty cells are missing values, 'NA' and the like are kept...
+            reader = pd.read_csv(source,
+                                 usecols=lambda c: c in columns,
+                                 dtype=str,
+                                 keep_default_na=False,
+                                 na_values=[''],
+                                 chunksize=chunk_size)
+            for df in reader:
+                missing = [c for c in columns if c not in df.columns]
+                if missing:
+                    msg = "{} is missing the mapped columns {}".format(source, missing)
+                    raise ValueError(msg)
+                yield df
+
+    def chunks(self, source, chunk_size=100000, processes=None):
+        """
+        The rendered chunks of the source. With `processes` the chunks
+        are rendered in a process pool, with at most 2 chunks per process
+        in flight, and are returned in the source order.
+
+        :param source: The csv file path or a DataFrame
+        :param chunk_size: The number of rows of each chunk
+        :param processes: The number of worker processes, None to render in this process
+        :return: Generator of (text, number of triples)
+        """
+        frames = self.frames(source, chunk_size)
+        if not processes or processes < 2:
+            offset = 0
+            for df in frames:
+                yield render_chunk(self._plan, df, offset)
+                offset += len(df)
+            return
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool:
+            pending = collections.deque()
+            offset = 0
+            for df in frames:
+                pending.append(pool.submit(render_chunk, self._plan, df, offset))
+                offset += len(df)
+                if len(pending) >= 2 * processes:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def write(self, source, out, chunk_size=100000, processes=None):
+        """
+        Writes the triples of the source to `out`
+
+        :param source: The csv file path or a DataFrame
+        :param out: The output file path or a text file object
+        :param chunk_size: The number of rows of each chunk
+        :param processes: The number of worker processes, None to render in this process
+        :return: The number of triples written
+        """
+        if isinstance(out, str):
+            with open(out, 'w', encoding='utf-8') as f:
+                return self.write(source, f, chunk_size, processes)
+
+        out.write(self.header)
+        total = 0
+        for text, count in self.chunks(source, chunk_size, processes):
+            out.write(text)
+            total += count
+            _logger.debug("Materialized {} triples".format(total))
+        return total
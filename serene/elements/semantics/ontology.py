@@ -4,9 +4,11 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 Defines the Ontology object
 """
+import io
 import logging
 import os.path
 import tempfile
+import threading
 import pandas as pd
 import itertools as it
 import rdflib
@@ -52,6 +54,7 @@ class Ontology(BaseSemantic):
         self.description = ""
         self.date_created = None
         self.date_modified = None
+        self.server = None  # the URI of the server storing the ontology (if any)
         self.source_file = None  # the original file the user starts with (if any)
 
         # update to a default ID...
@@ -142,14 +145,16 @@ class Ontology(BaseSemantic):
         )
         return self
 
-    def update(self, json):
+    def update(self, json, server=None):
         """
         Updates parameters from the server.
 
         :param json:
+        :param server: The URI of the server storing the ontology
         :return:
         """
         self._stored = True
+        self.server = server
         self.set_filename(json['name'])
         self.description = json['description']
         self.date_created = json['dateCreated']
@@ -166,13 +171,32 @@ class Ontology(BaseSemantic):
         :return:
         """
         fname = filename if filename is not None else self.path
-        turtle_string = RDFWriter().to_turtle(self)
-        with open(fname, 'w') as f:
-            f.write(turtle_string)
+        with open(fname, 'wb') as f:
+            f.write(self.to_bytes())
             _logger.info("File written to: {}".format(fname))
 
         return fname
 
+    def to_bytes(self):
+        """
+        Serializes the ontology to Turtle in memory, without
+        going through a file.
+
+        :return: The utf-8 encoded Turtle rdf
+        """
+        return RDFWriter().to_bytes(self)
+
+    def to_buffer(self):
+        """
+        Serializes the ontology to an in-memory binary file, named
+        after the ontology, which can be uploaded directly.
+
+        :return: io.BytesIO of the Turtle rdf
+        """
+        buffer = io.BytesIO(self.to_bytes())
+        buffer.name = self._name
+        return buffer
+
     def prefix(self, prefix, ns):
         """
         Adds a prefixed namespace to the ontology
@@ -225,6 +249,98 @@ class Ontology(BaseSemantic):
             return "Ontology({}, {})".format(self.id, self._name)
 
 
+class LazyOntology(Ontology):
+    """
+        An Ontology listed from the server. Only the server metadata is
+        held on construction, the OWL file is downloaded and parsed the
+        first time the graph content (class nodes, links, prefixes etc.)
+        is used, or when `load` is called. The file is parsed once,
+        whatever the number of threads using the ontology.
+    """
+    # the attributes built from the OWL file, _graph last as it marks the ontology loaded...
+    GRAPH_STATE = ('_uri', '_class_table', '_links', '_prefixes', '_graph')
+
+    def __init__(self, json, loader, server=None):
+        """
+        :param json: The ontology json from the server
+        :param loader: function() -> local path of the OWL file
+        :param server: The URI of the server storing the ontology
+        """
+        super().__init__()
+        for name in self.GRAPH_STATE:
+            delattr(self, name)
+        self._loader = loader
+        self._load_lock = threading.Lock()
+        self.update(json, server)
+
+    def __getattr__(self, name):
+        """Called only for missing attributes, here the unloaded graph state"""
+        if name in LazyOntology.GRAPH_STATE and self.__dict__.get('_loader') is not None:
+            self.load()
+            return getattr(self, name)
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+    @property
+    def loaded(self):
+        """True if the OWL file has been parsed"""
+        return '_graph' in self.__dict__
+
+    def download(self):
+        """
+        Downloads the OWL file without parsing it
+
+        :return: The local path of the OWL file
+        """
+        if self.source_file is None or not os.path.exists(self.source_file):
+            self.source_file = self.__dict__['_loader']()
+        return self.source_file
+
+    def load(self):
+        """
+        Downloads and parses the OWL file, if not done already
+
+        :return: The ontology object
+        """
+        with self._load_lock:
+            if not self.loaded:
+                path = self.download()
+
+                # parsed aside, so the graph is never seen half built...
+                parsed = Ontology()
+                parsed._prefixes = {}
+                RDFReader().to_ontology(path, parsed)
+
+                self.set_state({name: getattr(parsed, name) for name in self.GRAPH_STATE})
+                self.source_file = path
+        return self
+
+    def set_state(self, state):
+        """
+        Sets the graph state parsed elsewhere, e.g. in another process
+        by `read_graph_state`. The ontology is loaded once the last
+        attribute, _graph, is set.
+
+        :param state: dict of GRAPH_STATE attribute -> value
+        :return: The ontology object
+        """
+        for name in self.GRAPH_STATE:
+            setattr(self, name, state[name])
+        self._loader = None
+        return self
+
+
+def read_graph_state(path):
+    """
+    Parses an OWL file and returns the LazyOntology.GRAPH_STATE values.
+    This is a module level function so that it can be run in a process pool.
+
+    :param path: The OWL file to parse
+    :return: dict of attribute name -> value
+    """
+    ontology = Ontology(path)
+    return {name: getattr(ontology, name) for name in LazyOntology.GRAPH_STATE}
+
+
 class RDFReader(object):
     """
         Converts RDF objects...
@@ -660,6 +776,14 @@ class RDFWriter(object):
         :param ontology: The Ontology object
         :return: String of Turtle rdf
         """
+        return self.to_bytes(ontology).decode("utf-8")
+
+    def to_bytes(self, ontology):
+        """
+        Convert the Ontology object to utf-8 encoded Turtle RDF
+        :param ontology: The Ontology object
+        :return: Bytes of Turtle rdf
+        """
         g = rdflib.Graph()
 
         # add the prefix table
@@ -677,5 +801,5 @@ class RDFWriter(object):
         self._build_links(g, ontology)
         self._build_data_nodes(g, ontology)
 
-        return g.serialize(format='turtle').decode("utf-8")
+        return g.serialize(format='turtle', encoding='utf-8')
 
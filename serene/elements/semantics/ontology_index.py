@@ -0,0 +1,263 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Merged lookup tables of the classes, data properties and links of a
+set of ontologies, for the SSD validation checks
+"""
+import collections
+import logging
+import threading
+
+_logger = logging.getLogger()
+_logger.setLevel(logging.WARN)
+
+# the outcome of a lookup
+FOUND = "found"
+MISSING = "missing"
+AMBIGUOUS = "ambiguous"
+
+# the number of ontology sets with a cached index
+INDEX_CACHE_SIZE = 8
+
+_cache = collections.OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _resolve(count, wildcards):
+    """The outcome of a lookup with `count` matches and `wildcards` entries matching anything"""
+    total = count + wildcards
+    if total == 1:
+        return FOUND
+    return MISSING if total == 0 else AMBIGUOUS
+
+
+class _Table(object):
+    """
+    The entries of one ontology under a label, e.g. the classes called
+    'Person', split by the key that narrows them down (the prefix of a
+    class, the (source, target) labels of a link). A None key matches
+    any key, as with the wildcards of Searchable.search. The entries can
+    also be restricted to a namespace, e.g. that of the class of a data
+    property, where the entries without a namespace match any.
+    """
+    __slots__ = ('keys', 'wildcards', 'prefixes')
+
+    def __init__(self):
+        self.keys = collections.Counter()
+        self.wildcards = 0
+        self.prefixes = collections.Counter()  # (key, prefix) -> count
+
+    def add(self, key, prefix=None):
+        if key is None:
+            self.wildcards += 1
+        else:
+            self.keys[key] += 1
+            self.prefixes[(key, prefix)] += 1
+
+    def lookup(self, key, prefix=None):
+        """The outcome of Searchable.search for an entry with the label and `key`, in `prefix` if given"""
+        keys = self.keys
+        if prefix is not None:
+            keys = collections.Counter()
+            for (k, p), count in self.prefixes.items():
+                if p is None or p == prefix:
+                    keys[k] += count
+        total = sum(keys.values()) + self.wildcards
+        if total == 1:
+            # a unique label is found whatever the key...
+            return FOUND
+        if total == 0:
+            return MISSING
+        if key is None:
+            return AMBIGUOUS
+        return _resolve(keys.get(key, 0), self.wildcards)
+
+
+class OntologyIndex(object):
+    """
+    Answers whether the classes, data properties and links used in an
+    SSD are in any of its ontologies, with the same matching rules as
+    Searchable.search on each ontology in turn:
+
+        - a label found only once in an ontology matches,
+        - otherwise the namespace prefix (classes), the class (data
+          properties) or the source and target classes (links) have to
+          pick out a single entry,
+        - an entry that is still ambiguous is not a match, but the
+          search goes on in the next ontology.
+
+    The data properties and links are inferred through the subclasses as
+    in Ontology.idata_nodes and Ontology.ilinks: a class has the data
+    properties of all its parents, and a link between two classes also
+    joins their subclasses. Identical inferred links count once.
+
+    A data property is only looked up in the namespace of its class when
+    a class of that label and namespace is in the ontologies, so that the
+    same class name in another namespace does not match it.
+
+    Use `ontology_index` to share one index between all the SSDs of the
+    same ontology set.
+    """
+    def __init__(self, ontologies):
+        """
+        :param ontologies: The list of Ontology objects
+        """
+        # one dict per ontology, of label -> _Table...
+        self._classes = []
+        self._class_keys = set()  # (label, prefix) of all the classes
+        self._data = []
+        self._links = []
+        for onto in ontologies:
+            self._add(onto)
+
+    def _add(self, onto):
+        """Builds the tables of an ontology"""
+        class_nodes = onto.class_nodes
+
+        classes = collections.defaultdict(_Table)
+        for cls in class_nodes:
+            prefix = str(cls.prefix) if cls.prefix else None
+            classes[cls.label].add(prefix)
+            self._class_keys.add((cls.label, prefix))
+
+        # the parents of each class, with the class first...
+        chains = {}
+        for cls in class_nodes:
+            chain = []
+            node = cls
+            while node is not None and node not in chain:
+                chain.append(node)
+                node = node.parent
+            chains[cls] = chain
+
+        # the data properties of each class, own and inherited...
+        pairs = collections.defaultdict(set)
+        for cls, chain in chains.items():
+            for parent in chain:
+                for dp in parent.nodes:
+                    pairs[dp.label].add((cls.label, str(cls.prefix) if cls.prefix else None))
+
+        data = collections.defaultdict(_Table)
+        for label, owners in pairs.items():
+            for class_label, prefix in owners:
+                data[label].add(class_label, prefix)
+
+        # each class with all its subclasses...
+        descendants = collections.defaultdict(list)
+        for cls, chain in chains.items():
+            for parent in chain:
+                descendants[parent].append(cls)
+
+        def family(cls):
+            return descendants[cls] if cls in descendants else [cls]
+
+        entries = set()
+        for link in onto.links:
+            for src in family(link.src):
+                for dst in family(link.dst):
+                    ends = None if src is None or dst is None else (src.label, dst.label)
+                    entries.add((link.label, ends, link.prefix))
+
+        links = collections.defaultdict(_Table)
+        for label, ends, _ in entries:
+            links[label].add(ends)
+
+        self._classes.append(dict(classes))
+        self._data.append(dict(data))
+        self._links.append(dict(links))
+
+    @staticmethod
+    def _search(tables, label, key, prefix=None):
+        """The outcome over all the ontologies: found in any, else ambiguous in any, else missing"""
+        status = MISSING
+        for table in tables:
+            if label in table:
+                found = table[label].lookup(key, prefix)
+                if found == FOUND:
+                    return FOUND
+                if found == AMBIGUOUS:
+                    status = AMBIGUOUS
+        return status
+
+    def class_status(self, label, prefix=None):
+        """
+        :param label: The class label
+        :param prefix: The namespace of the class, or None for any
+        :return: FOUND, MISSING or AMBIGUOUS
+        """
+        return self._search(self._classes, label, str(prefix) if prefix else None)
+
+    def data_status(self, class_label, label, prefix=None):
+        """
+        :param class_label: The label of the class, the data property can be inherited
+        :param label: The data property label
+        :param prefix: The namespace of the class, or None for any. It is ignored
+                       if there is no class of that label in the namespace.
+        :return: FOUND, MISSING or AMBIGUOUS
+        """
+        prefix = str(prefix) if prefix else None
+        if (class_label, prefix) not in self._class_keys:
+            # no class in that namespace, any will do...
+            prefix = None
+        return self._search(self._data, label, class_label, prefix)
+
+    def link_status(self, src_label, label, dst_label):
+        """
+        :param src_label: The label of the source class
+        :param label: The object property label
+        :param dst_label: The label of the target class
+        :return: FOUND, MISSING or AMBIGUOUS
+        """
+        return self._search(self._links, label, (src_label, dst_label))
+
+    def class_exists(self, label, prefix=None):
+        return self.class_status(label, prefix) == FOUND
+
+    def data_exists(self, class_label, label, prefix=None):
+        return self.data_status(class_label, label, prefix) == FOUND
+
+    def link_exists(self, src_label, label, dst_label):
+        return self.link_status(src_label, label, dst_label) == FOUND
+
+
+def _cache_key(ontologies):
+    """
+    The cache key of an ontology set, from the servers, ids and modification
+    dates, as the same id on two servers can be two different ontologies.
+    Local changes unstore an ontology, so there is no key for sets with
+    unstored ontologies.
+    """
+    key = []
+    for onto in ontologies:
+        if not onto.stored:
+            return None
+        key.append((onto.server, onto.id, onto.date_modified))
+    return tuple(key)
+
+
+def ontology_index(ontologies):
+    """
+    The OntologyIndex of a list of ontologies. The indexes of the stored
+    ontology sets are cached, so that all the SSDs of the same ontologies
+    share one.
+
+    :param ontologies: The list of Ontology objects
+    :return: OntologyIndex
+    """
+    key = _cache_key(ontologies)
+    if key is None:
+        return OntologyIndex(ontologies)
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    # built outside the lock, as it may download the ontologies...
+    index = OntologyIndex(ontologies)
+    with _cache_lock:
+        _cache[key] = index
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
@@ -8,6 +8,7 @@ import json
 import logging
 import networkx as nx
 import random
+import threading
 
 from collections import OrderedDict
 from collections import defaultdict
@@ -18,6 +19,8 @@ from ..elements import DataLink, ObjectLink, ClassInstanceLink, ColumnLink, SubC
 from ..elements import Mapping, Column, Class
 from ..dataset import DataSet
 from ..semantics.ontology import Ontology
+from .materialize import RDFMaterializer
+from .ontology_index import ontology_index, _cache_key, AMBIGUOUS
 from serene.utils import gen_id, convert_datetime, flatten, Searchable
 from serene.visualizers import SSDVisualizer
 
@@ -71,6 +74,7 @@ class SSD(object):
         self._name = name if name is not None else gen_id()
         self._dataset = dataset
         self._ontology = ontology if ontology is not None else []
+        self._ontology_index = None  # (ontologies, cache key, OntologyIndex)
         self._VERSION = "0.1"
         self._id = None
         self._stored = False  # is stored on the server...
@@ -89,13 +93,14 @@ class SSD(object):
             for col in self._dataset.columns:
                 self._semantic_model.add_node(col, index=col.id)
 
-    def update(self, blob, dataset_endpoint, ontology_endpoint):
+    def update(self, blob, dataset_endpoint, ontology_endpoint, context=None):
         """
         Create the object from json directly
 
         :param blob:
         :param dataset_endpoint:
         :param ontology_endpoint:
+        :param context: Optional ResolutionContext shared when decoding a batch of SSDs
         :return:
         """
         _logger.debug("Updating ssd")
@@ -111,7 +116,8 @@ class SSD(object):
 
         reader = SSDReader(blob,
                            dataset_endpoint,
-                           ontology_endpoint)
+                           ontology_endpoint,
+                           context)
 
         self._ontology = reader.ontology
         self._dataset = reader.dataset
@@ -322,13 +328,13 @@ class SSD(object):
         # first check that the class is in the ontology...
         cn = data_node.class_node
         if not self._class_node_exists(cn):
-            msg = "Map failed. Failed to find {} in {}".format(cn, self._ontology)
-            raise ValueError(msg)
+            status = self._index.class_status(cn.label, cn.prefix)
+            raise ValueError(self._lookup_error("Map", cn, status))
 
         # next check the datanode in the ontology
         if not self._data_node_exists(data_node):
-            msg = "Map failed. Failed to find {} in {}".format(data_node, self._ontology)
-            raise ValueError(msg)
+            status = self._index.data_status(cn.label, data_node.label, cn.prefix)
+            raise ValueError(self._lookup_error("Map", data_node, status))
 
         # for columns, only one map can exist...
         if self._semantic_model.degree(column) > 0:
@@ -350,18 +356,40 @@ class SSD(object):
         """
         # first check the src class in the ontology
         if not self._class_node_exists(src):
-            msg = "Link failed. Failed to find {} in {}".format(src, self._ontology)
-            raise ValueError(msg)
+            status = self._index.class_status(src.label, src.prefix)
+            raise ValueError(self._lookup_error("Link", src, status))
 
         # first check the dst class in the ontology
         if not self._class_node_exists(dst):
-            msg = "Link failed. Failed to find {} in {}".format(dst, self._ontology)
-            raise ValueError(msg)
+            status = self._index.class_status(dst.label, dst.prefix)
+            raise ValueError(self._lookup_error("Link", dst, status))
 
         # next check the link exists in the ontology
         if not self._link_exists(src, label, dst):
-            msg = "Link failed. Failed to find {}-{}-{} in {}".format(src, label, dst, self._ontology)
-            raise ValueError(msg)
+            status = self._index.link_status(src.label, label, dst.label)
+            item = "{}-{}-{}".format(src, label, dst)
+            raise ValueError(self._lookup_error("Link", item, status))
+
+    def _lookup_error(self, action, item, status):
+        """The error message for an item that is missing or ambiguous in the ontologies"""
+        if status == AMBIGUOUS:
+            return "{} failed. {} is ambiguous in {}".format(action, item, self._ontology)
+        return "{} failed. Failed to find {} in {}".format(action, item, self._ontology)
+
+    @property
+    def _index(self):
+        """
+        The lookup tables of the ontologies, shared by the SSDs of the same
+        stored ontologies. The index is kept until the ontologies change,
+        or a new version of them is on the server.
+        """
+        ontologies = tuple(self._ontology)
+        key = _cache_key(ontologies)
+        cached = self._ontology_index
+        if cached is None or cached[0] != ontologies or cached[1] != key:
+            cached = (ontologies, key, ontology_index(ontologies))
+            self._ontology_index = cached
+        return cached[2]
 
     def _link_exists(self, src, label, dst):
         """
@@ -372,21 +400,7 @@ class SSD(object):
         :return:
         """
         _logger.debug("Searching for {}-{}-{}".format(src, label, dst))
-
-        link_target = ObjectProperty(label, Class(src.label), Class(dst.label))
-
-        _logger.debug("using target: {}".format(link_target))
-
-        link = None
-        for onto in self._ontology:
-            # find any match in all ontologies
-            try:
-                link = ObjectProperty.search(onto.ilinks, link_target)
-            except:
-                continue
-            break
-
-        return link is not None
+        return self._index.link_exists(src.label, label, dst.label)
 
     def _column_exists(self, column):
         """
@@ -404,20 +418,7 @@ class SSD(object):
         :param cn: The ClassNode parameter
         :return:
         """
-        # Check the dataset status...
-        # first check the class
-        cls_target = Class(cn.label, prefix=cn.prefix)
-        cls = None
-        for onto in self._ontology:
-            # find any match in all ontologies
-            try:
-                cls = Class.search(onto.class_nodes, cls_target)
-                if cls is not None:
-                    break
-            except:
-                continue
-
-        return cls is not None
+        return self._index.class_exists(cn.label, cn.prefix)
 
     def _data_node_exists(self, data_node: DataNode):
         """
@@ -425,24 +426,8 @@ class SSD(object):
         :param data_node: A DataNode object to check
         :return:
         """
-        # next check the datanode
         cn = data_node.class_node
-
-        # construct a search param for the ontology Class and DataNode...
-        cls_target = Class(cn.label, prefix=cn.prefix)
-        target = DataProperty(cls_target, data_node.label)
-
-        dn = None
-        for onto in self._ontology:
-            # find any match in all ontologies
-            try:
-                dn = DataProperty.search(onto.idata_nodes, target)
-                if dn is not None:
-                    break
-            except:
-                continue
-
-        return dn is not None
+        return self._index.data_exists(cn.label, data_node.label, cn.prefix)
 
     @property
     def default_namespace(self):
@@ -595,6 +580,22 @@ class SSD(object):
         else:
             return "SSD(local, {})".format(props)
 
+    def materialize(self, source, out, fmt='nt', base=DEFAULT_NS, chunk_size=100000, processes=None):
+        """
+        Writes the rows of a local copy of the dataset as RDF, with an
+        instance of each class node per row (see RDFMaterializer)
+
+        :param source: The csv file path or a DataFrame with the mapped columns
+        :param out: The output file path or a text file object
+        :param fmt: The output format, 'nt' for N-Triples or 'ttl' for Turtle
+        :param base: The namespace of the instance URIs
+        :param chunk_size: The number of rows read at a time
+        :param processes: The number of worker processes, None to render in this process
+        :return: The number of triples written
+        """
+        materializer = RDFMaterializer(self, fmt=fmt, base=base)
+        return materializer.write(source, out, chunk_size=chunk_size, processes=processes)
+
     def evaluate(self, ground_truth, include_all=False, include_cols=True):
         """
         Evaluate this ssd against ground truth
@@ -1065,19 +1066,154 @@ class SSDGraph(object):
                 in self._edge_list if type(link) == ColumnLink}
 
 
+class ResolutionContext(object):
+    """
+    The ResolutionContext holds the lookup tables used to resolve the
+    column, dataset and ontology references of SSD json blobs. Build
+    one per batch (e.g. all SSDs on the server, or all the candidates
+    of an Octopus prediction) and pass it to each SSDReader, so the
+    tables are built once rather than once per SSD.
+
+    The tables are built lazily from the endpoint items the first time
+    a key is missing, and are safe to share between threads. Objects
+    that are already known (e.g. just uploaded) can be registered with
+    `add`, so they are resolved without listing the server.
+    """
+    def __init__(self, dataset_endpoint, ontology_endpoint):
+        """
+        :param dataset_endpoint: The DataSetEndpoint to resolve columns and datasets
+        :param ontology_endpoint: The OntologyEndpoint to resolve ontologies
+        """
+        self._ds_endpoint = dataset_endpoint
+        self._on_endpoint = ontology_endpoint
+        self._lock = threading.RLock()
+
+        self._column_index = {}     # column id -> DataSet
+        self._datasets = {}         # dataset id -> DataSet
+        self._columns = {}          # dataset id -> {column id -> Column}
+        self._ontologies = {}       # ontology id -> Ontology
+
+        # flags set once the endpoint items have been read
+        self._datasets_listed = False
+        self._ontologies_listed = False
+
+    @property
+    def dataset_endpoint(self):
+        return self._ds_endpoint
+
+    @property
+    def ontology_endpoint(self):
+        return self._on_endpoint
+
+    def _index_dataset(self, ds):
+        """Indexes the column ids of a dataset, without building the Column objects"""
+        self._datasets[ds.id] = ds
+        for key in ds.column_ids():
+            self._column_index[key] = ds
+
+    def _list_datasets(self):
+        """Indexes all datasets on the server, the registered datasets are kept"""
+        with self._lock:
+            if not self._datasets_listed:
+                for ds in self._ds_endpoint.items:
+                    if ds.id not in self._datasets:
+                        self._index_dataset(ds)
+                self._datasets_listed = True
+
+    def add(self, datasets=(), ontologies=()):
+        """
+        Registers known datasets and ontologies with the context
+
+        :param datasets: Iterable of DataSet objects
+        :param ontologies: Iterable of Ontology objects
+        :return: The context
+        """
+        with self._lock:
+            for ds in datasets:
+                self._index_dataset(ds)
+            for o in ontologies:
+                self._ontologies[o.id] = o
+        return self
+
+    def column(self, key):
+        """
+        Returns the Column object for a column id
+
+        :param key: The column id
+        :return: Column
+        """
+        ds = self.column_dataset(key)
+        with self._lock:
+            if ds.id not in self._columns:
+                self._columns[ds.id] = {c.id: c for c in ds.columns}
+            return self._columns[ds.id][key]
+
+    def column_dataset(self, key):
+        """
+        Returns the DataSet holding a column id
+
+        :param key: The column id
+        :return: DataSet
+        """
+        if key not in self._column_index:
+            self._list_datasets()
+        if key not in self._column_index:
+            msg = "Column {} does not appear on the server".format(key)
+            raise Exception(msg)
+        return self._column_index[key]
+
+    def dataset(self, key):
+        """
+        Returns the DataSet object for a dataset id
+
+        :param key: The dataset id
+        :return: DataSet
+        """
+        if key not in self._datasets:
+            self._list_datasets()
+        with self._lock:
+            if key not in self._datasets:
+                self._datasets[key] = self._ds_endpoint.get(key)
+            return self._datasets[key]
+
+    def ontology(self, key):
+        """
+        Returns the Ontology object for an ontology id
+
+        :param key: The ontology id
+        :return: Ontology
+        """
+        with self._lock:
+            if key not in self._ontologies and not self._ontologies_listed:
+                for o in self._on_endpoint.items:
+                    self._ontologies.setdefault(o.id, o)
+                self._ontologies_listed = True
+            if key not in self._ontologies:
+                self._ontologies[key] = self._on_endpoint.get(key)
+            return self._ontologies[key]
+
+
 class SSDReader(object):
     """
     The SSDReader is a helper object used to parse an SSD json
     blob from the server.
     """
-    def __init__(self, blob, dataset_endpoint, ontology_endpoint):
+    def __init__(self, blob, dataset_endpoint, ontology_endpoint, context=None):
         """Builds up the relevant properties from the json blob `json`
             note that we need references to the endpoints to ensure
             that the information is up-to-date with the server.
+
+            The `context` holds the column, dataset and ontology lookups
+            and should be shared when reading a batch of blobs. If None,
+            a new one is built for this blob.
         """
         self._on_endpoint = ontology_endpoint
         self._ds_endpoint = dataset_endpoint
 
+        if context is None:
+            context = ResolutionContext(dataset_endpoint, ontology_endpoint)
+        self._context = context
+
         # add the ontology and dataset objects
         self._ontology = self._find_ontology(blob)
         self._dataset = self._find_dataset(blob)
@@ -1090,7 +1226,6 @@ class SSDReader(object):
 
         # build up the semantic model graph...
         self._graph = SSDGraph()
-        self._column_map = self._ds_endpoint.columns
         self._build_graph(blob)
 
     def _build_graph(self, blob):
@@ -1228,7 +1363,7 @@ class SSDReader(object):
         for obj in mappings:
             dst = obj['attribute']
             src = obj['node']
-            column = self._column_map[dst]
+            column = self._context.column(dst)
 
             # add the column to the graph...
             col_id = self._graph.add_node(column, column.id)
@@ -1255,7 +1390,7 @@ class SSDReader(object):
     def _find_ontology(self, json):
         """Pulls the ontology reference from the SSD and queries the server"""
         ontologies = json['ontologies']
-        return [self._on_endpoint.get(onto) for onto in ontologies]
+        return [self._context.ontology(onto) for onto in ontologies]
 
     def _find_dataset(self, json):
         """Attempts to grab the dataset out from the json string"""
@@ -1266,15 +1401,7 @@ class SSDReader(object):
             msg = "No columns present in ssd file mappings."
             raise Exception(msg)
 
-        col_map = self._ds_endpoint.columns
-
-        if columns[0] not in col_map:
-            msg = "Column {} does not appear on the server".format(columns[0])
-            raise Exception(msg)
-
-        ds_key = col_map[columns[0]].datasetID
-
-        return self._ds_endpoint.get(ds_key)
+        return self._context.column_dataset(columns[0])
 
 
 class SSDJsonWriter(object):
@@ -6,7 +6,12 @@ Endpoint objects for the user to view and manipulate. These wrap around
 server Session objects and call methods to talk to the server.
 """
 import collections
+import concurrent.futures
+import hashlib
+import io
+import logging
 import os
+import threading
 import tempfile
 from functools import lru_cache
 import rdflib
@@ -14,13 +19,19 @@ import json
 
 import pandas as pd
 
-from serene.elements.dataset import DataSet
+from serene.elements.dataset import DataSet, summary_frame
 from serene.elements import Ontology
+from serene.elements.semantics.ontology import LazyOntology, read_graph_state
 from serene.elements import SSD
+from serene.elements.semantics.ssd import ResolutionContext
 from serene.api import OwlFormat
 from .elements.octopus import Octopus
 from .matcher.model import Model
-from .utils import flatten, gen_id
+from .sampling import RowSampler
+from .utils import flatten, gen_id, HashWriter
+
+_logger = logging.getLogger()
+_logger.setLevel(logging.WARN)
 
 
 def decache(func):
@@ -57,6 +68,10 @@ class IdentifiableEndpoint(object):
         # this is the type of the stored objects
         self._base_type = None
 
+        # id -> object map, reset whenever the items are reloaded
+        # and kept up to date on upload and remove...
+        self._index = {}
+
     def _apply(self, func, value, func_name=None):
         """
         Helper function to call `func` with parameter `value` which
@@ -78,6 +93,72 @@ class IdentifiableEndpoint(object):
                 msg = "Illegal type found in {}: {}".format(func_name, type(value))
             raise TypeError(msg)
 
+    def _key(self, value, func_name=None):
+        """Helper function to get the int key from an object or key"""
+        return self._apply(lambda key: key, value, func_name)
+
+    def _fetch(self, key):
+        """Builds a single object from the server, used by `get` on a miss"""
+        raise NotImplementedError("Single item fetch is not available")
+
+    def _reindex(self, objects):
+        """Resets the id index to `objects`, called when the items are reloaded"""
+        objects = tuple(objects)
+        self._index = {o.id: o for o in objects}
+        return objects
+
+    def _add(self, obj):
+        """Adds a new or updated object to the id index"""
+        self._index[obj.id] = obj
+        return obj
+
+    def _remove(self, value):
+        """Deletes an object or key on the server and drops it from the id index"""
+        key = self._key(value, 'delete')
+        self._api.delete(key)
+        self._index.pop(key, None)
+
+    def remove_many(self, values, max_workers=8):
+        """
+        Removes many objects from the server with concurrent DELETE
+        requests. The items cache is cleared once, when all the
+        requests have finished.
+
+        :param values: The objects or keys to remove
+        :param max_workers: The number of concurrent requests
+        :return: The list of removed keys
+        """
+        keys = [self._key(v, 'delete') for v in values]
+
+        futures = []
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for key in keys:
+                    futures.append(pool.submit(self._remove, key))
+        finally:
+            type(self).items.fget.cache_clear()
+
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        for e in errors:
+            _logger.error(e)
+        if errors:
+            msg = "Failed to remove {} of {} items".format(len(errors), len(keys))
+            raise Exception(msg) from errors[0]
+        return keys
+
+    def get(self, key, refresh=False):
+        """
+        Get a single object with id `key`. The objects are held in
+        an id index, missing objects are fetched from the server.
+
+        :param key: The id of the object
+        :param refresh: Fetch the object from the server even if it is in the index
+        :return: The object
+        """
+        if refresh or key not in self._index:
+            self._index[key] = self._fetch(key)
+        return self._index[key]
+
     @property
     def items(self):
         return tuple()
@@ -104,43 +185,164 @@ class DataSetEndpoint(IdentifiableEndpoint):
     :param object:
     :return:
     """
-    def __init__(self, session):
+    def __init__(self, session, index_path=None):
         """
 
         :param self:
         :param api:
+        :param index_path: The json file of the content hash -> dataset ids
+                           index used by `upload(..., dedup=True)`
         :return:
         """
         super().__init__()
         self._api = session.dataset_api
         self._base_type = DataSet
+        self._index_path = index_path
+        self._dedup_lock = threading.Lock()
+
+    @property
+    def index_path(self):
+        """The local dedup index file, one for each server by default"""
+        if self._index_path is None:
+            server = hashlib.sha1(str(self._api._uri).encode('utf-8')).hexdigest()[:16]
+            self._index_path = os.path.join(tempfile.gettempdir(),
+                                            "serene-dataset-index",
+                                            "{}.json".format(server))
+        return self._index_path
 
     @decache
-    def upload(self, filename, description=None, type_map=None):
+    def upload(self, filename, description=None, type_map=None, dedup=False,
+               sample=None, seed=0, stratify=None):
         """
+        Uploads a csv file or DataFrame to the server.
+
+        With dedup=True the content is hashed while it is read, and if
+        a dataset with the same content and type map has already been
+        uploaded to the server, the existing DataSet is returned
+        instead. The content hashes are kept in a local json index
+        (see `index_path`).
 
-        :param filename:
+        With `sample` only a seeded sample of that many rows is uploaded,
+        read in one pass over the file (see RowSampler). Models only
+        look at a few hundred values per column, so a sample is enough
+        for training, and the full file can be uploaded when it is
+        needed for prediction. The same seed gives the same sample, so
+        dedup=True finds a sample that has already been uploaded.
+
+        :param filename: The csv file path or a pandas DataFrame
         :param description:
         :param type_map:
-        :return:
-        """
+        :param dedup: Return an existing dataset if the content has been uploaded before
+        :param sample: The number of rows to upload, or None for all the rows
+        :param seed: The seed of the sample
+        :param stratify: A column name or list of column names whose values should all be in the sample
+        :return: DataSet
+        """
+        type_map = type_map if type_map is not None else {}
+        digest = None
+        temp_file = None
+
+        if sample is not None:
+            if not issubclass(type(filename), pd.DataFrame) and not os.path.exists(filename):
+                raise ValueError("No filename given.")
+            filename = RowSampler(sample, seed=seed, stratify=stratify).sample(filename)
+
         if issubclass(type(filename), pd.DataFrame):
-            path = os.path.join(tempfile.gettempdir(), gen_id() + ".csv")
-            df = filename
-            df.to_csv(path, index=False)
-            filename = path
+            temp_file = os.path.join(tempfile.gettempdir(), gen_id() + ".csv")
+            with open(temp_file, 'wb') as f:
+                writer = HashWriter(f)
+                filename.to_csv(writer, index=False)
+            filename = temp_file
+            digest = writer.hexdigest()
 
         assert(issubclass(type(filename), str))
 
         if not os.path.exists(filename):
             raise ValueError("No filename given.")
 
-        json = self._api.post(
-            file_path=filename,
-            description=description if description is not None else '',
-            type_map=type_map if type_map is not None else {}
-        )
-        return DataSet(json)
+        try:
+            if dedup:
+                if digest is None:
+                    digest = self._file_digest(filename)
+                dataset = self._find_upload(digest, type_map)
+                if dataset is not None:
+                    _logger.info("Dataset {} has the same content, skipping upload".format(dataset.id))
+                    return dataset
+
+            json = self._api.post(
+                file_path=filename,
+                description=description if description is not None else '',
+                type_map=type_map
+            )
+        finally:
+            if temp_file is not None:
+                os.remove(temp_file)
+
+        dataset = self._add(DataSet(json))
+        if dedup:
+            self._record_upload(digest, dataset.id)
+        return dataset
+
+    @staticmethod
+    def _file_digest(filename, chunk_size=1024 * 1024):
+        """The sha256 of a file, read in chunks"""
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _find_upload(self, digest, type_map):
+        """
+        Finds a dataset on the server with content `digest` and the
+        same type map. Datasets that no longer exist are dropped from
+        the index.
+        """
+        with self._dedup_lock:
+            index = self._read_index()
+        keys = index.get(digest, [])
+
+        found = None
+        missing = []
+        for key in keys:
+            try:
+                dataset = self.get(key)
+            except Exception:
+                missing.append(key)
+                continue
+            if dataset.type_map == type_map:
+                found = dataset
+                break
+
+        if missing:
+            with self._dedup_lock:
+                index = self._read_index()
+                index[digest] = [k for k in index.get(digest, []) if k not in missing]
+                self._write_index(index)
+        return found
+
+    def _record_upload(self, digest, key):
+        """Adds a new dataset key to the dedup index"""
+        with self._dedup_lock:
+            index = self._read_index()
+            index.setdefault(digest, []).append(key)
+            self._write_index(index)
+
+    def _read_index(self):
+        """Reads the content hash -> dataset keys index"""
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        """Writes the dedup index, replacing the file atomically"""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = "{}.{}".format(self.index_path, gen_id())
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
 
     @decache
     def remove(self, dataset):
@@ -149,7 +351,7 @@ class DataSetEndpoint(IdentifiableEndpoint):
         :param dataset:
         :return:
         """
-        self._apply(self._api.delete, dataset, 'delete')
+        self._remove(dataset)
 
     def show(self):
         """
@@ -158,13 +360,34 @@ class DataSetEndpoint(IdentifiableEndpoint):
         """
         print(self.items)
 
+    @property
+    def summary(self):
+        """
+        Summary table of the datasets on the server. The server only lists
+        the dataset ids, so each dataset is still fetched, but one at a time
+        and only its row of the table is kept: the items are not loaded and
+        no Column objects, sample frames or column json are held.
+        """
+        return summary_frame(DataSet(self._api.item(k)) for k in self._api.keys())
+
     @property
     def columns(self):
         """Returns a dictionary of col_id -> Column() objects"""
         cols = flatten([ds.columns for ds in self.items])
         return ReadOnlyDict({c.id: c for c in cols})
 
-    def get(self, key):
+    def get(self, key, refresh=True):
+        """
+        Get a single dataset with id `key`, fetched from the server by
+        default as it can be removed by other clients
+
+        :param key: The id of the dataset
+        :param refresh: False to use the dataset in the id index, if any
+        :return: DataSet
+        """
+        return super().get(key, refresh)
+
+    def _fetch(self, key):
         """Get a single dataset at position key"""
         return DataSet(self._api.item(key))
 
@@ -176,7 +399,7 @@ class DataSetEndpoint(IdentifiableEndpoint):
         ds = []
         for k in keys:
             ds.append(DataSet(self._api.item(k)))
-        return tuple(ds)
+        return self._reindex(ds)
 
 
 class ModelEndpoint(IdentifiableEndpoint):
@@ -205,7 +428,7 @@ class ModelEndpoint(IdentifiableEndpoint):
         :param model: The model or model ID
         :return:
         """
-        self._apply(self._api.delete, model, 'delete')
+        self._remove(model)
 
     def show(self):
         """
@@ -214,8 +437,18 @@ class ModelEndpoint(IdentifiableEndpoint):
         """
         print(self.items)
 
-    @lru_cache(maxsize=32)
-    def get(self, key):
+    def get(self, key, refresh=True):
+        """
+        Get a single model with id `key`, fetched from the server by
+        default as its training state changes on the server
+
+        :param key: The id of the model
+        :param refresh: False to use the model in the id index, if any
+        :return: Model
+        """
+        return super().get(key, refresh)
+
+    def _fetch(self, key):
         """Get a single model at position key"""
         return Model(self._api.item(key), self._session, self._ds_endpoint)
 
@@ -229,7 +462,7 @@ class ModelEndpoint(IdentifiableEndpoint):
             blob = self._api.item(k)
             model = Model(blob, self._session, self._ds_endpoint)
             models.append(model)
-        return tuple(models)
+        return self._reindex(models)
 
 
 class OntologyEndpoint(IdentifiableEndpoint):
@@ -251,10 +484,16 @@ class OntologyEndpoint(IdentifiableEndpoint):
         self._api = session.ontology_api
         self._base_type = Ontology
 
+        # content hash -> server json of the ontologies uploaded here...
+        self._uploads = {}
+
     @decache
     def upload(self, ontology, description=None, owl_format=None):
         """
-        Uploads an ontology to the Serene server.
+        Uploads an ontology to the Serene server. Ontology objects are
+        serialized in memory. If an Ontology with the same content has
+        already been uploaded from this endpoint, the stored ontology
+        is reused and no request is made.
 
         :param ontology:
         :param description:
@@ -268,10 +507,16 @@ class OntologyEndpoint(IdentifiableEndpoint):
                 raise ValueError("No filename given.")
             filename = ontology
             output = Ontology(filename)
+            source = filename
+            digest = None
         elif issubclass(type(ontology), Ontology):
-            # this will use the default path and return it if successful...
-            filename = ontology.to_turtle()
+            filename = ontology.name
             output = ontology
+            content = ontology.to_bytes()
+            source = self._buffer(content, filename)
+            digest = hashlib.sha256(content).hexdigest()
+            if owl_format is None:
+                owl_format = OwlFormat.TURTLE.value
         else:
             raise ValueError("Upload requires Ontology type or direct filename")
 
@@ -289,17 +534,25 @@ class OntologyEndpoint(IdentifiableEndpoint):
             )
             raise ValueError(msg)
 
-        json = self._api.post(
-            file_path=filename,
-            description=description if description is not None else '',
-            owl_format=owl_format
-        )
-        return output.update(json)
+        json = self._uploads.get(digest)
+        if json is not None and json['id'] in self._index:
+            _logger.info("Ontology {} is unchanged, skipping upload".format(json['id']))
+        else:
+            json = self._api.post(
+                file_path=source,
+                description=description if description is not None else '',
+                owl_format=owl_format
+            )
+            if digest is not None:
+                self._uploads[digest] = json
+        return self._add(output.update(json, str(self._api._uri)))
 
     @decache
     def update(self, ontology, file=None, description=None, owl_format=None):
         """
-        Uploads an ontology to the Serene server.
+        Uploads an ontology to the Serene server. For an Ontology
+        object, the request is skipped if neither the content nor the
+        description changed since the last upload from this endpoint.
 
         :param ontology:
         :param file:
@@ -312,19 +565,31 @@ class OntologyEndpoint(IdentifiableEndpoint):
 
         if file is not None:
             # this means we are re-doing the whole thing...
-            filename = file
-            output = Ontology(filename)
+            output = Ontology(file)
+            source = file
+            digest = None
         else:
-            # this will use the default path and return it if successful...
-            filename = ontology.to_turtle()
             output = ontology
-
-        json = self._api.update(
-            file_path=filename,
-            description=description,
-            owl_format=owl_format
-        )
-        return output.update(json)
+            content = ontology.to_bytes()
+            source = self._buffer(content, ontology.name)
+            digest = hashlib.sha256(content).hexdigest()
+            if owl_format is None:
+                owl_format = OwlFormat.TURTLE.value
+
+        json = self._uploads.get(digest)
+        if json is not None and json['id'] == ontology.id and description is None:
+            _logger.info("Ontology {} is unchanged, skipping update".format(ontology.id))
+        else:
+            json = self._api.update(
+                ontology.id,
+                file_path=source,
+                description=description,
+                owl_format=owl_format
+            )
+            self._forget(ontology.id)
+            if digest is not None:
+                self._uploads[digest] = json
+        return self._add(output.update(json, str(self._api._uri)))
 
     @decache
     def remove(self, ontology):
@@ -333,7 +598,23 @@ class OntologyEndpoint(IdentifiableEndpoint):
         :param ontology:
         :return:
         """
-        self._apply(self._api.delete, ontology, 'delete')
+        self._remove(ontology)
+
+    def _remove(self, value):
+        """Deletes the ontology and drops its content hashes"""
+        super()._remove(value)
+        self._forget(self._key(value))
+
+    def _forget(self, key):
+        """Drops the content hashes of the uploads of ontology `key`"""
+        self._uploads = {d: j for d, j in self._uploads.items() if j['id'] != key}
+
+    @staticmethod
+    def _buffer(content, filename):
+        """In-memory upload file, the name is used by the server for the format"""
+        buffer = io.BytesIO(content)
+        buffer.name = os.path.basename(filename)
+        return buffer
 
     def show(self):
         """
@@ -342,25 +623,51 @@ class OntologyEndpoint(IdentifiableEndpoint):
         """
         print(self.items)
 
-    def get(self, key):
+    def _lazy(self, key):
+        """Builds the ontology from the server metadata, the OWL file is read on demand"""
+        json = self._api.item(key)
+        return LazyOntology(json, lambda: self._api.owl_file(key, json), str(self._api._uri))
+
+    def _fetch(self, key):
         """Get a single ontology at position key"""
-        for o in self.items:
-            if o.id == key:
-                return o
-        msg = "Ontology {} does not exist on server".format(key)
-        raise Exception(msg)
+        return self._lazy(key)
+
+    def load(self, ontologies=None, max_workers=None):
+        """
+        Downloads and parses many ontologies at once. The files are
+        parsed concurrently in a process pool.
+
+        :param ontologies: List of ontologies, all the ontologies on the server if None
+        :param max_workers: The number of processes, if 1 the files are parsed here
+        :return: The list of loaded ontologies
+        """
+        if ontologies is None:
+            ontologies = self.items
+
+        pending = [o for o in ontologies
+                   if issubclass(type(o), LazyOntology) and not o.loaded]
+        if max_workers == 1 or len(pending) < 2:
+            for o in pending:
+                o.load()
+            return list(ontologies)
+
+        paths = [o.download() for o in pending]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for o, state in zip(pending, pool.map(read_graph_state, paths)):
+                o.set_state(state)
+        return list(ontologies)
 
     @property
     @lru_cache(maxsize=32)
     def items(self):
-        """Maintains a list of Ontology objects"""
+        """
+        Maintains a list of Ontology objects. Only the metadata is
+        fetched here, the OWL files are downloaded and parsed when the
+        ontology content is used, or with `load`.
+        """
         keys = self._api.keys()
-        ontologies = []
-        for k in keys:
-            on = Ontology(file=self._api.owl_file(k))
-            on.update(self._api.item(k))
-            ontologies.append(on)
-        return tuple(ontologies)
+        ontologies = [self._lazy(k) for k in keys]
+        return self._reindex(ontologies)
 
 
 class SSDEndpoint(IdentifiableEndpoint):
@@ -407,19 +714,21 @@ class SSDEndpoint(IdentifiableEndpoint):
         return self._session.compare(json.dumps(compare_json))
 
     @decache
-    def upload(self, ssd):
+    def upload(self, ssd, context=None):
         """
         Uploads an SSD to the Serene server
         :param ssd
+        :param context: Optional ResolutionContext shared when uploading a batch of SSDs
         :return:
         """
         assert(issubclass(type(ssd), SSD))
 
         response = self._api.post(ssd.json)
 
-        return ssd.update(response,
-                          self._dataset_endpoint,
-                          self._ontology_endpoint)
+        return self._add(ssd.update(response,
+                                    self._dataset_endpoint,
+                                    self._ontology_endpoint,
+                                    context))
 
     @decache
     def remove(self, ssd):
@@ -428,7 +737,7 @@ class SSDEndpoint(IdentifiableEndpoint):
         :param ssd:
         :return:
         """
-        self._apply(self._api.delete, ssd, 'delete')
+        self._remove(ssd)
 
     def show(self):
         """
@@ -437,14 +746,11 @@ class SSDEndpoint(IdentifiableEndpoint):
         """
         print(self.items)
 
-    @lru_cache(maxsize=32)
-    def get(self, key):
+    def _fetch(self, key):
         """Get a single ssd at position key"""
-        for o in self.items:
-            if o.id == key:
-                return o
-        msg = "SSD {} does not exist on server".format(key)
-        raise Exception(msg)
+        return SSD().update(self._api.item(key),
+                            self._dataset_endpoint,
+                            self._ontology_endpoint)
 
     @property
     @lru_cache(maxsize=32)
@@ -452,13 +758,16 @@ class SSDEndpoint(IdentifiableEndpoint):
         """Maintains a list of SSD objects"""
         keys = self._api.keys()
         ssds = []
+        # the column/dataset/ontology lookups are shared across the SSDs...
+        context = ResolutionContext(self._dataset_endpoint, self._ontology_endpoint)
         for k in keys:
             blob = self._api.item(k)
             s = SSD().update(blob,
                              self._dataset_endpoint,
-                             self._ontology_endpoint)
+                             self._ontology_endpoint,
+                             context)
             ssds.append(s)
-        return tuple(ssds)
+        return self._reindex(ssds)
 
 
 class OctopusEndpoint(IdentifiableEndpoint):
@@ -524,12 +833,12 @@ class OctopusEndpoint(IdentifiableEndpoint):
             modeling_props=octopus.modeling_props
         )
 
-        return octopus.update(response,
-                              self._session,
-                              self._dataset_endpoint,
-                              self._model_endpoint,
-                              self._ontology_endpoint,
-                              self._ssd_endpoint)
+        return self._add(octopus.update(response,
+                                        self._session,
+                                        self._dataset_endpoint,
+                                        self._model_endpoint,
+                                        self._ontology_endpoint,
+                                        self._ssd_endpoint))
 
     @decache
     def update(self, octopus):
@@ -552,12 +861,12 @@ class OctopusEndpoint(IdentifiableEndpoint):
                                     bag_size=octopus.bag_size,
                                     ontologies=[o.id for o in octopus.ontologies],
                                     modeling_props=octopus.modeling_props)
-        return octopus.update(response,
-                              self._session,
-                              self._dataset_endpoint,
-                              self._model_endpoint,
-                              self._ontology_endpoint,
-                              self._ssd_endpoint)
+        return self._add(octopus.update(response,
+                                        self._session,
+                                        self._dataset_endpoint,
+                                        self._model_endpoint,
+                                        self._ontology_endpoint,
+                                        self._ssd_endpoint))
 
     @decache
     def remove(self, octopus):
@@ -566,7 +875,7 @@ class OctopusEndpoint(IdentifiableEndpoint):
         :param octopus: The key or Octopus object to delete from the server...
         :return:
         """
-        self._apply(self._api.delete, octopus, 'delete')
+        self._remove(octopus)
 
     def show(self):
         """
@@ -575,14 +884,39 @@ class OctopusEndpoint(IdentifiableEndpoint):
         """
         print(self.items)
 
-    @lru_cache(maxsize=32)
-    def get(self, key):
+    def predict_many(self, octopus, datasets, max_workers=4, top_k=None, stream=False, decode_top=0):
+        """
+        Runs the predictions of an Octopus for many datasets concurrently.
+        See Octopus.predict_many.
+
+        :param octopus: The key or Octopus object to use for prediction
+        :param datasets: List of DataSet objects or dataset ids
+        :param max_workers: The maximum number of concurrent requests
+        :param top_k: If set, only the first k candidates are kept for each dataset
+        :param stream: If True each server response is decoded incrementally
+        :param decode_top: The number of top candidate SSDs to decode for each dataset
+        :return: PredictionBatch of dataset id -> SSDResultList
+        """
+        if type(octopus) == int:
+            octopus = self.get(octopus)
+        elif not issubclass(type(octopus), Octopus):
+            msg = "Illegal type found in predict_many: {}".format(type(octopus))
+            raise TypeError(msg)
+
+        return octopus.predict_many(datasets,
+                                    max_workers=max_workers,
+                                    top_k=top_k,
+                                    stream=stream,
+                                    decode_top=decode_top)
+
+    def _fetch(self, key):
         """Get a single Octopus at position key"""
-        for o in self.items:
-            if o.id == key:
-                return o
-        msg = "Octopus {} does not exist on server".format(key)
-        raise Exception(msg)
+        return Octopus().update(self._api.item(key),
+                                self._session,
+                                self._dataset_endpoint,
+                                self._model_endpoint,
+                                self._ontology_endpoint,
+                                self._ssd_endpoint)
 
     @property
     @lru_cache(maxsize=32)
@@ -599,4 +933,4 @@ class OctopusEndpoint(IdentifiableEndpoint):
                                  self._ontology_endpoint,
                                  self._ssd_endpoint)
             octopii.append(o)
-        return tuple(octopii)
+        return self._reindex(octopii)
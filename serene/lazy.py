@@ -0,0 +1,66 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Lazy loading of the package attributes, so that `import serene` does
+not import pandas, networkx, rdflib etc. until they are needed
+"""
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module type that imports the attributes listed in `_lazy_attrs`
+    (name -> module) from their module on first access, and then
+    keeps them as ordinary module attributes. The subpackages and
+    submodules are imported on first access too, as after
+    `import serene` with eager imports, `serene.elements` is there.
+    """
+    def __getattr__(self, name):
+        attrs = self.__dict__.get('_lazy_attrs', {})
+        if name not in attrs:
+            if not name.startswith('__') and self._has_submodule(name):
+                # the import sets the submodule as an attribute...
+                return importlib.import_module('.' + name, self.__name__)
+            msg = "module '{}' has no attribute '{}'".format(self.__name__, name)
+            raise AttributeError(msg)
+
+        try:
+            module = importlib.import_module(attrs[name], self.__name__)
+        except AttributeError as e:
+            # `from package import name` would hide this as a missing name...
+            msg = "Failed to import {} from {}: {}".format(name, attrs[name], e)
+            raise ImportError(msg) from e
+        value = getattr(module, name)
+        setattr(self, name, value)
+        return value
+
+    def _has_submodule(self, name):
+        """True if the package has a submodule `name`"""
+        if '__path__' not in self.__dict__:
+            return False
+        return importlib.util.find_spec('{}.{}'.format(self.__name__, name)) is not None
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__dict__.get('_lazy_attrs', {})))
+
+
+def lazy_attributes(module_name, attrs):
+    """
+    Makes the attributes of a package load on first access, e.g. in
+    a package __init__.py
+
+        lazy_attributes(__name__, {'Serene': '.core'})
+
+    :param module_name: The __name__ of the package
+    :param attrs: dict of attribute name -> (relative) module that defines it
+    :return: None
+    """
+    module = sys.modules[module_name]
+    module._lazy_attrs = dict(attrs)
+    module.__class__ = LazyModule
+    if '__all__' not in module.__dict__:
+        module.__all__ = sorted(attrs)
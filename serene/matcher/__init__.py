@@ -4,4 +4,14 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 Serene Python client: Data Integration Software
 """
-from .model import Model, Status, ModelState, ModelType, SamplingStrategy
+from serene.lazy import lazy_attributes
+
+lazy_attributes(__name__, {
+    'Model': '.model',
+    'Status': '.model',
+    'ModelState': '.model',
+    'ModelType': '.model',
+    'SamplingStrategy': '.model',
+    'Prediction': '.prediction',
+    'LabelSuggester': '.suggest',
+})
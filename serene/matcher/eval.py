@@ -12,9 +12,10 @@ from tempfile import mkstemp
 from os import remove
 from os.path import basename, join
 from glob import iglob
+import numpy as np
 from pandas import read_csv, DataFrame, concat
-from sklearn.model_selection import KFold
-from sklearn.metrics import precision_score, recall_score, f1_score
+
+from .prediction import Prediction
 
 
 DatasetSpec = namedtuple('DatasetSpec', 'name path')
@@ -69,31 +70,37 @@ def get_sorted_labels(column_label_map):
     ]
 
 
-def get_sorted_label_candidates(predictions):
+def get_sorted_label_candidates(predictions, k=None):
     """
     Extract top k labels and sort them using their corresponding column names.
 
-    .. function:: get_sorted_label_candidates(prediction)
-       :param prediction: The prediction data frame given by the Serene API.
-       :type prediction: DataFrame
+    .. function:: get_sorted_label_candidates(prediction, k=None)
+       :param prediction: The prediction data frame or compact Prediction
+                          given by the Serene API.
+       :type prediction: DataFrame or Prediction
+       :param k: The number of labels to keep (all if None).
+       :type k: int
        :return: The n * k matrix of top k labels for each column.
-       :rtype: ndarray
+       :rtype: list(list(str))
     """
-    scores_seq = predictions.filter(like='scores_').to_dict(orient='records')
-    columns = predictions['column_id'].values
-
-    labels_seq = (
-        list(
-            label.partition('scores_')[2]
-            for label, score in
-            sorted(scores.items(), key=lambda item: item[1], reverse=True)
-        ) for scores in scores_seq
+    if isinstance(predictions, Prediction):
+        return predictions.sorted_label_candidates(k)
+
+    score_frame = predictions.filter(like='scores_')
+    labels = np.array(
+        [label.partition('scores_')[2] for label in score_frame.columns],
+        dtype=object
     )
+    values = score_frame.values.astype(np.float64)
+    values[np.isnan(values)] = -np.inf
 
-    return [
-        item[1] for item in
-        sorted(zip(columns, labels_seq), key=lambda item: item[0])
-    ]
+    # stable sorts keep the column order for tied scores...
+    ranked = np.argsort(-values, axis=1, kind='stable')
+    if k is not None:
+        ranked = ranked[:, :k]
+    rows = np.argsort(predictions['column_id'].values, kind='stable')
+
+    return labels[ranked[rows]].tolist()
 
 
 def scores(y_true, y_pred):
@@ -108,6 +115,8 @@ def scores(y_true, y_pred):
        :return: The scores.
        :rtype: dict(str, float)
     """
+    from sklearn.metrics import precision_score, recall_score, f1_score
+
     return {
         'average_accuracy':
             average_accuracy(y_true, y_pred),
@@ -381,6 +390,8 @@ class CrossColumnEvaluation:
         return self._average_result(results)
 
     def _kfold(self, k, columns):
+        from sklearn.model_selection import KFold
+
         return KFold(n_splits=k).split(columns)
 
     def _extract_columns(self, columns):
@@ -18,7 +18,8 @@ from functools import lru_cache
 import pandas as pd
 
 from serene.elements.dataset import DataSet, Column
-from serene.utils import convert_datetime
+from serene.utils import convert_datetime, flatten_dict
+from .prediction import Prediction
 
 @unique
 class SamplingStrategy(Enum):
@@ -128,6 +129,7 @@ def decache(func):
 
         Model.predict.cache_clear()
         Model._full_predict.cache_clear()
+        Model._compact_predict.cache_clear()
 
         return func(self, *args, **kwargs)
     return wrapper
@@ -199,21 +201,35 @@ class Model(object):
 
     @decache
     def add_labels(self, table):
-        """Users can add a label to column col. `col` can be a
-        Column object or a string id
+        """Users can add labels to many columns at once. The keys
+        are all checked against one index of the dataset columns.
 
         Args:
-            table: key-value dict with keys as Column objects or int ids
-                   and the values as the class labels (this must exist in the model params)
+            table: key-value dict or pandas Series with keys as Column objects
+                   or int ids and the values as the class labels (this must
+                   exist in the model params), or a DataFrame with 'column_id'
+                   and 'user_label' columns such as Model.labels
 
         Returns:
             The updated set of labels
         """
-        label_table = self.label_data
+        keys, labels = self._label_columns(table)
+
+        # ensure that the keys are valid...
+        ids = pd.to_numeric(keys, errors='coerce')
+        bad_keys = keys[ids.isna() | ~ids.isin(self._column_table().index)]
+        assert \
+            not len(bad_keys), \
+            "Keys {} are not in the column ids".format(list(bad_keys[:10]))
 
-        for k, v in table.items():
-            key, value = self._label_entry(k, v)
-            label_table[key] = value
+        # ensure that the labels are in the classes...
+        bad_labels = labels[~labels.isin(self.classes)]
+        assert \
+            not len(bad_labels), \
+            "Labels {} are not in classes {}".format(sorted(set(bad_labels))[:10], self.classes)
+
+        label_table = self.label_data
+        label_table.update(zip(ids.astype('int64').astype(str), labels))
 
         json = self._session.model_api.update(self.id, labels=label_table)
 
@@ -221,6 +237,28 @@ class Model(object):
 
         return self.labels
 
+    @staticmethod
+    def _label_columns(table):
+        """The keys and labels of a label table as two Series"""
+        if issubclass(type(table), pd.DataFrame):
+            missing = {'column_id', 'user_label'} - set(table.columns)
+            if missing:
+                msg = "The label DataFrame has no {} columns".format(sorted(missing))
+                raise ValueError(msg)
+            keys = table['column_id']
+            labels = table['user_label']
+        elif issubclass(type(table), pd.Series):
+            keys = table.index.to_series()
+            labels = table
+        else:
+            keys = pd.Series(list(table.keys()), dtype=object)
+            labels = pd.Series(list(table.values()), dtype=object)
+
+        keys = pd.Series(keys.values, dtype=keys.dtype)
+        if keys.dtype == object:
+            keys = keys.map(lambda k: k.id if issubclass(type(k), Column) else k)
+        return keys, pd.Series(labels.values, dtype=object)
+
     @decache
     def train(self):
         """
@@ -254,8 +292,20 @@ class Model(object):
         return state().status == Status.COMPLETE
 
     @lru_cache(maxsize=32)
-    def predict(self, dataset, scores=True, features=False):
-        """Runs a prediction across the `dataset`"""
+    def predict(self, dataset, scores=True, features=False, compact=False):
+        """
+        Runs a prediction across the `dataset`
+
+        :param dataset: Can be dataset id or a DataSet object
+        :param scores: If true return the scores
+        :param features: If true return all the feature values
+        :param compact: If true return an array-backed Prediction object
+                        instead of a DataFrame. Use Prediction.to_df to convert.
+        :return: Pandas DataFrame or Prediction
+        """
+        if compact:
+            return self._compact_predict(dataset)
+
         logging.debug("Model prediction start...")
         df = self._full_predict(dataset)
         logging.debug("--> full predict done")
@@ -303,14 +353,20 @@ class Model(object):
         """Returns the label DataFrame, which contains the
         user-specified columns
         """
-        keys = [int(k) for k in self.label_data.keys()]
-        labels = [lab for lab in self.label_data.values()]
+        keys = pd.Index([int(k) for k in self.label_data.keys()], dtype='int64')
+        labels = list(self.label_data.values())
+
+        columns = self._column_table()
+        positions = columns.index.get_indexer(keys)
+        if (positions < 0).any():
+            raise KeyError(list(keys[positions < 0]))
+        found = columns.iloc[positions]
 
         return pd.DataFrame({
             'user_label': labels,
-            'column_name': [self._column_lookup[x].name for x in keys],
-            'dataset_id': [self._column_lookup[x].datasetID for x in keys],
-            'column_id': keys
+            'column_name': found['column_name'].values,
+            'dataset_id': found['dataset_id'].values,
+            'column_id': keys.values
         })
 
     @lru_cache(maxsize=32)
@@ -335,6 +391,31 @@ class Model(object):
 
         return df
 
+    @lru_cache(maxsize=32)
+    def _compact_predict(self, dataset):
+        """
+        Predict the column labels for this dataset, returning the
+        compact array-backed Prediction object.
+
+        :param dataset: Can be dataset id or a DataSet object
+
+        :return: Prediction object
+        """
+        if issubclass(type(dataset), DataSet):
+            key = dataset.id
+        else:
+            key = int(dataset)
+
+        json = self._session.model_api.predict(self.id, key)
+
+        lookup = self._column_lookup
+        user_labels = {int(k): v for k, v in self.label_data.items()}
+
+        logging.debug("converting model predictions to compact arrays")
+        return Prediction.from_json(json,
+                                    column_names={k: col.name for k, col in lookup.items()},
+                                    user_labels=user_labels)
+
     @decache
     def _update(self, json):
         """Re-initializes the model based on an updated json string"""
@@ -349,6 +430,14 @@ class Model(object):
         # first we grab all the columns out from the datasets
         return {item.id: item for sublist in self._columns() for item in sublist}
 
+    def _column_table(self):
+        """The name and dataset of all the dataset columns, indexed by the column id"""
+        columns = [item for sublist in self._columns() for item in sublist]
+        return pd.DataFrame({
+            'column_name': [c.name for c in columns],
+            'dataset_id': [c.datasetID for c in columns]
+        }, index=pd.Index([c.id for c in columns], dtype='int64'))
+
     def _label_entry(self, col, label):
         """Prepares the label entry by ensuring the key is a
            valid string key and the label is also valid"""
@@ -471,7 +560,7 @@ class Model(object):
         dlist = [update(d, "column_id", int(k)) for k, d in json['predictions'].items()]
 
         # we now want to flatten the nested items
-        flat_list = [self._flatten(d) for d in dlist]
+        flat_list = [flatten_dict(d) for d in dlist]
 
         # now we add the IDs as well
         final = [update(d, "dataset_id", int(datasetID)) for d in flat_list]
@@ -488,28 +577,6 @@ class Model(object):
 
         return table
 
-    def _flatten(self, d, parent_key='', sep='_'):
-        """
-        Flattens a nested dictionary by squashing the
-        parent keys into the sub-key name with separator
-        e.g.
-            flatten({'a': 1, 'c': {'a': 2, 'b': {'x': 5, 'y' : 10}}, 'd': [1, 2, 3]})
-            >> {'a': 1, 'c_a': 2, 'c_b_x': 5, 'd': [1, 2, 3], 'c_b_y': 10}
-
-        :param d: The nested dictionary
-        :param parent_key: parent key prefix
-        :param sep: The separator to
-        :return:
-        """
-        items = []
-        for k, v in d.items():
-            new_key = parent_key + sep + k if parent_key else k
-            if isinstance(v, collections.MutableMapping):
-                items.extend(self._flatten(v, new_key, sep=sep).items())
-            else:
-                items.append((new_key, v))
-        return dict(items)
-
 
 class ModelList(collections.MutableSequence):
     """
@@ -0,0 +1,265 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Serene Python client: Prediction classes
+
+The Prediction holds the schema matcher prediction results from the
+server in a compact, array-backed form.
+
+"""
+import collections
+import logging
+
+import numpy as np
+import pandas as pd
+
+from serene.utils import flatten_dict
+
+
+class Prediction(object):
+    """
+    Compact representation of a Model prediction. Rather than a wide
+    DataFrame with one object column per class score and feature, the
+    prediction is held as NumPy arrays:
+
+        column_ids: (n,) int64 array of the predicted column ids
+        classes: (c,) array of class labels (the score column index)
+        scores: (n, c) float32 matrix of class scores
+        feature_names: (f,) array of feature names (the feature column index)
+        features: (n, f) float32 matrix of numeric feature values
+
+    Non-numeric feature values are kept aside in object arrays. The
+    DataFrame representation is only built on request with `to_df`.
+    """
+    SCORE_PRE = "scores"
+    FEATURE_PRE = "features"
+
+    def __init__(self,
+                 dataset_id,
+                 model_id,
+                 column_ids,
+                 labels,
+                 confidence,
+                 classes,
+                 scores,
+                 feature_names=None,
+                 features=None,
+                 extra_features=None,
+                 column_names=None,
+                 user_labels=None):
+        """
+        Initialize the Prediction from pre-built arrays. Use
+        Prediction.from_json to build one from a server response.
+
+        :param dataset_id: The id of the predicted dataset
+        :param model_id: The id of the model used for prediction
+        :param column_ids: Sequence of column ids (one per row)
+        :param labels: Sequence of predicted labels (one per row)
+        :param confidence: Sequence of prediction confidences (one per row)
+        :param classes: Sequence of class labels for the score columns
+        :param scores: (n, c) score matrix
+        :param feature_names: Sequence of numeric feature names
+        :param features: (n, f) feature matrix
+        :param extra_features: dict of feature name -> object array for non-numeric features
+        :param column_names: Optional sequence of column names (one per row)
+        :param user_labels: Optional sequence of user labels (one per row)
+        """
+        self.dataset_id = dataset_id
+        self.model_id = model_id
+        self.column_ids = np.asarray(column_ids, dtype=np.int64)
+        self.labels = np.asarray(labels, dtype=object)
+        self.confidence = np.asarray(confidence, dtype=np.float32)
+        self.classes = np.asarray(classes, dtype=object)
+        self.scores = np.asarray(scores, dtype=np.float32).reshape(len(self.column_ids), len(self.classes))
+
+        if feature_names is None:
+            feature_names = []
+        self.feature_names = np.asarray(feature_names, dtype=object)
+
+        if features is None:
+            features = np.empty((len(self.column_ids), 0), dtype=np.float32)
+        self.features = np.asarray(features, dtype=np.float32).reshape(len(self.column_ids),
+                                                                        len(self.feature_names))
+
+        self.extra_features = extra_features if extra_features is not None else {}
+        self.column_names = np.asarray(column_names, dtype=object) if column_names is not None else None
+        self.user_labels = np.asarray(user_labels, dtype=object) if user_labels is not None else None
+
+        self._df_cache = {}
+
+    @classmethod
+    def from_json(cls, json, column_names=None, user_labels=None):
+        """
+        Builds the Prediction directly from the nested prediction json
+        returned by the server, without an intermediate flat table:
+
+            {
+                'dataSetID': ...,
+                'modelID': ...,
+                'predictions': {
+                    column_id: {
+                        'label': ...,
+                        'confidence': ...,
+                        'scores': {class: score, ...},
+                        'features': {name: value, ...}
+                    }
+                    ...
+                }
+            }
+
+        :param json: JSON returned from the backend
+        :param column_names: Optional dict of column_id -> column name
+        :param user_labels: Optional dict of column_id -> user label
+        :return: Prediction
+        """
+        predictions = json['predictions']
+        n = len(predictions)
+
+        column_ids = np.empty(n, dtype=np.int64)
+        labels = np.empty(n, dtype=object)
+        confidence = np.empty(n, dtype=np.float32)
+
+        # the class and feature indices are taken from the union
+        # of all the keys, in order of appearance...
+        class_index = collections.OrderedDict()
+        feature_index = collections.OrderedDict()
+        rows = []
+        for i, (key, d) in enumerate(predictions.items()):
+            column_ids[i] = int(key)
+            labels[i] = d.get('label')
+            confidence[i] = d.get('confidence', np.nan)
+
+            row_scores = d.get(cls.SCORE_PRE) or {}
+            row_features = flatten_dict(d.get(cls.FEATURE_PRE) or {})
+            for k in row_scores:
+                class_index.setdefault(k, len(class_index))
+            for k in row_features:
+                feature_index.setdefault(k, len(feature_index))
+            rows.append((row_scores, row_features))
+
+        scores = np.full((n, len(class_index)), np.nan, dtype=np.float32)
+        features = np.full((n, len(feature_index)), np.nan, dtype=np.float32)
+        extra = {}
+        for i, (row_scores, row_features) in enumerate(rows):
+            for k, v in row_scores.items():
+                scores[i, class_index[k]] = v
+            for k, v in row_features.items():
+                try:
+                    features[i, feature_index[k]] = v
+                except (TypeError, ValueError):
+                    # non-numeric features are kept aside...
+                    if k not in extra:
+                        extra[k] = np.full(n, None, dtype=object)
+                    extra[k][i] = v
+
+        # drop the non-numeric features from the dense matrix
+        numeric = [k for k in feature_index if k not in extra]
+        if len(extra):
+            features = features[:, [feature_index[k] for k in numeric]]
+
+        if column_names is not None:
+            column_names = [column_names.get(c) for c in column_ids]
+
+        if user_labels is not None:
+            user_labels = [user_labels.get(c, np.nan) for c in column_ids]
+
+        logging.debug("Compact prediction built: {} columns, {} classes, {} features"
+                      .format(n, len(class_index), len(numeric)))
+
+        return cls(dataset_id=int(json['dataSetID']),
+                   model_id=int(json['modelID']),
+                   column_ids=column_ids,
+                   labels=labels,
+                   confidence=confidence,
+                   classes=list(class_index.keys()),
+                   scores=scores,
+                   feature_names=numeric,
+                   features=features,
+                   extra_features=extra,
+                   column_names=column_names,
+                   user_labels=user_labels)
+
+    def top_k(self, k=None):
+        """
+        Returns the top k class labels for each column, ordered by
+        decreasing score. Ties keep the class index order.
+
+        :param k: The number of labels to return (all if None)
+        :return: (n, k) array of class labels
+        """
+        # missing scores are sorted to the end...
+        values = np.where(np.isnan(self.scores), -np.inf, self.scores)
+        order = np.argsort(-values, axis=1, kind='stable')
+        if k is not None:
+            order = order[:, :k]
+        return self.classes[order]
+
+    def sorted_label_candidates(self, k=None):
+        """
+        Extract top k labels and sort them using their corresponding column ids.
+
+        :param k: The number of labels to return (all if None)
+        :return: The n * k list of top k labels for each column.
+        """
+        order = np.argsort(self.column_ids, kind='stable')
+        return self.top_k(k)[order].tolist()
+
+    def to_df(self, scores=True, features=False):
+        """
+        Converts the Prediction into the flat DataFrame layout returned
+        by Model.predict. The conversion is cached.
+
+        :param scores: If true include the scores_* columns
+        :param features: If true include the features_* columns
+        :return: Pandas DataFrame
+        """
+        key = (scores, features)
+        if key not in self._df_cache:
+            self._df_cache[key] = self._build_df(scores, features)
+        return self._df_cache[key]
+
+    def _build_df(self, scores, features):
+        """Helper function to build the DataFrame for to_df"""
+        n = len(self)
+        data = collections.OrderedDict([
+            ("column_id", self.column_ids),
+            ("column_name", self.column_names if self.column_names is not None else np.full(n, None, dtype=object)),
+            ("confidence", self.confidence),
+            ("dataset_id", np.full(n, self.dataset_id, dtype=np.int64)),
+            ("model_id", np.full(n, self.model_id, dtype=np.int64)),
+            ("label", self.labels),
+            ("user_label", self.user_labels if self.user_labels is not None else np.full(n, np.nan, dtype=object))
+        ])
+        frames = [pd.DataFrame(data)]
+
+        if features:
+            names = ["{}_{}".format(self.FEATURE_PRE, f) for f in self.feature_names]
+            frames.append(pd.DataFrame(self.features, columns=names))
+            if len(self.extra_features):
+                frames.append(pd.DataFrame({
+                    "{}_{}".format(self.FEATURE_PRE, f): v for f, v in self.extra_features.items()
+                }))
+
+        if scores:
+            names = ["{}_{}".format(self.SCORE_PRE, c) for c in self.classes]
+            frames.append(pd.DataFrame(self.scores, columns=names))
+
+        return pd.concat(frames, axis=1)
+
+    @property
+    def nbytes(self):
+        """The number of bytes held by the array data"""
+        arrays = [self.column_ids, self.confidence, self.scores, self.features]
+        return sum(a.nbytes for a in arrays)
+
+    def __len__(self):
+        return len(self.column_ids)
+
+    def __repr__(self):
+        return "Prediction(dataset={}, model={}, columns={}, classes={})".format(
+            self.dataset_id,
+            self.model_id,
+            len(self),
+            len(self.classes)
+        )
@@ -0,0 +1,295 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Serene Python client: local label suggestions
+
+The LabelSuggester indexes the labelled columns of a model by their
+header n-grams and sample values, and suggests labels for new columns
+with similar headers or values without a server prediction.
+
+"""
+import collections
+import logging
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+_logger = logging.getLogger()
+_logger.setLevel(logging.WARN)
+
+# the Mersenne prime of the MinHash permutations
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_CAMEL = re.compile(r'([a-z0-9])([A-Z])')
+_NON_WORD = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(name):
+    """
+    The normalized form of a column header, so that 'birthDate',
+    'BIRTH_DATE' and 'Birth date' are the same
+
+    :param name: The column header
+    :return: Lowercase words separated by single spaces
+    """
+    name = _CAMEL.sub(r'\1 \2', str(name))
+    return _NON_WORD.sub(' ', name.lower()).strip()
+
+
+def ngrams(text, n=3):
+    """The set of character n-grams of a text, padded at the ends"""
+    text = ' {} '.format(text)
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class MinHasher(object):
+    """
+    MinHash signatures of sets of strings: the fraction of equal
+    positions in two signatures estimates the Jaccard similarity of
+    the sets. The same seed gives the same signatures in any process.
+    """
+    def __init__(self, num_perm=64, seed=1):
+        """
+        :param num_perm: The signature length
+        :param seed: The seed of the hash permutations
+        """
+        state = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = state.randint(1, 1 << 61, num_perm, dtype=np.uint64)
+        self._b = state.randint(0, 1 << 61, num_perm, dtype=np.uint64)
+
+    def signature(self, items):
+        """
+        :param items: The set of strings
+        :return: uint64 array of num_perm minimum hashes, or None for an empty set
+        """
+        if not items:
+            return None
+        hashes = np.fromiter((zlib.crc32(x.encode('utf-8')) for x in items),
+                             dtype=np.uint64, count=len(items))
+        with np.errstate(over='ignore'):
+            values = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME & _MAX_HASH
+        return values.min(axis=1)
+
+
+class LabelSuggester(object):
+    """
+    Suggests labels for columns from previously labelled ones, by
+    similar headers and sample values:
+
+        suggester = LabelSuggester.from_model(model)
+        suggester.suggest('Birth_Date', values=['1970-01-02'])
+        # [('birthDate', 0.83), ('date', 0.41)]
+
+    The headers are normalized (case, separators, camelCase) and
+    compared as sets of character n-grams, and the sample values as sets
+    of values, both with MinHash signatures. Candidates are found with
+    locality sensitive hashing on the signature bands, so a lookup only
+    scores the columns that share a band with the query, whatever the
+    size of the index. An exact match of the normalized header scores 1.
+
+    For bulk labelling, `prelabel` gives the labels of the columns
+    suggested with a score over a threshold, to add with
+    Model.add_labels, and the other columns can be left to the server
+    prediction.
+    """
+    def __init__(self, num_perm=64, bands=16, ngram=3, name_weight=0.5, seed=1):
+        """
+        :param num_perm: The MinHash signature length
+        :param bands: The number of LSH bands, num_perm must be a multiple of it.
+                      More bands find less similar columns.
+        :param ngram: The character n-gram size of the headers
+        :param name_weight: The weight of the header similarity when both columns
+                            have sample values, the rest is the value similarity
+        :param seed: The seed of the MinHash permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm {} is not a multiple of bands {}".format(num_perm, bands))
+        self._hasher = MinHasher(num_perm, seed)
+        self._bands = bands
+        self._rows = num_perm // bands
+        self._ngram = ngram
+        self._name_weight = name_weight
+
+        self._labels = []
+        self._names = {}  # normalized name -> code
+        self._name_codes = []
+        self._name_sigs = []
+        self._value_sigs = []
+        self._buckets = collections.defaultdict(list)  # (kind, band, band hashes) -> entries
+        self._matrix = None  # the signatures stacked, built on the first lookup
+
+    def __len__(self):
+        return len(self._labels)
+
+    @property
+    def labels(self):
+        """The distinct labels in the index"""
+        return sorted(set(self._labels))
+
+    def _signatures(self, name, values):
+        """The header and value signatures of a column"""
+        name_sig = self._hasher.signature(ngrams(normalize(name), self._ngram))
+        value_sig = None
+        if values is not None:
+            items = {str(v).strip().lower() for v in values if v is not None and not pd.isnull(v)}
+            value_sig = self._hasher.signature(items - {''})
+        return name_sig, value_sig
+
+    def _band_keys(self, kind, sig):
+        """The LSH bucket keys of a signature"""
+        if sig is None:
+            return []
+        r = self._rows
+        return [(kind, i, sig[i * r:(i + 1) * r].tobytes()) for i in range(self._bands)]
+
+    def add(self, name, label, values=None):
+        """
+        Adds a labelled column
+
+        :param name: The column header
+        :param label: The label of the column
+        :param values: The sample values of the column, or None
+        :return: The LabelSuggester
+        """
+        entry = len(self._labels)
+        name_sig, value_sig = self._signatures(name, values)
+        self._labels.append(label)
+        self._name_codes.append(self._names.setdefault(normalize(name), len(self._names)))
+        self._name_sigs.append(name_sig)
+        self._value_sigs.append(value_sig)
+        for key in self._band_keys('name', name_sig) + self._band_keys('value', value_sig):
+            self._buckets[key].append(entry)
+        self._matrix = None
+        return self
+
+    def add_many(self, names, labels, values=None):
+        """
+        Adds labelled columns
+
+        :param names: The column headers
+        :param labels: The labels of the columns
+        :param values: The sample values of each column, or None
+        :return: The LabelSuggester
+        """
+        values = values if values is not None else [None] * len(names)
+        for name, label, sample in zip(names, labels, values):
+            self.add(name, label, sample)
+        return self
+
+    def _stacked(self):
+        """The signatures as matrices, the entries with values, and the header and label codes"""
+        if self._matrix is None:
+            empty = np.zeros(self._hasher.num_perm, dtype=np.uint64)
+            names = np.vstack(self._name_sigs)
+            values = np.vstack([s if s is not None else empty for s in self._value_sigs])
+            has_values = np.array([s is not None for s in self._value_sigs])
+            codes, labels = pd.factorize(pd.Series(self._labels, dtype=object))
+            self._matrix = names, values, has_values, np.array(self._name_codes), codes, labels
+        return self._matrix
+
+    def suggest(self, name, values=None, top_k=3):
+        """
+        The labels of the most similar labelled columns
+
+        :param name: The column header
+        :param values: The sample values of the column, or None
+        :param top_k: The number of labels to return
+        :return: List of (label, score) with the highest scores first, scores in [0, 1]
+        """
+        if not self._labels:
+            return []
+        name_sig, value_sig = self._signatures(name, values)
+
+        entries = set()
+        for key in self._band_keys('name', name_sig) + self._band_keys('value', value_sig):
+            entries.update(self._buckets.get(key, ()))
+        if not entries:
+            return []
+
+        entries = np.fromiter(entries, dtype=np.int64, count=len(entries))
+        names, samples, has_values, name_codes, codes, labels = self._stacked()
+
+        score = np.mean(names[entries] == name_sig, axis=1)
+        # an exact header match is certain of the header...
+        score[name_codes[entries] == self._names.get(normalize(name), -1)] = 1.0
+
+        if value_sig is not None:
+            value_score = np.mean(samples[entries] == value_sig, axis=1)
+            w = self._name_weight
+            score = np.where(has_values[entries], w * score + (1.0 - w) * value_score, score)
+
+        # the best score of each label...
+        order = np.argsort(-score, kind='mergesort')
+        _, first = np.unique(codes[entries[order]], return_index=True)
+        best = order[np.sort(first)[:top_k]]
+        return [(labels[codes[entries[i]]], float(score[i])) for i in best if score[i] > 0]
+
+    def suggest_many(self, columns, top_k=1):
+        """
+        The label suggestions of several columns
+
+        :param columns: List of Column objects, with their sample values
+        :param top_k: The number of labels for each column
+        :return: DataFrame with the column_id, column_name, label and score of each suggestion
+        """
+        rows = []
+        for col in columns:
+            for label, score in self.suggest(col.name, col.sample, top_k):
+                rows.append((col.id, col.name, label, score))
+        return pd.DataFrame(rows, columns=['column_id', 'column_name', 'label', 'score'])
+
+    def prelabel(self, columns, threshold=0.8):
+        """
+        The labels of the columns with a suggestion scoring over the threshold,
+        e.g. for Model.add_labels
+
+        :param columns: List of Column objects, with their sample values
+        :param threshold: The smallest score of a label
+        :return: Dict of Column -> label
+        """
+        table = {}
+        for col in columns:
+            found = self.suggest(col.name, col.sample, top_k=1)
+            if found and found[0][1] >= threshold:
+                table[col] = found[0][0]
+        return table
+
+    @classmethod
+    def from_model(cls, model, **kwargs):
+        """
+        The suggester of the user labels of a Model, with the column
+        sample values of the datasets
+
+        :param model: The Model
+        :param kwargs: The LabelSuggester arguments
+        :return: LabelSuggester
+        """
+        suggester = cls(**kwargs)
+        lookup = model._column_lookup
+        for key, label in model.label_data.items():
+            col = lookup.get(int(key))
+            if col is None:
+                _logger.warning("Label column {} is not in the datasets".format(key))
+                continue
+            suggester.add(col.name, label, col.sample)
+        return suggester
+
+    @classmethod
+    def from_octopus(cls, octopus, **kwargs):
+        """
+        The suggester of the labels of the Octopus matcher model. The
+        labels are the semantic types of the octopus, in its
+        semantic_type_map with their namespaces.
+
+        :param octopus: The Octopus
+        :param kwargs: The LabelSuggester arguments
+        :return: LabelSuggester
+        """
+        return cls.from_model(octopus.matcher, **kwargs)
@@ -0,0 +1,144 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Seeded row sampling of large csv files, e.g. to upload a training
+sample instead of the whole file
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+_logger = logging.getLogger()
+_logger.setLevel(logging.WARN)
+
+
+class RowSampler(object):
+    """
+    Samples `size` rows of a csv file or DataFrame in one pass over
+    chunks of rows, holding only the sample in memory.
+
+    Each row gets a random key from the seeded generator and the rows
+    with the smallest keys are kept (bottom-k or priority reservoir
+    sampling), which gives a uniform sample. The keys are drawn in row
+    order, so the sample depends only on the seed and the source, not
+    on the chunk size.
+
+    With `stratify`, the row with the smallest key of each distinct
+    value of the stratify columns is kept as well, so that rare values
+    (e.g. the classes of a training column) are in the sample, and the
+    rest of the sample is filled uniformly.
+
+        sample = RowSampler(50000, seed=1, stratify='class').sample('big.csv')
+    """
+    def __init__(self, size, seed=0, stratify=None, chunk_size=100000):
+        """
+        :param size: The number of rows to sample
+        :param seed: The seed of the random keys, the same seed gives the same sample
+        :param stratify: A column name or list of column names whose values should all be sampled
+        :param chunk_size: The number of rows read at a time
+        """
+        if size < 1:
+            raise ValueError("The sample size must be positive")
+        self.size = size
+        self.seed = seed
+        self.chunk_size = chunk_size
+        if stratify is None or isinstance(stratify, (list, tuple)):
+            self.stratify = stratify
+        else:
+            self.stratify = [stratify]
+
+    def frames(self, source):
+        """
+        The chunks of the source, as strings indexed by the row number
+
+        :param source: The csv file path or a DataFrame
+        :return: Generator of DataFrames
+        """
+        if issubclass(type(source), pd.DataFrame):
+            for start in range(0, len(source), self.chunk_size):
+                df = source.iloc[start:start + self.chunk_size].copy()
+                df.index = pd.RangeIndex(start, start + len(df))
+                yield df
+        else:
+            # the values are kept as written, so the sample has the same values...
+            reader = pd.read_csv(source,
+                                 dtype=str,
+                                 keep_default_na=False,
+                                 chunksize=self.chunk_size)
+            start = 0
+            for df in reader:
+                df.index = pd.RangeIndex(start, start + len(df))
+                start += len(df)
+                yield df
+
+    def _strata(self, df):
+        """The stratum of each row, the stratify values joined as one string"""
+        missing = [c for c in self.stratify if c not in df.columns]
+        if missing:
+            raise ValueError("The source has no columns {} to stratify".format(missing))
+        labels = df[self.stratify[0]].astype(str)
+        if len(self.stratify) > 1:
+            labels = labels.str.cat([df[c].astype(str) for c in self.stratify[1:]], sep='\x00')
+        return labels
+
+    @staticmethod
+    def _smallest(keys, k):
+        """The index of the k smallest keys of a Series"""
+        if len(keys) <= k:
+            return keys.index
+        return keys.index[np.argpartition(keys.values, k - 1)[:k]]
+
+    def sample(self, source):
+        """
+        Samples the rows of the source
+
+        :param source: The csv file path or a DataFrame
+        :return: DataFrame of the sampled rows, in the source order
+        """
+        state = np.random.RandomState(self.seed)
+
+        # the uniform sample, and its keys...
+        rows = None
+        keys = pd.Series([], dtype=float)
+        # the stratum -> smallest key row, and their rows...
+        best = pd.DataFrame({'stratum': pd.Series([], dtype=object), 'key': pd.Series([], dtype=float)})
+        strata_rows = None
+
+        for df in self.frames(source):
+            chunk_keys = pd.Series(state.random_sample(len(df)), index=df.index)
+
+            if self.stratify is not None:
+                found = pd.DataFrame({'stratum': self._strata(df), 'key': chunk_keys})
+                best = pd.concat([best, found]).sort_values('key', kind='mergesort') \
+                                               .drop_duplicates('stratum')
+                new = df.loc[df.index.isin(best.index)]
+                strata_rows = new if strata_rows is None else pd.concat([strata_rows, new])
+                strata_rows = strata_rows.loc[strata_rows.index.isin(best.index)]
+
+            if len(keys) >= self.size:
+                # only the rows under the largest key of the sample can join it...
+                chunk_keys = chunk_keys[chunk_keys.values < keys.values.max()]
+            keys = pd.concat([keys, chunk_keys])
+            keep = self._smallest(keys, self.size)
+            keys = keys.loc[keep]
+            new = df.loc[chunk_keys.index]
+            rows = new if rows is None else pd.concat([rows, new])
+            rows = rows.loc[rows.index.isin(keep)]
+
+        if rows is None:
+            return pd.read_csv(source, dtype=str, nrows=0) if isinstance(source, str) else source.iloc[:0]
+
+        if self.stratify is not None:
+            if len(best) > self.size:
+                _logger.warning("There are {} distinct values in {}, more than the sample size {}"
+                                .format(len(best), self.stratify, self.size))
+            keep = best.index[:self.size]
+            # filled up with the uniform sample...
+            rest = keys.drop(keep, errors='ignore')
+            keep = keep.append(self._smallest(rest, self.size - len(keep)))
+            rows = pd.concat([strata_rows, rows])
+            rows = rows[~rows.index.duplicated()].loc[keep]
+
+        return rows.sort_index().reset_index(drop=True)
@@ -1,6 +1,12 @@
+import collections
+import collections.abc
+import hashlib
+import io
 import logging
 import random
 import string
+import threading
+import time
 from datetime import datetime
 import json
 
@@ -26,10 +32,104 @@ def flatten(xs):
     return [x for y in xs for x in y]
 
 
+def flatten_dict(d, parent_key='', sep='_'):
+    """
+    Flattens a nested dictionary by squashing the
+    parent keys into the sub-key name with separator
+    e.g.
+        flatten_dict({'a': 1, 'c': {'a': 2, 'b': {'x': 5, 'y' : 10}}, 'd': [1, 2, 3]})
+        >> {'a': 1, 'c_a': 2, 'c_b_x': 5, 'd': [1, 2, 3], 'c_b_y': 10}
+
+    :param d: The nested dictionary
+    :param parent_key: parent key prefix
+    :param sep: The separator between the keys
+    :return: The flat dictionary
+    """
+    items = []
+    for k, v in d.items():
+        new_key = parent_key + sep + k if parent_key else k
+        if isinstance(v, collections.abc.MutableMapping):
+            items.extend(flatten_dict(v, new_key, sep=sep).items())
+        else:
+            items.append((new_key, v))
+    return dict(items)
+
+
+class HashWriter(io.TextIOBase):
+    """
+    Text file wrapper that hashes the encoded text as it is written
+    e.g. for df.to_csv(HashWriter(f)), so the content hash is found
+    in the same pass as the file is written. It is a text stream so
+    that pandas accepts it as a file object.
+    """
+    def __init__(self, f, encoding='utf-8'):
+        """
+        :param f: The binary file object to write to
+        :param encoding: The text encoding
+        """
+        super().__init__()
+        self._file = f
+        self._encoding = encoding
+        self._digest = hashlib.sha256()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        data = text.encode(self._encoding)
+        self._digest.update(data)
+        self._file.write(data)
+        return len(text)
+
+    def hexdigest(self):
+        """The sha256 of the content written so far"""
+        return self._digest.hexdigest()
+
+
+class StageTimer(object):
+    """
+    Collects the time spent in the stages of a pipeline, where the
+    items of each stage may run concurrently. For each stage the
+    number of items, the total time spent on them (busy) and the
+    time from the first start to the last end (wall) are kept.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = collections.OrderedDict()
+
+    def record(self, stage, start, end):
+        """Adds an item of `stage` which ran from `start` to `end`"""
+        with self._lock:
+            count, busy, first, last = self._stages.get(stage, (0, 0.0, start, end))
+            self._stages[stage] = (count + 1, busy + end - start, min(first, start), max(last, end))
+
+    def timed(self, stage, func):
+        """Wraps func so that each call is recorded under `stage`"""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stage, start, time.perf_counter())
+        return wrapper
+
+    @property
+    def summary(self):
+        """DataFrame of the count, busy and wall seconds of each stage"""
+        import pandas as pd
+
+        with self._lock:
+            rows = [(stage, count, busy, last - first)
+                    for stage, (count, busy, first, last) in self._stages.items()]
+        return pd.DataFrame(rows, columns=['stage', 'count', 'busy', 'wall']).set_index('stage')
+
+
 class Searchable(object):
     """
     A small object that allows hierarchical search across its properties...
     """
+    __slots__ = ()
+
     getters = []
 
     @classmethod
@@ -2,8 +2,6 @@ import os.path
 import tempfile
 import webbrowser
 
-import pygraphviz as pgv
-
 from .elements import ObjectProperty, ClassNode, DataNode, Column
 from .elements import DataLink, ColumnLink, ObjectLink, ClassInstanceLink, SubClassLink
 
@@ -29,6 +27,9 @@ class BaseVisualizer(object):
         Show the graph using pygraphviz
         :return:
         """
+        # pygraphviz needs graphviz installed, so it is only imported to draw...
+        import pygraphviz as pgv
+
         g = pgv.AGraph(strict=False,
                        directed=True,
                        remincross='true',
@@ -1,7 +1,11 @@
+import hashlib
+import os
+import shutil
+import tempfile
 from functools import partial
-from io import TextIOBase
+from io import BytesIO
 
-from mock import MagicMock, Mock, call, patch
+from mock import Mock
 from requests import Response, Session
 from unittest2 import TestCase
 
@@ -363,6 +367,17 @@ class TestOntologyAPI(TestCase):
         self.assertIsNotNone(args[1]["files"]["file"])
         self.assertEqual(result, message)
 
+    def test_post_buffer(self):
+        self.response.status_code = 200
+        self.response.json = Mock(return_value="Created")
+        self.connection.post = Mock(return_value=self.response)
+        buffer = BytesIO(b"@prefix : <http://ns#> .")
+        self.api.post(self.description, buffer, "turtle")
+
+        args = self.connection.post.call_args
+        self.assertEqual(args[1]["data"]["format"], "ttl")
+        self.assertIs(args[1]["files"]["file"], buffer)
+
     def test_post_with_connection_exception(self):
         self.connection.post = Mock(side_effect=Exception)
         api_post = partial(
@@ -462,30 +477,56 @@ class TestOntologyAPI(TestCase):
 
         self.assertRaises(InternalError, api_item)
 
-    @patch("requests.get")
-    def test_owl_file(self, get):
+    def test_owl_file(self):
         key = 3
-        self.api.item = Mock(return_value={"name": "test.ttl"})
+        self.api.cache_dir = tempfile.mkdtemp()
+        self.api.item = Mock(return_value={"name": "test.ttl", "dateModified": "2017-03-16"})
 
         self.response.status_code = 200
-        chunks = ["1", "2"]
+        chunks = [b"1", b"2"]
         self.response.iter_content = Mock(return_value=chunks)
-        get.configure_mock(return_value=self.response)
-
-        f = MagicMock(spec=TextIOBase)
-        f.__enter__ = Mock(return_value=f)
-        self.api._create_local_owl_file = Mock(return_value=f)
+        get = self.connection.get = Mock(return_value=self.response)
 
         result = self.api.owl_file(key)
 
         get.assert_called_with(self.uri + str(key) + "/file", stream=True)
-        self.api._create_local_owl_file.assert_called_with(result)
-        f.write.assert_has_calls([call(chunk) for chunk in chunks])
+        self.assertEqual(result, os.path.join(self.api.cache_dir, hashlib.sha256(b"12").hexdigest() + ".ttl"))
+        with open(result, "rb") as f:
+            self.assertEqual(f.read(), b"12")
+
+        # the same version is read from the cache...
+        self.assertEqual(self.api.owl_file(key), result)
+        self.assertEqual(get.call_count, 1)
+
+        shutil.rmtree(self.api.cache_dir)
 
-    @patch("requests.get")
-    def test_owl_file_with_connection_exception(self, get):
+    def test_owl_file_servers(self):
+        self.api.cache_dir = tempfile.mkdtemp()
+        info = {"name": "test.ttl", "dateModified": "2017-03-16"}
+        self.response.status_code = 200
+        self.response.iter_content = Mock(return_value=[b"test"])
+        self.connection.get = Mock(return_value=self.response)
+        first = self.api.owl_file(3, info)
+
+        # the same id and date on another server, sharing the cache...
+        connection = Mock(Session())
+        response = Mock(Response())
+        response.status_code = 200
+        response.iter_content = Mock(return_value=[b"prod"])
+        connection.get = Mock(return_value=response)
+        api = OntologyAPI("http://prod:8080/", connection, cache_dir=self.api.cache_dir)
+
+        second = api.owl_file(3, info)
+        self.assertNotEqual(second, first)
+        with open(second, "rb") as f:
+            self.assertEqual(f.read(), b"prod")
+        self.assertEqual(self.api.owl_file(3, info), first)
+
+        shutil.rmtree(self.api.cache_dir)
+
+    def test_owl_file_with_connection_exception(self):
         self.api.item = Mock(return_value={"name": "test.ttl"})
-        get.configure_mock(side_effect=Exception)
+        self.connection.get = Mock(side_effect=Exception)
         api_owl_file = partial(self.api.owl_file, 1)
 
         self.assertRaises(InternalError, api_owl_file)
@@ -839,6 +880,27 @@ class TestOctopusAPI(TestCase):
         self.connection.post.assert_called_with(
             self.uri + str(octopusKey) + "/predict/" + str(dataSetKey))
 
+    def test_alignment(self):
+        graph = {"nodes": [], "links": []}
+        for body in [b'{"nodes": [], "links": []}', b'"{\\"nodes\\": [], \\"links\\": []}"']:
+            self.response.status_code = 200
+            self.response.content = body
+            self.connection.get = Mock(return_value=self.response)
+
+            self.assertEqual(self.api.alignment(1), graph)
+            self.connection.get.assert_called_with(self.uri + "1/alignment")
+
+    def test_predict_stream(self):
+        response = Response()
+        response.status_code = 200
+        response.raw = BytesIO(b'{"predictions": [{"score": {"karmaRank": 1}}]}')
+        self.connection.post = Mock(return_value=response)
+
+        result = self.api.predict(1, 2, stream=True)
+
+        self.assertEqual(list(result), [{"score": {"karmaRank": 1}}])
+        self.connection.post.assert_called_with(self.uri + "1/predict/2", stream=True)
+
     def test_predict_with_connection_exception(self):
         self.connection.post = Mock(side_effect=Exception)
 
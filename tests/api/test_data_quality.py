@@ -0,0 +1,113 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the local data quality profiling
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from unittest2 import TestCase
+
+from serene.api.data_quality import DataProfiler, HyperLogLog, NumericSummary
+from ..synthetic import SyntheticGenerator
+
+
+class TestHyperLogLog(TestCase):
+    def test_count(self):
+        for n in [10, 1000, 50000]:
+            sketch = HyperLogLog()
+            sketch.add(np.arange(n).astype(str))
+            # repeats are not counted again...
+            sketch.add(np.arange(n // 2).astype(str))
+            self.assertLess(abs(sketch.count() - n), 0.03 * n + 1)
+
+    def test_merge(self):
+        a, b = HyperLogLog(p=10), HyperLogLog(p=10)
+        a.add(np.arange(0, 600).astype(str))
+        b.add(np.arange(400, 1000).astype(str))
+        self.assertLess(abs(a.merge(b).count() - 1000), 100)
+        self.assertRaises(ValueError, a.merge, HyperLogLog(p=12))
+        self.assertRaises(ValueError, HyperLogLog, p=2)
+
+
+class TestNumericSummary(TestCase):
+    def test_chunks(self):
+        values = np.random.RandomState(0).normal(10, 3, 1000)
+        summary = NumericSummary()
+        for chunk in np.array_split(values, 7):
+            summary.update(chunk)
+        # the same value twice, as a weight...
+        summary.update(np.array([values[0]]), np.array([2]))
+        expected = np.append(values, [values[0], values[0]])
+        self.assertEqual(summary.count, 1002)
+        self.assertAlmostEqual(summary.mean, np.mean(expected))
+        self.assertAlmostEqual(summary.std, np.std(expected, ddof=1))
+        self.assertEqual(summary.min, np.min(values))
+        self.assertEqual(summary.max, np.max(values))
+
+
+class TestDataProfiler(TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'id': ['1', '2', '3', ' 4 ', '5', '6'],
+            'price': ['1.5', '2', 'NA', '3.5', '', '-1e3'],
+            'flag': ['true', 'False', 'TRUE', 'false', None, 'false'],
+            'day': ['2017-01-02', '3/4/2017', '2017-05-06T10:00:00', None, 'null', '2017-07-08'],
+            'name': ['a', 'b', 'a', '7', 'c', 'a']
+        })
+
+    def test_type_map(self):
+        profile = DataProfiler(chunk_size=4).profile(self.df)
+        self.assertEqual(profile.rows, 6)
+        self.assertEqual(profile.type_map, {
+            'id': 'integer',
+            'price': 'float',
+            'flag': 'boolean',
+            'day': 'date',
+            'name': 'string'
+        })
+
+    def test_report(self):
+        report = DataProfiler(chunk_size=4).profile(self.df).report
+        self.assertEqual(list(report.index), list(self.df.columns))
+        self.assertEqual(report.loc['price', 'nulls'], 2)
+        self.assertAlmostEqual(report.loc['price', 'null_ratio'], 2 / 6)
+        self.assertEqual(report.loc['price', 'min'], -1000)
+        self.assertAlmostEqual(report.loc['price', 'mean'], (1.5 + 2 + 3.5 - 1000) / 4)
+        self.assertEqual(report.loc['id', 'max'], 6)
+        self.assertEqual(report.loc['name', 'distinct'], 4)
+        self.assertTrue(np.isnan(report.loc['name', 'mean']))
+
+    def test_tolerance(self):
+        # one in six names is a number...
+        self.df['name'] = ['1', '2', '3', '4', '5', 'x']
+        self.assertEqual(DataProfiler().profile(self.df).type_map['name'], 'string')
+        profile = DataProfiler(tolerance=0.2).profile(self.df)
+        self.assertEqual(profile.type_map['name'], 'integer')
+        self.assertAlmostEqual(profile.report.loc['name', 'valid_ratio'], 5 / 6)
+
+    def test_csv(self):
+        gen = SyntheticGenerator(num_classes=5, num_props=1, num_columns=5, num_rows=500)
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'data.csv')
+            gen.write_csv(0, filename)
+            profile = DataProfiler(chunk_size=64).profile(filename)
+            whole = DataProfiler().profile(gen.frame(0))
+
+        self.assertEqual(profile.rows, 500)
+        self.assertEqual(profile.type_map, whole.type_map)
+        self.assertEqual(sorted(profile.type_map.values()),
+                         sorted(["string", "integer", "float", "date", "boolean"]))
+        pd.testing.assert_frame_equal(profile.report, whole.report)
+
+    def test_empty(self):
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'empty.csv')
+            with open(filename, 'w') as f:
+                f.write('a,b\n')
+            profile = DataProfiler().profile(filename)
+        self.assertEqual(profile.rows, 0)
+        self.assertEqual(profile.type_map, {'a': 'string', 'b': 'string'})
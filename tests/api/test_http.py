@@ -0,0 +1,54 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the http module
+"""
+from mock import patch
+from requests import Session
+from unittest2 import TestCase
+
+from serene.api.http import PooledSession, IDEMPOTENT_METHODS, DEFAULT_TIMEOUT
+
+
+class TestPooledSession(TestCase):
+    def setUp(self):
+        self.session = PooledSession(pool_connections=4,
+                                     pool_maxsize=8,
+                                     max_retries=2,
+                                     backoff_factor=0.1,
+                                     timeout=5)
+
+    def test_adapters(self):
+        adapter = self.session.get_adapter("http://localhost/")
+        self.assertIs(adapter, self.session.get_adapter("https://localhost/"))
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertEqual(adapter.max_retries.backoff_factor, 0.1)
+
+    def test_retry_only_idempotent(self):
+        retry = self.session.get_adapter("http://localhost/").max_retries
+        self.assertTrue(retry._is_method_retryable("GET"))
+        self.assertTrue(retry._is_method_retryable("DELETE"))
+        self.assertFalse(retry._is_method_retryable("POST"))
+        self.assertNotIn("POST", IDEMPOTENT_METHODS)
+
+    @patch.object(Session, "request")
+    def test_default_timeout(self, request):
+        self.session.get("http://localhost/")
+        self.assertEqual(request.call_args[1]["timeout"], 5)
+
+    @patch.object(Session, "request")
+    def test_finite_timeout(self, request):
+        PooledSession().get("http://localhost/")
+        self.assertEqual(request.call_args[1]["timeout"], DEFAULT_TIMEOUT)
+        self.assertEqual(DEFAULT_TIMEOUT, (10, 300))
+
+    @patch.object(Session, "request")
+    def test_explicit_timeout(self, request):
+        self.session.get("http://localhost/", timeout=1)
+        self.assertEqual(request.call_args[1]["timeout"], 1)
+
+    def test_connection_stats(self):
+        self.assertEqual(self.session.connection_stats(),
+                         {"requests": 0, "connections": 0, "reused": 0})
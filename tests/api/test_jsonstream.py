@@ -0,0 +1,89 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the jsonstream module
+"""
+import io
+import json
+
+from mock import patch
+
+from requests import Response
+from unittest2 import TestCase
+
+from serene.api.jsonstream import JsonStream, iter_json_array
+
+
+def response(body):
+    r = Response()
+    r.status_code = 200
+    r.raw = io.BytesIO(body.encode('utf-8'))
+    return r
+
+
+class TestJsonStream(TestCase):
+    def test_values_across_chunks(self):
+        body = '{"a": 12345, "b": "été"}'.encode('utf-8')
+        # single byte chunks split the numbers and multi-byte characters...
+        stream = JsonStream(body[i:i + 1] for i in range(len(body)))
+        stream.take('{')
+        self.assertEqual(stream.value(), "a")
+        stream.take(':')
+        self.assertEqual(stream.value(), 12345)
+        stream.take(',')
+        self.assertEqual(stream.value(), "b")
+        stream.take(':')
+        self.assertEqual(stream.value(), "été")
+        stream.take('}')
+
+    def test_decoded_once(self):
+        value = {"nodes": [{"label": 'a "quoted" {[' + "\\" * i, "id": i} for i in range(200)]}
+        body = json.dumps([value, "x\\\"y", 7]).encode('utf-8')
+        for size in [1, 3, 64]:
+            stream = JsonStream(body[i:i + size] for i in range(0, len(body), size))
+            with patch.object(stream, '_decoder', wraps=json.JSONDecoder()) as decoder:
+                stream.take('[')
+                self.assertEqual(stream.value(), value)
+                self.assertEqual(decoder.raw_decode.call_count, 1)
+                stream.take(',')
+                self.assertEqual(stream.value(), 'x\\"y')
+                stream.take(',')
+                self.assertEqual(stream.value(), 7)
+                stream.take(']')
+
+    def test_unexpected_end(self):
+        stream = JsonStream([b'{"a": [1, '])
+        stream.take('{')
+        stream.value()
+        stream.take(':')
+        self.assertRaises(ValueError, stream.value)
+
+
+class TestIterJsonArray(TestCase):
+    def setUp(self):
+        self.predictions = [{"ssd": {"name": str(i)}, "score": {"karmaRank": i}} for i in range(5)]
+        self.body = json.dumps({
+            "dataSetId": 2,
+            "other": {"predictions": []},
+            "predictions": self.predictions
+        })
+
+    def test_elements(self):
+        r = response(self.body)
+        self.assertEqual(list(iter_json_array(r, "predictions", chunk_size=7)), self.predictions)
+
+    def test_empty(self):
+        r = response('{"predictions": []}')
+        self.assertEqual(list(iter_json_array(r, "predictions")), [])
+
+    def test_missing_key(self):
+        r = response('{"other": 1}')
+        self.assertEqual(list(iter_json_array(r, "predictions")), [])
+
+    def test_early_close(self):
+        r = response(self.body)
+        entries = iter_json_array(r, "predictions", chunk_size=16)
+        self.assertEqual(next(entries), self.predictions[0])
+        entries.close()
+        self.assertTrue(r.raw.closed)
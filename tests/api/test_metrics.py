@@ -0,0 +1,105 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the metrics module
+"""
+from mock import Mock, patch
+from requests import Request, Response
+from requests.adapters import HTTPAdapter
+from unittest2 import TestCase
+
+from serene.api.http import PooledSession
+from serene.api.metrics import HistogramExporter, RequestRecord, endpoint_template
+
+
+def record(method="GET", endpoint="/v1.0/dataset/{id}", status=200, duration=0.02, error=None):
+    return RequestRecord(method=method,
+                         endpoint=endpoint,
+                         url="http://localhost" + endpoint,
+                         status=status,
+                         duration=duration,
+                         bytes_out=10,
+                         bytes_in=100,
+                         error=error)
+
+
+class TestEndpointTemplate(TestCase):
+    def test_keys_replaced(self):
+        self.assertEqual(endpoint_template("http://localhost:8080/v1.0/dataset/1234"),
+                         "/v1.0/dataset/{id}")
+        self.assertEqual(endpoint_template("http://localhost:8080/v1.0/model/12/predict/-7"),
+                         "/v1.0/model/{id}/predict/{id}")
+        self.assertEqual(endpoint_template("http://localhost:8080/v1.0/owl/"),
+                         "/v1.0/owl/")
+
+
+class TestHistogramExporter(TestCase):
+    def setUp(self):
+        self.exporter = HistogramExporter(buckets=[0.01, 0.1])
+
+    def test_aggregate(self):
+        self.exporter(record(duration=0.005))
+        self.exporter(record(duration=0.05))
+        self.exporter(record(duration=0.5, status=404))
+        self.exporter(record(method="POST", duration=0.001, status=None, error="ConnectionError"))
+
+        self.assertEqual(self.exporter.histogram("GET", "/v1.0/dataset/{id}"),
+                         [(0.01, 1), (0.1, 1), (float('inf'), 1)])
+
+        summary = self.exporter.summary()
+        self.assertEqual(summary['method'].tolist(), ["GET", "POST"])
+        self.assertEqual(summary['count'].tolist(), [3, 1])
+        self.assertEqual(summary['errors'].tolist(), [1, 1])
+        self.assertEqual(summary['bytes_in'].tolist(), [300, 100])
+
+    def test_reset(self):
+        self.exporter(record())
+        self.exporter.reset()
+        self.assertEqual(len(self.exporter.summary()), 0)
+
+
+class TestSessionInstrumentation(TestCase):
+    def setUp(self):
+        self.session = PooledSession(max_retries=0)
+        self.response = Response()
+        self.response.status_code = 200
+        self.response._content = b"[1, 2]"
+
+    def test_hooks_called(self):
+        pre = Mock()
+        post = Mock()
+        self.session.metrics.add_pre_hook(pre)
+        self.session.metrics.add_hook(post)
+
+        with patch.object(HTTPAdapter, "send", return_value=self.response):
+            self.session.send(self._prepare("POST", "http://localhost/v1.0/ssd/5", data="abc"))
+
+        self.assertEqual(pre.call_count, 1)
+        rec = post.call_args[0][0]
+        self.assertEqual(rec.method, "POST")
+        self.assertEqual(rec.endpoint, "/v1.0/ssd/{id}")
+        self.assertEqual(rec.status, 200)
+        self.assertEqual(rec.bytes_out, 3)
+        self.assertEqual(rec.bytes_in, 6)
+        self.assertIsNone(rec.error)
+
+    def test_error_recorded(self):
+        post = self.session.metrics.add_hook(Mock())
+
+        with patch.object(HTTPAdapter, "send", side_effect=IOError):
+            self.assertRaises(IOError, self.session.send,
+                              self._prepare("GET", "http://localhost/v1.0/ssd/"))
+
+        rec = post.call_args[0][0]
+        self.assertIsNone(rec.status)
+        self.assertEqual(rec.error, "OSError")
+
+    def test_failing_hook_ignored(self):
+        self.session.metrics.add_hook(Mock(side_effect=ValueError))
+        with patch.object(HTTPAdapter, "send", return_value=self.response):
+            r = self.session.send(self._prepare("GET", "http://localhost/v1.0/ssd/"))
+        self.assertIs(r, self.response)
+
+    def _prepare(self, method, url, data=None):
+        return self.session.prepare_request(Request(method, url, data=data))
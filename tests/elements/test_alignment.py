@@ -0,0 +1,64 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the alignment module
+"""
+import unittest2 as unittest
+
+from serene.elements.alignment import AlignmentGraph
+
+
+KARMA_GRAPH = {
+    "nodes": [
+        {"id": "http://ns#Person1", "type": "InternalNode", "label": {"uri": "http://ns#Person"}},
+        {"id": "http://ns#City1", "type": "InternalNode", "label": {"uri": "http://ns#City"}},
+        {"id": "HN1", "type": "ColumnNode", "label": {"uri": ""}},
+        {"id": "HN2", "type": "ColumnNode", "label": {"uri": ""}}
+    ],
+    "links": [
+        {"id": "http://ns#City1---http://ns#name---HN2", "type": "DataPropertyLink", "weight": 1.0},
+        {"id": "http://ns#Person1---http://ns#livesIn---http://ns#City1", "type": "ObjectPropertyLink",
+         "weight": 0.5},
+        {"id": "http://ns#Person1---http://ns#name---HN1", "type": "DataPropertyLink", "weight": 1.0}
+    ]
+}
+
+
+class TestAlignmentGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = AlignmentGraph.from_karma(KARMA_GRAPH)
+
+    def test_csr(self):
+        self.assertEqual(self.graph.num_nodes, 4)
+        self.assertEqual(self.graph.num_links, 3)
+        self.assertEqual(self.graph.indptr.tolist(), [0, 2, 3, 3, 3])
+        # the server order is kept for the links of a node...
+        self.assertEqual(self.graph.successors(0).tolist(), [1, 2])
+        self.assertEqual(self.graph.out_degree().tolist(), [2, 1, 0, 0])
+        self.assertEqual(self.graph.in_degree().tolist(), [0, 1, 1, 1])
+        self.assertEqual(self.graph.class_nodes().tolist(), [0, 1])
+
+    def test_data_node_labels(self):
+        self.assertEqual(self.graph.node_data(2), {
+            "type": "DataNode",
+            "label": "Person---name",
+            "lab": "Person1---name",
+            "prefix": "http://ns#"
+        })
+        self.assertEqual(self.graph.node_data(3)["label"], "City---name")
+
+    def test_interned(self):
+        self.assertIs(self.graph.node_prefix[0], self.graph.link_prefix[0])
+
+    def test_to_networkx(self):
+        g = self.graph.to_networkx()
+        self.assertEqual(g.number_of_nodes(), 4)
+        self.assertEqual(g.number_of_edges(), 3)
+        data = list(g.get_edge_data(0, 1).values())[0]
+        self.assertEqual(data, {
+            "type": "ObjectPropertyLink",
+            "weight": 0.5,
+            "label": "livesIn",
+            "prefix": "http://ns#"
+        })
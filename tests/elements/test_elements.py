@@ -8,6 +8,30 @@ from serene.elements.elements import (Class, ClassInstanceLink,
                                       ObjectPropertyList, SSDLink)
 
 
+class TestColumn(unittest.TestCase):
+    def test_hash_after_update(self):
+        column = Column("name")
+        hash(column)
+        column.update({
+            "index": 0,
+            "path": "test.csv",
+            "name": "name",
+            "id": 12,
+            "size": 4,
+            "datasetID": 3,
+            "sample": [],
+            "logicalType": "string"
+        }, None)
+
+        self.assertEqual(hash(column), hash(("name", 12, 3)))
+
+    def test_slots(self):
+        def assign():
+            Column("name").unknown = 1
+
+        self.assertRaises(AttributeError, assign)
+
+
 class TestMapping(unittest.TestCase):
     def setUp(self):
         self.data_property = DataProperty("cores")
@@ -360,6 +384,14 @@ class TestSSDLink(unittest.TestCase):
             hash(self.link),
             hash((self.label, str(self.prefix))))
 
+    def test_hash_after_prefix_change(self):
+        link = SSDLink(self.label, None)
+        hash(link)
+        link.prefix = self.prefix
+
+        self.assertEqual(hash(link), hash(self.link))
+        self.assertEqual(link, self.link)
+
 
 class TestDataLink(unittest.TestCase):
     def setUp(self):
@@ -7,9 +7,12 @@ Tests the octopus module
 import json
 import datetime
 import os
+import threading
 import unittest2 as unittest
+from mock import DEFAULT, Mock, patch
 
-from serene.elements import Column
+from serene.elements import Column, DataSet
+from serene.elements import octopus
 from serene import Octopus, Ontology, DataNode, ClassNode, ModelState, SamplingStrategy, ModelType, Status
 from ..utils import TestWithServer
 
@@ -364,4 +367,116 @@ class TestOctopus(TestWithServer):
     #
     #     print(server_octo.get_alignment())
     #
-    #     self.fail()
\ No newline at end of file
+    #     self.fail()
+
+class TestOctopusPredict(unittest.TestCase):
+    """
+    Tests the lazy Octopus prediction results
+    """
+    @staticmethod
+    def score(rank):
+        return {
+            "sizeReduction": 0.5,
+            "nodeConfidence": 0.9,
+            "nodeCoherence": 1.0,
+            "linkCoherence": 1.0,
+            "linkCost": 2.0,
+            "karmaScore": 1.0 / rank,
+            "karmaRank": rank,
+            "nodeCoverage": 1.0
+        }
+
+    def setUp(self):
+        self.octo = Octopus()
+        self.octo._id = 1
+        self.octo._session = Mock()
+        self.octo._session.octopus_api.predict.return_value = {
+            "predictions": [{"ssd": {"name": str(i)}, "score": self.score(i)} for i in range(1, 4)]
+        }
+        self.dataset = DataSet({
+            "id": 2,
+            "filename": "test.csv",
+            "path": "test.csv",
+            "typeMap": {},
+            "description": "",
+            "columns": [],
+            "dateCreated": "2017-03-16T15:29:03.388",
+            "dateModified": "2017-03-16T15:29:03.388"
+        })
+
+    @patch.object(octopus, "SSD")
+    def test_lazy_decode(self, ssd):
+        results = self.octo.predict(self.dataset)
+
+        self.assertEqual([s.karmaRank for s in results.scores], [1, 2, 3])
+        self.assertFalse(any(r.decoded for r in results))
+        ssd.assert_not_called()
+
+        best = results[0].ssd
+        self.assertIs(best, results[0].ssd)
+        self.assertEqual(ssd.return_value.update.call_count, 1)
+        self.assertEqual(ssd.return_value.update.call_args[0][0], {"name": "1"})
+
+    @patch.object(octopus, "SSD")
+    def test_top_k(self, ssd):
+        results = self.octo.predict(self.dataset, top_k=2)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(results.top(1)), 1)
+        self.assertEqual(results[1:][0].score.karmaRank, 2)
+
+    @patch.object(octopus, "SSD")
+    def test_stream_closed(self, ssd):
+        entries = Mock()
+        entries.__iter__ = Mock(return_value=iter(
+            self.octo._session.octopus_api.predict.return_value["predictions"]))
+        self.octo._session.octopus_api.predict.return_value = entries
+
+        results = self.octo.predict(self.dataset, top_k=1, stream=True)
+
+        self.assertEqual(len(results), 1)
+        self.octo._session.octopus_api.predict.assert_called_with(1, 2, stream=True)
+        entries.close.assert_called_with()
+
+    @patch.object(octopus, "SSD")
+    def test_predict_many(self, ssd):
+        blob = self.octo._session.octopus_api.predict.return_value
+
+        def predict(key, dataset_key):
+            if dataset_key == 13:
+                raise ValueError("bad dataset")
+            return blob
+        self.octo._session.octopus_api.predict.side_effect = predict
+
+        # the decodes run in the worker threads, where the mock call count is not reliable...
+        lock = threading.Lock()
+        updates = []
+
+        def update(*args, **kwargs):
+            with lock:
+                updates.append(args)
+            return DEFAULT
+        ssd.return_value.update.side_effect = update
+
+        batch = self.octo.predict_many([self.dataset, 13, 14], max_workers=2, decode_top=1)
+
+        self.assertEqual(list(batch.keys()), [2, 14])
+        self.assertEqual(batch.failed, [13])
+        self.assertIsInstance(batch.errors[13], ValueError)
+        self.assertTrue(batch[2][0].decoded)
+        self.assertFalse(batch[2][1].decoded)
+        self.assertEqual(len(updates), 2)
+
+    def test_alignment_cached(self):
+        self.octo._date_modified = datetime.datetime(2017, 3, 16)
+        self.octo._session.octopus_api.alignment.return_value = {"nodes": [], "links": []}
+
+        graph = self.octo.get_alignment(compact=True)
+        self.assertIs(graph, self.octo.get_alignment(compact=True))
+        self.assertEqual(self.octo.get_alignment().number_of_nodes(), 0)
+        self.assertEqual(self.octo._session.octopus_api.alignment.call_count, 1)
+
+        # a newer octopus is fetched again...
+        self.octo._date_modified = datetime.datetime(2017, 3, 17)
+        self.assertIsNot(graph, self.octo.get_alignment(compact=True))
+        self.assertEqual(self.octo._session.octopus_api.alignment.call_count, 2)
@@ -4,10 +4,14 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 Tests the core module
 """
+import concurrent.futures
 import sys
+import threading
+import time
 from io import StringIO
 
 import unittest2 as unittest
+from mock import patch
 
 from serene.elements import DataSet, DataSetList, Column
 
@@ -176,6 +180,49 @@ class TestDataSet(unittest.TestCase):
             repr(self.dataset),
             "DataSet(2035625835, businessInfo.csv)")
 
+    def test_lazy_columns(self):
+        self.assertIsNone(self.dataset._columns)
+        self.assertEqual(len(self.dataset), 2)
+        self.assertEqual(self.dataset.num_rows, 59)
+        self.assertSequenceEqual(self.dataset.column_ids(), [1246005714, 281689915])
+        self.assertSequenceEqual(self.dataset.column_names(), ["company", "ceo"])
+        self.assertIsNone(self.dataset._columns)
+
+        columns = self.dataset.columns
+        self.assertIs(columns, self.dataset.columns)
+        self.assertIs(columns[0].dataset, self.dataset)
+
+    def test_concurrent_columns(self):
+        started = threading.Event()
+        update = Column.update
+
+        def slow_update(column, json, dataset):
+            started.set()
+            time.sleep(0.05)
+            return update(column, json, dataset)
+
+        with patch.object(Column, 'update', slow_update):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+                first = pool.submit(lambda: self.dataset.columns)
+                started.wait()
+                # the other threads wait for the columns, or read the json...
+                columns = [pool.submit(lambda: self.dataset.columns) for _ in range(2)]
+                names = pool.submit(self.dataset.column_names)
+
+        for f in columns:
+            self.assertIs(f.result(), first.result())
+        self.assertSequenceEqual(names.result(), ["company", "ceo"])
+        self.assertEqual(self.dataset.num_rows, 59)
+
+    def test_lazy_sample(self):
+        self.assertIsNone(self.dataset._sample)
+        self.assertSequenceEqual(list(self.dataset.sample["ceo"]), ["Garv Mcowen"])
+        self.assertIs(self.dataset.sample, self.dataset.sample)
+
+    def test_lazy_dates(self):
+        self.assertIsNone(self.dataset._date_created)
+        self.assertEqual(self.dataset.date_created.year, 2017)
+
 
 class TestDataSetList(unittest.TestCase):
     """
@@ -352,6 +399,9 @@ class TestDataSetList(unittest.TestCase):
         :return:
         """
         self.assertEqual(self.datasetList.summary.shape[0], 2)
+        self.assertSequenceEqual(list(self.datasetList.summary['cols']), [2, 2])
+        # the summary does not need the column objects
+        self.assertIsNone(self.dataset1._columns)
 
 
 class TestColumn(unittest.TestCase):
@@ -4,7 +4,12 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 Tests the core module
 """
+import pandas as pd
 import unittest2 as unittest
+from mock import Mock
+
+from serene.elements.elements import Column
+from serene.matcher.model import Model
 
 
 class TestModel(unittest.TestCase):
@@ -15,6 +20,83 @@ class TestModel(unittest.TestCase):
         raise NotImplementedError("Test not implemented")
 
 
+def model_json(labels=None):
+    return {
+        "description": "",
+        "id": 1,
+        "modelType": "randomForest",
+        "classes": ["name", "city", "unknown"],
+        "features": {},
+        "costMatrix": [],
+        "resamplingStrategy": "ResampleToMean",
+        "labelData": dict(labels or {}),
+        "refDataSets": [],
+        "state": {"status": "untrained", "message": "", "dateChanged": "2017-03-16T15:29:03.388"},
+        "dateCreated": "2017-03-16T15:29:03.388",
+        "dateModified": "2017-03-16T15:29:03.388",
+        "numBags": 50,
+        "bagSize": 100
+    }
+
+
+class TestModelLabels(unittest.TestCase):
+    """
+    Tests the bulk labelling of the Model
+    """
+    def setUp(self):
+        self.columns = []
+        datasets = []
+        for ds in range(10):
+            columns = []
+            for i in range(500):
+                col = Column("col{}".format(i))
+                col.id = ds * 1000 + i
+                col.datasetID = ds
+                columns.append(col)
+            datasets.append(Mock(columns=columns))
+            self.columns.extend(columns)
+
+        self.session = Mock()
+        self.session.model_api.update.side_effect = lambda key, labels: model_json(labels)
+        self.model = Model(model_json({"3": "city"}), self.session, Mock(items=datasets))
+
+    def test_dict(self):
+        table = {col: "name" for col in self.columns}
+        table[7] = "city"
+        self.model._columns = Mock(wraps=self.model._columns)
+        labels = self.model.add_labels(table)
+        # one column index for all the keys, and one for the labels frame...
+        self.assertEqual(self.model._columns.call_count, 2)
+
+        self.assertEqual(len(labels), 5000)
+        self.assertEqual(self.model.label_data["7"], "city")
+        self.assertEqual(self.model.label_data["9499"], "name")
+        row = labels[labels.column_id == 9499].iloc[0]
+        self.assertEqual((row.column_name, row.dataset_id, row.user_label), ("col499", 9, "name"))
+
+    def test_series_and_frame(self):
+        self.model.add_labels(pd.Series(["name", "city"], index=[1001, 1002]))
+        self.assertEqual(self.model.label_data, {"3": "city", "1001": "name", "1002": "city"})
+
+        frame = pd.DataFrame({"column_id": [5, 6], "user_label": ["name", "name"]})
+        labels = self.model.add_labels(frame)
+        self.assertEqual(list(labels.columns), ["user_label", "column_name", "dataset_id", "column_id"])
+        self.assertEqual(list(labels.column_id), [3, 1001, 1002, 5, 6])
+
+        # the labels of another model...
+        other = Model(model_json(), self.session, Mock(items=[]))
+        other._column_table = self.model._column_table
+        other.classes = self.model.classes
+        self.assertEqual(other.add_labels(labels).shape, (5, 4))
+        self.assertRaises(ValueError, self.model.add_labels, pd.DataFrame({"column_id": [5]}))
+
+    def test_invalid(self):
+        self.assertRaises(AssertionError, self.model.add_labels, {123456: "name"})
+        self.assertRaises(AssertionError, self.model.add_labels, {"x": "name"})
+        self.assertRaises(AssertionError, self.model.add_labels, {5: "street"})
+        self.assertEqual(self.model.label_data, {"3": "city"})
+
+
 class TestModelList(unittest.TestCase):
     """
     Tests the ModelList class
@@ -0,0 +1,76 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the prediction module
+"""
+import numpy as np
+import pandas as pd
+import unittest2 as unittest
+
+from serene.matcher.prediction import Prediction
+from serene.matcher.eval import get_sorted_label_candidates
+
+
+class TestPrediction(unittest.TestCase):
+    """
+    Tests the Prediction class
+    """
+    def setUp(self):
+        self.json = {
+            "dataSetID": 7,
+            "modelID": 3,
+            "predictions": {
+                "20": {
+                    "label": "name",
+                    "confidence": 0.6,
+                    "scores": {"name": 0.6, "city": 0.3, "unknown": 0.1},
+                    "features": {"num-unique-vals": 4, "inferred-data-type": "string"}
+                },
+                "10": {
+                    "label": "city",
+                    "confidence": 0.7,
+                    "scores": {"name": 0.2, "city": 0.7, "unknown": 0.1},
+                    "features": {"num-unique-vals": 2, "inferred-data-type": "string"}
+                }
+            }
+        }
+        self.prediction = Prediction.from_json(
+            self.json,
+            column_names={10: "town", 20: "person"},
+            user_labels={10: "city"})
+
+    def test_from_json(self):
+        p = self.prediction
+        self.assertEqual(len(p), 2)
+        self.assertEqual(p.scores.dtype, np.float32)
+        self.assertEqual(p.scores.shape, (2, 3))
+        self.assertEqual(list(p.classes), ["name", "city", "unknown"])
+        self.assertEqual(list(p.feature_names), ["num-unique-vals"])
+        self.assertEqual(list(p.extra_features["inferred-data-type"]), ["string", "string"])
+        self.assertEqual(list(p.column_names), ["person", "town"])
+
+    def test_top_k(self):
+        top = self.prediction.top_k(2)
+        self.assertEqual(top.tolist(), [["name", "city"], ["city", "name"]])
+
+    def test_sorted_label_candidates(self):
+        candidates = self.prediction.sorted_label_candidates()
+        self.assertEqual(candidates, [["city", "name", "unknown"], ["name", "city", "unknown"]])
+
+    def test_to_df(self):
+        df = self.prediction.to_df(scores=True, features=True)
+        self.assertIn("scores_city", df.columns)
+        self.assertIn("features_num-unique-vals", df.columns)
+        self.assertIn("features_inferred-data-type", df.columns)
+        self.assertEqual(df["user_label"].tolist()[1], "city")
+        self.assertTrue(pd.isnull(df["user_label"].tolist()[0]))
+        # the conversion is cached...
+        self.assertIs(df, self.prediction.to_df(scores=True, features=True))
+
+    def test_eval_candidates_match(self):
+        """The DataFrame and compact paths should give the same candidates"""
+        df = self.prediction.to_df()
+        self.assertEqual(
+            get_sorted_label_candidates(df),
+            get_sorted_label_candidates(self.prediction))
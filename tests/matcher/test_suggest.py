@@ -0,0 +1,83 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the local label suggestions
+"""
+import unittest2 as unittest
+from mock import Mock
+
+from serene.elements.elements import Column
+from serene.matcher.suggest import LabelSuggester, MinHasher, normalize, ngrams
+
+
+def column(key, name, sample):
+    col = Column(name)
+    col.id = key
+    col.sample = sample
+    return col
+
+
+class TestMinHash(unittest.TestCase):
+    def test_normalize(self):
+        for name in ['birthDate', 'BIRTH_DATE', ' Birth-date ', 'birth  date']:
+            self.assertEqual(normalize(name), 'birth date')
+
+    def test_similarity(self):
+        hasher = MinHasher(num_perm=128)
+        a = hasher.signature(ngrams('postal code'))
+        self.assertTrue((a == hasher.signature(ngrams('postal code'))).all())
+        close = (a == hasher.signature(ngrams('postal codes'))).mean()
+        far = (a == hasher.signature(ngrams('salary'))).mean()
+        self.assertGreater(close, 0.6)
+        self.assertLess(far, 0.2)
+        self.assertIsNone(hasher.signature(set()))
+
+
+class TestLabelSuggester(unittest.TestCase):
+    def setUp(self):
+        self.suggester = LabelSuggester().add_many(
+            ['birthDate', 'postcode', 'postal_code', 'name', 'city'],
+            ['birthDate', 'postalCode', 'postalCode', 'name', 'city'],
+            [['1970-01-02', '1980-03-04'], ['2000', '2600'], None, ['Ann', 'Bob'], ['Sydney', 'Perth']]
+        )
+
+    def test_suggest(self):
+        self.assertEqual(self.suggester.suggest('BIRTH_DATE')[0], ('birthDate', 1.0))
+        label, score = self.suggester.suggest('Postal Codes')[0]
+        self.assertEqual(label, 'postalCode')
+        self.assertLess(score, 1.0)
+        self.assertEqual(self.suggester.suggest('salary'), [])
+        self.assertEqual(len(self.suggester), 5)
+        self.assertEqual(self.suggester.labels, ['birthDate', 'city', 'name', 'postalCode'])
+
+    def test_values(self):
+        # an unknown header with the values of a labelled column...
+        found = self.suggester.suggest('town', values=['Perth', 'sydney', None])
+        self.assertEqual(found[0], ('city', 0.5))
+        # the same header with other values scores less...
+        label, score = self.suggester.suggest('name', values=['x', 'y'])[0]
+        self.assertEqual(label, 'name')
+        self.assertLess(score, 1.0)
+
+    def test_prelabel(self):
+        columns = [column(1, 'Birth date', ['1990-01-01']),
+                   column(2, 'CITY', ['Sydney', 'Perth']),
+                   column(3, 'misc', ['a'])]
+        self.assertEqual(self.suggester.prelabel(columns, threshold=0.7), {columns[1]: 'city'})
+        frame = self.suggester.suggest_many(columns)
+        self.assertEqual(list(frame.columns), ['column_id', 'column_name', 'label', 'score'])
+        self.assertEqual(list(frame.label), ['birthDate', 'city'])
+
+    def test_from_model(self):
+        model = Mock(label_data={'1': 'birthDate', '2': 'city', '9': 'name'},
+                     _column_lookup={1: column(1, 'dob', ['1970-01-02']),
+                                     2: column(2, 'town', ['Perth'])})
+        suggester = LabelSuggester.from_model(model)
+        self.assertEqual(len(suggester), 2)
+        self.assertEqual(suggester.suggest('Town')[0], ('city', 1.0))
+        self.assertEqual(LabelSuggester.from_octopus(Mock(matcher=model)).labels, ['birthDate', 'city'])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, LabelSuggester, num_perm=64, bands=10)
+        self.assertEqual(LabelSuggester().suggest('name'), [])
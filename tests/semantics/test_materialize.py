@@ -0,0 +1,88 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the materialization of datasets as RDF
+"""
+import io
+import tempfile
+
+import rdflib
+import unittest2 as unittest
+
+from serene import Serene
+from serene.elements import SSD
+from serene.elements.semantics.materialize import RDFMaterializer
+from ..standin import StandInServer
+from ..synthetic import SyntheticGenerator, SYNTHETIC_NS
+
+
+class TestMaterialize(unittest.TestCase):
+    def setUp(self):
+        # 6 columns on the classes 0..2, linked in a chain
+        self.gen = SyntheticGenerator(num_classes=6, num_props=2, num_columns=6, num_rows=25)
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.corpus = self.gen.write(self._tempdir.name)
+        self.server = StandInServer(seed=0).start()
+        self.sn = Serene(self.server.host, self.server.port, None, None, False)
+
+        dataset = self.sn.datasets.upload(self.corpus.datasets[0])
+        ontology = self.sn.ontologies.upload(self.corpus.ontology)
+        self.ssd = SSD(dataset, [ontology], name='test')
+        for column, _, node in self.gen.map_rows(0):
+            self.ssd.map(column, node)
+        for _, src, link, dst in self.gen.link_rows(0):
+            self.ssd.link(src, link, dst)
+
+    def tearDown(self):
+        self.server.stop()
+        self._tempdir.cleanup()
+
+    def materialize(self, source, **kwargs):
+        out = io.StringIO()
+        count = self.ssd.materialize(source, out, **kwargs)
+        fmt = 'turtle' if kwargs.get('fmt') == 'ttl' else 'nt'
+        return count, rdflib.Graph().parse(data=out.getvalue(), format=fmt)
+
+    def test_ntriples(self):
+        count, g = self.materialize(self.corpus.datasets[0], chunk_size=10)
+        # each row has 3 class instances, 6 values and 2 links
+        self.assertEqual(count, 25 * (3 + 6 + 2))
+        self.assertEqual(len(g), count)
+
+        person = rdflib.URIRef("http://au.csiro.data61/serene/dev#test/Class0/3")
+        self.assertIn((person, rdflib.RDF.type, rdflib.URIRef(SYNTHETIC_NS + "Class0")), g)
+        value = g.value(person, rdflib.URIRef(SYNTHETIC_NS + "prop0_1"))
+        self.assertEqual(value.datatype, rdflib.XSD.integer)
+        self.assertEqual(str(value), str(self.gen.frame(0).iloc[3, 3]))
+
+    def test_turtle(self):
+        _, nt = self.materialize(self.corpus.datasets[0])
+        count, ttl = self.materialize(self.corpus.datasets[0], fmt='ttl', chunk_size=7)
+        self.assertEqual(set(ttl), set(nt))
+
+    def test_processes(self):
+        m = RDFMaterializer(self.ssd)
+        serial = io.StringIO()
+        parallel = io.StringIO()
+        m.write(self.corpus.datasets[0], serial, chunk_size=4)
+        m.write(self.corpus.datasets[0], parallel, chunk_size=4, processes=2)
+        self.assertEqual(serial.getvalue(), parallel.getvalue())
+
+    def test_dataframe(self):
+        df = self.gen.frame(0)
+        df.iloc[0, 0] = 'say "hi"\nthere'
+        df.iloc[1, 0] = None
+        count, g = self.materialize(df, base="http://example.com/", chunk_size=10)
+        self.assertEqual(count, 25 * (3 + 6 + 2) - 1)
+
+        prop = rdflib.URIRef(SYNTHETIC_NS + "prop0_0")
+        row0 = rdflib.URIRef("http://example.com/test/Class0/0")
+        row1 = rdflib.URIRef("http://example.com/test/Class0/1")
+        self.assertEqual(str(g.value(row0, prop)), 'say "hi"\nthere')
+        self.assertIsNone(g.value(row1, prop))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, RDFMaterializer, self.ssd, fmt='xml')
+        df = self.gen.frame(0).drop(self.gen.source(0).columns[0], axis=1)
+        self.assertRaises(ValueError, self.materialize, df)
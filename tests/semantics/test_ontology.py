@@ -4,11 +4,18 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 Tests the core module
 """
-import unittest2 as unittest
+import concurrent.futures
 import os
+import tempfile
+import threading
+import time
+
+import unittest2 as unittest
+from mock import Mock, patch
 
 import serene
 from serene.elements import Class, DataProperty
+from serene.elements.semantics.ontology import LazyOntology, RDFReader, read_graph_state
 
 
 class TestOntology(unittest.TestCase):
@@ -211,3 +218,83 @@ class TestOntology(unittest.TestCase):
 
     def test_ilinks(self):
         raise NotImplementedError("Test not implemented")
+
+
+class TestLazyOntology(unittest.TestCase):
+    """
+    Tests the LazyOntology class
+    """
+    def setUp(self):
+        path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "resources")
+        self._test_owl = os.path.join(path, 'owl', 'dataintegration_report_ontology.ttl')
+        self.json = {
+            "id": 7,
+            "name": "report.ttl",
+            "description": "",
+            "dateCreated": "2017-03-16T15:29:03.388",
+            "dateModified": "2017-03-16T15:29:03.388"
+        }
+        self.loader = Mock(return_value=self._test_owl)
+        self.ontology = LazyOntology(self.json, self.loader)
+
+    def test_metadata_only(self):
+        self.assertEqual(repr(self.ontology), "Ontology(7, report.ttl)")
+        self.assertTrue(self.ontology.stored)
+        self.assertFalse(self.ontology.loaded)
+        self.loader.assert_not_called()
+
+    def test_load_on_access(self):
+        expected = serene.Ontology(self._test_owl)
+
+        self.assertEqual(len(self.ontology.class_nodes), len(expected.class_nodes))
+        self.assertEqual(self.ontology.namespace, expected.namespace)
+        self.assertTrue(self.ontology.loaded)
+        self.assertTrue(self.ontology.stored)
+
+        self.ontology.links
+        self.assertEqual(self.loader.call_count, 1)
+
+    def test_concurrent_load(self):
+        started = threading.Event()
+        to_ontology = RDFReader.to_ontology
+
+        def slow_parse(reader, path, ontology):
+            started.set()
+            time.sleep(0.1)
+            return to_ontology(reader, path, ontology)
+
+        with patch.object(RDFReader, 'to_ontology', slow_parse):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as pool:
+                first = pool.submit(lambda: len(self.ontology.class_nodes))
+                started.wait()
+                # the other threads wait for the whole graph...
+                counts = [pool.submit(lambda: len(self.ontology.class_nodes)) for _ in range(3)]
+                namespace = pool.submit(lambda: self.ontology.namespace)
+
+        expected = serene.Ontology(self._test_owl)
+        self.assertEqual([f.result() for f in [first] + counts], [len(expected.class_nodes)] * 4)
+        self.assertEqual(namespace.result(), expected.namespace)
+        self.assertEqual(self.loader.call_count, 1)
+
+    def test_failed_load(self):
+        path = os.path.join(tempfile.mkdtemp(), "broken.ttl")
+        with open(path, "w") as f:
+            f.write("@prefix : <http://broken.org#> .\n:a :b")
+        ontology = LazyOntology(self.json, Mock(return_value=path))
+
+        self.assertRaises(Exception, ontology.load)
+        self.assertFalse(ontology.loaded)
+        self.assertNotIn('_prefixes', ontology.__dict__)
+
+        # and loads once the file is fixed...
+        ontology.source_file = None
+        ontology._loader.return_value = self._test_owl
+        self.assertTrue(ontology.load().loaded)
+
+    def test_set_state(self):
+        state = read_graph_state(self._test_owl)
+        self.ontology.set_state(state)
+
+        self.assertTrue(self.ontology.loaded)
+        self.assertEqual(len(self.ontology.links), len(state['_links']))
+        self.loader.assert_not_called()
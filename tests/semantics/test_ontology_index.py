@@ -0,0 +1,126 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the merged ontology index
+"""
+from mock import Mock
+import unittest2 as unittest
+
+import serene
+from serene.elements import Class, ObjectProperty
+from serene.elements.semantics.ssd import SSD
+from serene.elements.semantics.ontology_index import OntologyIndex, ontology_index
+from serene.elements.semantics.ontology_index import FOUND, MISSING, AMBIGUOUS
+
+
+def stored(onto, key, date='2017-03-16T15:29:03.388', server='http://localhost:8080/v1.0/owl/'):
+    """Marks a local ontology as stored on the server"""
+    return onto.update({
+        'name': 'onto{}.ttl'.format(key),
+        'description': '',
+        'dateCreated': date,
+        'dateModified': date,
+        'id': key
+    }, server)
+
+
+class TestOntologyIndex(unittest.TestCase):
+    def setUp(self):
+        self.people = (serene.Ontology()
+                       .uri("http://people.org")
+                       .owl_class("Person", ["name", "birthDate"])
+                       .owl_class("Employee", ["salary"], is_a="Person")
+                       .owl_class("Place", ["name"])
+                       .link("Person", "bornIn", "Place"))
+        self.orgs = (serene.Ontology()
+                     .uri("http://orgs.org")
+                     .owl_class("Person", ["name"])
+                     .owl_class("Organization", ["title"])
+                     .link("Person", "worksFor", "Organization"))
+        self.index = OntologyIndex([self.people, self.orgs])
+
+    def test_class(self):
+        self.assertTrue(self.index.class_exists("Employee"))
+        self.assertTrue(self.index.class_exists("Organization", "http://orgs.org#"))
+        self.assertEqual(self.index.class_status("Car"), MISSING)
+
+    def test_data(self):
+        self.assertTrue(self.index.data_exists("Place", "name"))
+        # inherited from the parent class...
+        self.assertTrue(self.index.data_exists("Employee", "birthDate"))
+        self.assertEqual(self.index.data_status("Place", "birthDate"), MISSING)
+        self.assertEqual(self.index.data_status("Person", "height"), MISSING)
+
+    def test_data_prefix(self):
+        # the same class in another namespace, without the data property...
+        other = (serene.Ontology()
+                 .uri("http://other.org")
+                 .owl_class("Person", ["height"]))
+        index = OntologyIndex([self.people, self.orgs, other])
+        self.assertTrue(index.data_exists("Person", "birthDate", "http://people.org"))
+        self.assertEqual(index.data_status("Person", "birthDate", "http://other.org"), MISSING)
+        self.assertTrue(index.data_exists("Person", "height", "http://other.org"))
+        self.assertTrue(index.data_exists("Person", "birthDate"))
+        # an unknown namespace is not checked...
+        self.assertTrue(index.data_exists("Person", "birthDate", "http://unknown.org#"))
+
+    def test_link(self):
+        self.assertTrue(self.index.link_exists("Person", "bornIn", "Place"))
+        # the links of the parent class join the subclasses too...
+        self.assertTrue(self.index.link_exists("Employee", "bornIn", "Place"))
+        # in the second ontology...
+        self.assertTrue(self.index.link_exists("Person", "worksFor", "Organization"))
+
+    def test_ambiguous(self):
+        a, b, c = Class("A"), Class("B"), Class("C")
+        # the same link in two namespaces...
+        other = Mock(class_nodes=[a, b, c], links=[
+            ObjectProperty("rel", a, b, prefix="http://other.org#"),
+            ObjectProperty("rel", a, b, prefix="http://more.org#"),
+            ObjectProperty("rel", b, c, prefix="http://other.org#")
+        ])
+        index = OntologyIndex([other])
+        self.assertEqual(index.link_status("A", "rel", "B"), AMBIGUOUS)
+        self.assertEqual(index.link_status("B", "rel", "C"), FOUND)
+        self.assertEqual(index.link_status("C", "rel", "A"), MISSING)
+
+    def test_cache(self):
+        ontologies = [stored(self.people, 1), stored(self.orgs, 2)]
+        index = ontology_index(ontologies)
+        self.assertIs(ontology_index(ontologies), index)
+        self.assertIsNot(ontology_index(ontologies[:1]), index)
+
+        # a new version on the server...
+        stored(self.orgs, 2, date='2017-04-16T15:29:03.388')
+        self.assertIsNot(ontology_index(ontologies), index)
+        index = ontology_index(ontologies)
+
+        # the same ids and dates on another server...
+        other = [stored(serene.Ontology(), 1, server='http://prod:8080/v1.0/owl/'),
+                 stored(serene.Ontology(), 2, date='2017-04-16T15:29:03.388', server='http://prod:8080/v1.0/owl/')]
+        self.assertIsNot(ontology_index(other), index)
+        self.assertFalse(ontology_index(other).class_exists("Person"))
+        self.assertIs(ontology_index(ontologies), index)
+
+        # local changes are not cached...
+        self.people.owl_class("Car")
+        self.assertIsNot(ontology_index(ontologies), ontology_index(ontologies))
+        self.assertTrue(ontology_index(ontologies).class_exists("Car"))
+
+    def test_ssd_index(self):
+        ssd = SSD(ontology=[stored(self.people, 1)])
+        index = ssd._index
+        self.assertIs(ssd._index, index)
+
+        # local changes are kept by the SSD...
+        self.people.owl_class("Car")
+        local = ssd._index
+        self.assertIsNot(local, index)
+        self.assertIs(ssd._index, local)
+        self.assertTrue(local.class_exists("Car"))
+
+        # ...until the ontologies change
+        ssd._ontology = [stored(self.orgs, 2)]
+        self.assertTrue(ssd._index.class_exists("Organization"))
+        self.assertFalse(ssd._index.class_exists("Car"))
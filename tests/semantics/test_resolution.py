@@ -0,0 +1,91 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the SSD resolution context
+"""
+from mock import Mock, PropertyMock
+import unittest2 as unittest
+
+from serene.elements import DataSet
+from serene.elements.semantics.ssd import ResolutionContext
+
+
+def dataset_json(key, column_ids):
+    return {
+        'dateCreated': '2017-03-16T15:29:03.388',
+        'dateModified': '2017-03-16T15:29:03.388',
+        'description': '',
+        'filename': 'data{}.csv'.format(key),
+        'id': key,
+        'path': 'data{}.csv'.format(key),
+        'typeMap': {},
+        'columns': [
+            {
+                'datasetID': key,
+                'id': c,
+                'index': i,
+                'logicalType': 'string',
+                'name': 'col{}'.format(c),
+                'path': 'data{}.csv'.format(key),
+                'sample': ['a'],
+                'size': 1
+            } for i, c in enumerate(column_ids)
+        ]
+    }
+
+
+class TestResolutionContext(unittest.TestCase):
+    def setUp(self):
+        self.datasets = (DataSet(dataset_json(1, [10, 11])),
+                         DataSet(dataset_json(2, [20, 21, 22])))
+        self.ontologies = (Mock(id=5), Mock(id=6))
+
+        self.ds_endpoint = Mock()
+        self.ds_items = PropertyMock(return_value=self.datasets)
+        type(self.ds_endpoint).items = self.ds_items
+
+        self.on_endpoint = Mock()
+        self.on_items = PropertyMock(return_value=self.ontologies)
+        type(self.on_endpoint).items = self.on_items
+
+        self.context = ResolutionContext(self.ds_endpoint, self.on_endpoint)
+
+    def test_column(self):
+        column = self.context.column(21)
+        self.assertEqual(column.name, "col21")
+        self.assertIs(column.dataset, self.datasets[1])
+        self.assertIs(self.context.column_dataset(21), self.datasets[1])
+        # only the dataset holding the column is expanded...
+        self.assertIsNone(self.datasets[0]._columns)
+
+    def test_missing_column(self):
+        self.assertRaisesRegex(Exception, ".*does not appear.*", self.context.column, 99)
+
+    def test_lookups_built_once(self):
+        for key in [10, 11, 20, 21, 22, 10]:
+            self.context.column(key)
+        self.assertIs(self.context.dataset(1), self.datasets[0])
+        self.assertIs(self.context.ontology(6), self.ontologies[1])
+        self.assertIs(self.context.ontology(5), self.ontologies[0])
+
+        self.assertEqual(self.ds_items.call_count, 1)
+        self.assertEqual(self.on_items.call_count, 1)
+        self.ds_endpoint.get.assert_not_called()
+        self.on_endpoint.get.assert_not_called()
+
+    def test_same_column_objects(self):
+        self.assertIs(self.context.column(10), self.context.column(10))
+
+    def test_added_objects(self):
+        extra = DataSet(dataset_json(3, [30]))
+        self.context.add(datasets=[extra], ontologies=[Mock(id=8)])
+        self.assertIs(self.context.column_dataset(30), extra)
+        self.assertEqual(self.context.ontology(8).id, 8)
+        self.ds_items.assert_not_called()
+        self.on_items.assert_not_called()
+
+        # other keys still fall back to the server items...
+        self.assertIs(self.context.column_dataset(20), self.datasets[1])
+        self.assertIs(self.context.column_dataset(30), extra)
+        self.assertEqual(self.ds_items.call_count, 1)
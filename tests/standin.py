@@ -0,0 +1,740 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+A lightweight, in-process stand-in for the Serene server. It serves the
+dataset, model, owl, ssd, octopus and evaluate routes used by the *API
+classes from memory, with an optional artificial latency and canned
+training and prediction results. This allows the client overhead,
+caching and concurrency to be measured without the JVM backend.
+
+    with StandInServer(latency=0.005) as server:
+        sn = serene.Serene(server.host, server.port)
+        ...
+"""
+import collections
+import csv
+import email.parser
+import hashlib
+import io
+import itertools
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+VERSION = "v1.0"
+
+# the resources stored by the server...
+RESOURCES = ('dataset', 'model', 'owl', 'ssd', 'octopus')
+
+# the modeling properties the server fills in for a new octopus
+DEFAULT_MODELING_PROPS = {
+    "compatibleProperties": True,
+    "ontologyAlignment": False,
+    "addOntologyPaths": False,
+    "mappingBranchingFactor": 50,
+    "numCandidateMappings": 10,
+    "topkSteinerTrees": 10,
+    "multipleSameProperty": False,
+    "confidenceWeight": 1.0,
+    "coherenceWeight": 1.0,
+    "sizeWeight": 0.5,
+    "numSemanticTypes": 4,
+    "thingNode": False,
+    "nodeClosure": True,
+    "propertiesDirect": True,
+    "propertiesIndirect": True,
+    "propertiesSubclass": True,
+    "propertiesWithOnlyDomain": True,
+    "propertiesWithOnlyRange": True,
+    "propertiesWithoutDomainRange": False,
+    "unknownThreshold": 0.05
+}
+
+
+class StandInError(Exception):
+    """An error returned to the client as {"message": ...}"""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _now():
+    """Server timestamp in the format of the Serene server"""
+    return datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+
+
+def _logical_type(values):
+    """Infers the column type from the non-empty values"""
+    values = [v for v in values if v != '']
+    if not len(values):
+        return "string"
+    for name, func in [("integer", int), ("float", float)]:
+        try:
+            for v in values:
+                func(v)
+            return name
+        except ValueError:
+            pass
+    if all(v.lower() in ('true', 'false') for v in values):
+        return "boolean"
+    return "string"
+
+
+class StandInStore(object):
+    """
+    The in-memory state of the stand-in server. Every request handler
+    calls into the store under a single lock, so the state is safe to
+    share between the server threads.
+
+    The canned behaviour is:
+
+        training: the model (or octopus) is 'busy' for `train_time`
+                  seconds after the train request, then 'complete'.
+        model prediction: each column gets its user label if it has
+                  one, otherwise a class picked from the hash of the
+                  column name. The scores put the `confidence` on
+                  that class and share the rest between the others.
+        octopus prediction: `num_candidates` SSDs for the dataset,
+                  re-using the semantic model of the training SSDs
+                  with the dataset columns mapped in order.
+        evaluate: precision, recall and jaccard of the mapped
+                  (column, data node) pairs of the two SSDs.
+    """
+    def __init__(self, train_time=0.0, confidence=0.8, num_candidates=3, seed=None):
+        """
+        :param train_time: The seconds a model stays busy after a train request
+        :param confidence: The confidence of the canned model predictions
+        :param num_candidates: The number of SSDs returned by an octopus prediction
+        :param seed: Seed for the generated ids
+        """
+        self.train_time = train_time
+        self.confidence = confidence
+        self.num_candidates = num_candidates
+
+        self._lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._data = {r: collections.OrderedDict() for r in RESOURCES}
+        self._files = {}         # owl id -> bytes
+        self._rows = {}          # dataset id -> list of csv rows
+        self._trained = {}       # (resource, id) -> time the training completes
+        self._column_ids = set()
+
+    def _new_id(self, resource):
+        """A new random id, unique for the resource"""
+        while True:
+            key = self._random.randint(1, 2 ** 31 - 1)
+            if key not in self._data[resource]:
+                return key
+
+    def _new_column_id(self):
+        """A new random column id, large like those of the server so
+        they do not collide with the node ids of the SSD json"""
+        while True:
+            key = self._random.randint(1, 2 ** 31 - 1)
+            if key not in self._column_ids:
+                self._column_ids.add(key)
+                return key
+
+    def _get(self, resource, key):
+        """The stored json of an item, or a 404"""
+        try:
+            return self._data[resource][key]
+        except KeyError:
+            raise StandInError(404, "{} {} not found".format(resource, key))
+
+    def _state(self, resource, key):
+        """The current training state json of a model or octopus"""
+        item = self._get(resource, key)
+        done = self._trained.get((resource, key))
+        if done is not None and item['state']['status'] == 'busy' and time.time() >= done:
+            item['state'] = {"status": "complete", "message": "", "dateChanged": _now()}
+        return item
+
+    # generic handlers
+
+    def keys(self, resource):
+        with self._lock:
+            return list(self._data[resource].keys())
+
+    def item(self, resource, key):
+        with self._lock:
+            if resource in ('model', 'octopus'):
+                return self._state(resource, key)
+            return self._get(resource, key)
+
+    def delete(self, resource, key):
+        with self._lock:
+            item = self._get(resource, key)
+            if resource == 'model' and any(o['lobsterID'] == key for o in self._data['octopus'].values()):
+                raise StandInError(400, "model {} belongs to an octopus".format(key))
+            del self._data[resource][key]
+            if resource == 'owl':
+                del self._files[key]
+            elif resource == 'dataset':
+                del self._rows[key]
+            elif resource == 'octopus':
+                # the octopus owns its model...
+                self._data['model'].pop(item['lobsterID'], None)
+            return key
+
+    # datasets
+
+    def post_dataset(self, form, files):
+        if 'file' not in files:
+            raise StandInError(400, "No file in the dataset request")
+        filename, content = files['file']
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8'))))
+        if not len(rows):
+            raise StandInError(400, "Empty dataset file")
+        header, body = rows[0], rows[1:]
+
+        with self._lock:
+            key = self._new_id('dataset')
+            columns = []
+            for i, name in enumerate(header):
+                values = [r[i] if i < len(r) else '' for r in body]
+                columns.append({
+                    "id": self._new_column_id(),
+                    "index": i,
+                    "path": filename,
+                    "name": name,
+                    "datasetID": key,
+                    "sample": values[:15],
+                    "logicalType": _logical_type(values[:100]),
+                    "size": len(values)
+                })
+            now = _now()
+            self._data['dataset'][key] = {
+                "id": key,
+                "columns": columns,
+                "filename": filename,
+                "path": filename,
+                "typeMap": self._type_map(form),
+                "description": form.get('description', ''),
+                "dateCreated": now,
+                "dateModified": now
+            }
+            self._rows[key] = body
+            return self._data['dataset'][key]
+
+    @staticmethod
+    def _type_map(form):
+        """The type map form field, if it is readable json"""
+        try:
+            type_map = json.loads(form.get('typeMap', '{}'))
+        except ValueError:
+            return {}
+        return type_map if isinstance(type_map, dict) else {}
+
+    def update_dataset(self, key, form):
+        with self._lock:
+            item = self._get('dataset', key)
+            if 'description' in form:
+                item['description'] = form['description']
+            if 'typeMap' in form:
+                item['typeMap'] = self._type_map(form)
+            item['dateModified'] = _now()
+            return item
+
+    # ontologies
+
+    def post_owl(self, form, files, key=None):
+        with self._lock:
+            if key is None:
+                if 'file' not in files:
+                    raise StandInError(400, "No file in the ontology request")
+                key = self._new_id('owl')
+                item = {"id": key, "dateCreated": _now()}
+            else:
+                item = self._get('owl', key)
+            if 'file' in files:
+                item['name'], self._files[key] = files['file']
+            item['description'] = form.get('description', item.get('description', ''))
+            item['format'] = form.get('format', item.get('format', 'ttl'))
+            item['dateModified'] = _now()
+            self._data['owl'][key] = item
+            return item
+
+    def owl_file(self, key):
+        with self._lock:
+            self._get('owl', key)
+            return self._files[key]
+
+    # ssds
+
+    def post_ssd(self, blob, key=None):
+        with self._lock:
+            for c in self._attributes(blob):
+                if not any(c in self._columns(ds) for ds in self._data['dataset'].values()):
+                    raise StandInError(400, "Column {} does not exist".format(c))
+            if key is None:
+                key = self._new_id('ssd')
+                created = _now()
+            else:
+                created = self._get('ssd', key)['dateCreated']
+            item = dict(blob)
+            item.update({"id": key, "dateCreated": created, "dateModified": _now()})
+            self._data['ssd'][key] = item
+            return item
+
+    @staticmethod
+    def _attributes(blob):
+        return [m['attribute'] for m in blob.get('mappings', [])]
+
+    @staticmethod
+    def _columns(dataset):
+        return {c['id'] for c in dataset['columns']}
+
+    @staticmethod
+    def _labels(blob):
+        """The column id -> data node label map of an ssd"""
+        nodes = {n['id']: n for n in blob['semanticModel']['nodes']}
+        return {m['attribute']: nodes[m['node']]['label']
+                for m in blob.get('mappings', []) if m['node'] in nodes}
+
+    # models
+
+    def _model(self, data, key, now):
+        """Fills in the server side fields of a model"""
+        state = {"status": "untrained", "message": "", "dateChanged": now}
+        model = {
+            "description": "",
+            "classes": ["unknown"],
+            "modelType": "randomForest",
+            "labelData": {},
+            "costMatrix": [],
+            "resamplingStrategy": "ResampleToMean",
+            "features": {},
+            "numBags": 50,
+            "bagSize": 100
+        }
+        model.update(data)
+        model.update({
+            "id": key,
+            "refDataSets": self._ref_datasets(model['labelData']),
+            "modelPath": "",
+            "state": state,
+            "dateCreated": now,
+            "dateModified": now
+        })
+        return model
+
+    def _ref_datasets(self, labels):
+        """The datasets of the labelled columns"""
+        refs = set()
+        for ds in self._data['dataset'].values():
+            if self._columns(ds) & {int(k) for k in labels}:
+                refs.add(ds['id'])
+        return sorted(refs)
+
+    def post_model(self, data, key=None):
+        with self._lock:
+            now = _now()
+            if key is None:
+                key = self._new_id('model')
+                model = self._model(data, key, now)
+            else:
+                model = self._get('model', key)
+                model.update(data)
+                model['refDataSets'] = self._ref_datasets(model['labelData'])
+                model['state'] = {"status": "untrained", "message": "", "dateChanged": now}
+                model['dateModified'] = now
+            self._data['model'][key] = model
+            return model
+
+    def train(self, resource, key):
+        with self._lock:
+            item = self._get(resource, key)
+            now = _now()
+            item['state'] = {"status": "busy", "message": "", "dateChanged": now}
+            self._trained[(resource, key)] = time.time() + self.train_time
+            if resource == 'octopus':
+                self._trained[('model', item['lobsterID'])] = time.time() + self.train_time
+                self._data['model'][item['lobsterID']]['state'] = dict(item['state'])
+            return True
+
+    def _check_trained(self, resource, key):
+        if self._state(resource, key)['state']['status'] != 'complete':
+            raise StandInError(400, "{} {} is not trained".format(resource, key))
+
+    def predict_model(self, key, dataset_key):
+        with self._lock:
+            self._check_trained('model', key)
+            model = self._get('model', key)
+            dataset = self._get('dataset', dataset_key)
+
+            classes = model['classes']
+            labels = model['labelData']
+            predictions = {}
+            for column in dataset['columns']:
+                name = column['name']
+                label = labels.get(str(column['id']))
+                if label is None:
+                    digest = hashlib.md5(name.encode('utf-8')).hexdigest()
+                    label = classes[int(digest, 16) % len(classes)]
+                rest = (1.0 - self.confidence) / max(len(classes) - 1, 1)
+                predictions[str(column['id'])] = {
+                    "label": label,
+                    "confidence": self.confidence,
+                    "scores": {c: self.confidence if c == label else rest for c in classes},
+                    "features": {
+                        "num-unique-vals": len(set(column['sample'])),
+                        "inferred-data-type": column['logicalType']
+                    }
+                }
+            return {"dataSetID": dataset_key, "modelID": key, "predictions": predictions}
+
+    # octopii
+
+    def post_octopus(self, data, key=None):
+        with self._lock:
+            ssds = [self._get('ssd', s) for s in data.get('ssds') or []]
+            for o in data.get('ontologies') or []:
+                self._get('owl', o)
+
+            labels = {}
+            for ssd in ssds:
+                labels.update({str(k): v for k, v in self._labels(ssd).items()})
+            classes = sorted(set(labels.values()) | {"unknown"})
+
+            model = {k: data[k] for k in ('modelType', 'resamplingStrategy', 'features', 'numBags', 'bagSize')
+                     if data.get(k) is not None}
+            model.update({"classes": classes, "labelData": labels})
+
+            now = _now()
+            if key is None:
+                key = self._new_id('octopus')
+                lobster = self.post_model(model)
+                octopus = {
+                    "id": key,
+                    "lobsterID": lobster['id'],
+                    "name": "",
+                    "description": "",
+                    "ssds": [],
+                    "ontologies": [],
+                    "modelingProps": dict(DEFAULT_MODELING_PROPS),
+                    "semanticTypeMap": {},
+                    "dateCreated": now
+                }
+            else:
+                octopus = self._get('octopus', key)
+                self.post_model(model, octopus['lobsterID'])
+            octopus.update({k: data[k] for k in ('name', 'description', 'ssds', 'ontologies')
+                            if data.get(k) is not None})
+            octopus['modelingProps'].update(data.get('modelingProps') or {})
+            octopus['state'] = {"status": "untrained", "message": "", "dateChanged": now}
+            octopus['dateModified'] = now
+            self._data['octopus'][key] = octopus
+            return octopus
+
+    def predict_octopus(self, key, dataset_key):
+        with self._lock:
+            self._check_trained('octopus', key)
+            octopus = self._get('octopus', key)
+            dataset = self._get('dataset', dataset_key)
+            ssds = [self._data['ssd'][s] for s in octopus['ssds'] if s in self._data['ssd']]
+            columns = [c['id'] for c in dataset['columns']]
+
+            predictions = []
+            for rank, ssd in enumerate(itertools.islice(itertools.cycle(ssds), self.num_candidates)):
+                nodes = [m['node'] for m in ssd['mappings']]
+                mappings = [{"attribute": c, "node": n} for c, n in zip(columns, nodes)]
+                candidate = {
+                    "name": dataset['filename'],
+                    "ontologies": octopus['ontologies'],
+                    "semanticModel": ssd['semanticModel'],
+                    "mappings": mappings,
+                    "attributes": []
+                }
+                score = 1.0 / (rank + 1)
+                predictions.append({
+                    "ssd": candidate,
+                    "score": {
+                        "sizeReduction": score,
+                        "nodeConfidence": score,
+                        "nodeCoherence": score,
+                        "linkCoherence": score,
+                        "linkCost": rank,
+                        "karmaScore": score,
+                        "karmaRank": rank,
+                        "nodeCoverage": len(mappings) / max(len(columns), 1)
+                    }
+                })
+            return {"dataSetId": dataset_key, "predictions": predictions}
+
+    def alignment(self, key):
+        """The union of the semantic models of the octopus ssds, in the Karma graph format"""
+        with self._lock:
+            octopus = self._get('octopus', key)
+            nodes = collections.OrderedDict()
+            links = collections.OrderedDict()
+            columns = itertools.count(1)
+            for s in octopus['ssds']:
+                model = self._data['ssd'][s]['semanticModel'] if s in self._data['ssd'] else None
+                if model is None:
+                    continue
+                ids = {}
+                for node in model['nodes']:
+                    if node['type'] == 'ClassNode':
+                        uri = node.get('prefix', '') + node['label']
+                        ids[node['id']] = uri + "1"
+                        nodes[uri + "1"] = {"id": uri + "1", "type": "InternalNode", "label": {"uri": uri}}
+                    else:
+                        ids[node['id']] = "HN{}".format(next(columns))
+                        nodes[ids[node['id']]] = {"id": ids[node['id']], "type": "ColumnNode", "label": {"uri": ""}}
+                for link in model['links']:
+                    kind = "ObjectPropertyLink" if link['type'] == "ObjectPropertyLink" else "DataPropertyLink"
+                    name = "---".join([ids[link['source']], link.get('prefix', '') + link['label'],
+                                       ids[link['target']]])
+                    links[name] = {"id": name, "type": kind, "weight": 1.0}
+            return {"nodes": list(nodes.values()), "links": list(links.values())}
+
+    def evaluate(self, blob):
+        with self._lock:
+            predicted = set(self._labels(blob['predictedSsd']).items())
+            correct = set(self._labels(blob['correctSsd']).items())
+            common = len(predicted & correct)
+            union = len(predicted | correct)
+            return {
+                "precision": common / len(predicted) if predicted else 0.0,
+                "recall": common / len(correct) if correct else 0.0,
+                "jaccard": common / union if union else 0.0
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes the requests to the StandInStore of the server"""
+    protocol_version = "HTTP/1.1"
+    # the headers and body are separate writes, so the delayed acks
+    # of keep-alive connections would add ~40ms to each response
+    disable_nagle_algorithm = True
+
+    ROUTES = [
+        ("GET", r"/", "version"),
+        ("GET", r"/{v}/?", "root"),
+        ("GET", r"/{v}/(?P<resource>\w+)/?", "keys"),
+        ("POST", r"/{v}/(?P<resource>\w+)/?", "create"),
+        ("GET", r"/{v}/(?P<resource>\w+)/(?P<key>\d+)", "item"),
+        ("POST", r"/{v}/(?P<resource>\w+)/(?P<key>\d+)", "update"),
+        ("DELETE", r"/{v}/(?P<resource>\w+)/(?P<key>\d+)", "delete"),
+        ("GET", r"/{v}/owl/(?P<key>\d+)/file", "owl_file"),
+        ("POST", r"/{v}/(?P<resource>model|octopus)/(?P<key>\d+)/train", "train"),
+        ("POST", r"/{v}/(?P<resource>model|octopus)/(?P<key>\d+)/predict/(?P<dataset>\d+)", "predict"),
+        ("GET", r"/{v}/octopus/(?P<key>\d+)/alignment", "alignment"),
+        ("POST", r"/{v}/evaluate", "evaluate"),
+    ]
+    _routes = [(method, re.compile(pattern.format(v=VERSION) + "$"), name)
+               for method, pattern, name in ROUTES]
+
+    def log_message(self, format, *args):
+        """Silence the per request logging"""
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        self._body = self.rfile.read(length) if length else b''
+        self.server.wait()
+
+        path = urlparse(self.path).path
+        try:
+            for m, pattern, name in self._routes:
+                match = pattern.match(path)
+                if m == method and match:
+                    args = match.groupdict()
+                    if 'resource' in args and args['resource'] not in RESOURCES:
+                        continue
+                    for k in ('key', 'dataset'):
+                        if k in args:
+                            args[k] = int(args[k])
+                    result = getattr(self, "route_" + name)(**args)
+                    break
+            else:
+                raise StandInError(404, "No route for {} {}".format(method, path))
+        except StandInError as e:
+            return self._send(e.status, {"message": e.message})
+        except Exception as e:
+            return self._send(500, {"message": "{}: {}".format(type(e).__name__, e)})
+
+        if isinstance(result, bytes):
+            return self._send(200, result, "application/octet-stream")
+        return self._send(200, result)
+
+    def _send(self, status, body, content_type="application/json"):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self):
+        try:
+            return json.loads(self._body.decode('utf-8'))
+        except ValueError:
+            raise StandInError(400, "Failed to decode the json request")
+
+    def _form(self):
+        """The form fields and files of a multipart or urlencoded request"""
+        content_type = self.headers.get('Content-Type', '')
+        fields = {}
+        files = {}
+        if content_type.startswith('multipart/form-data'):
+            head = "Content-Type: {}\r\n\r\n".format(content_type).encode('utf-8')
+            message = email.parser.BytesParser().parsebytes(head + self._body)
+            for part in message.get_payload():
+                name = part.get_param('name', header='content-disposition')
+                content = part.get_payload(decode=True)
+                filename = part.get_filename()
+                if filename is not None:
+                    files[name] = (filename, content)
+                else:
+                    fields[name] = content.decode('utf-8')
+        elif self._body:
+            fields = {k: v[-1] for k, v in parse_qs(self._body.decode('utf-8')).items()}
+        return fields, files
+
+    # routes
+
+    def route_version(self):
+        return {"version": VERSION}
+
+    def route_root(self):
+        return {"version": VERSION}
+
+    def route_keys(self, resource):
+        return self.server.store.keys(resource)
+
+    def route_item(self, resource, key):
+        return self.server.store.item(resource, key)
+
+    def route_delete(self, resource, key):
+        return self.server.store.delete(resource, key)
+
+    def route_create(self, resource):
+        store = self.server.store
+        if resource == 'dataset':
+            return store.post_dataset(*self._form())
+        if resource == 'owl':
+            return store.post_owl(*self._form())
+        if resource == 'ssd':
+            return store.post_ssd(self._json())
+        if resource == 'model':
+            return store.post_model(self._json())
+        return store.post_octopus(self._json())
+
+    def route_update(self, resource, key):
+        store = self.server.store
+        if resource == 'dataset':
+            return store.update_dataset(key, self._form()[0])
+        if resource == 'owl':
+            return store.post_owl(*self._form(), key=key)
+        if resource == 'ssd':
+            return store.post_ssd(self._json(), key)
+        if resource == 'model':
+            return store.post_model(self._json(), key)
+        return store.post_octopus(self._json(), key)
+
+    def route_owl_file(self, key):
+        return self.server.store.owl_file(key)
+
+    def route_train(self, resource, key):
+        return self.server.store.train(resource, key)
+
+    def route_predict(self, resource, key, dataset):
+        if resource == 'model':
+            return self.server.store.predict_model(key, dataset)
+        return self.server.store.predict_octopus(key, dataset)
+
+    def route_alignment(self, key):
+        return self.server.store.alignment(key)
+
+    def route_evaluate(self):
+        return self.server.store.evaluate(self._json())
+
+
+class _ThreadedServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StandInServer(object):
+    """
+    Runs the stand-in server on a background thread. Each request is
+    delayed by `latency` seconds (plus a uniform random `jitter`) to
+    simulate the round-trip to a remote server.
+    """
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, seed=None, **kwargs):
+        """
+        :param host: The address to listen on
+        :param port: The port, 0 picks a free port
+        :param latency: The delay added to every request (seconds)
+        :param jitter: The maximum random delay added on top of latency (seconds)
+        :param seed: Seed for the jitter and the generated ids
+        :param kwargs: The canned behaviour options of StandInStore
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.store = StandInStore(seed=seed, **kwargs)
+
+        self._random = random.Random(seed)
+        self._server = _ThreadedServer((host, port), _Handler)
+        self._server.store = self.store
+        self._server.wait = self._wait
+        self._thread = None
+
+    def _wait(self):
+        """Applies the artificial latency to a request"""
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def uri(self):
+        return "http://{}:{}/{}/".format(self.host, self.port, VERSION)
+
+    def start(self):
+        """Starts serving on a daemon thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and closes the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
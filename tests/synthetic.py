@@ -0,0 +1,332 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Generator of synthetic, mutually consistent ontologies, datasets, SSDs
+and labels, for testing the client at well beyond the sizes of the
+bundled resources.
+
+    gen = SyntheticGenerator(num_classes=500, num_props=4, depth=3,
+                             num_datasets=50, num_columns=40, num_rows=100000)
+    corpus = gen.write('/tmp/corpus')
+    sn.load(corpus.ontology, corpus.datasets, corpus.map_file, corpus.link_file)
+    specs = load_specs_from_dir(os.path.dirname(corpus.labels_file))
+
+The ontology has the classes Class0..ClassN-1. Each class has the data
+properties prop<i>_0..prop<i>_<M-1> and an object property rel<i> to
+the next class. The subclass chains are up to `depth` classes long.
+Dataset k maps its columns onto a window of consecutive classes, which
+are linked in a chain by the rel<i> properties.
+"""
+import collections
+import csv
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+SYNTHETIC_NS = "http://www.semanticweb.org/serene/synthetic_ontology#"
+
+# the xsd ranges of the data properties, in turn
+XSD_TYPES = ("string", "integer", "double", "dateTime", "boolean")
+
+WORDS = np.array([
+    "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+    "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa"
+], dtype=object)
+
+# the files written by SyntheticGenerator.write
+SyntheticCorpus = collections.namedtuple(
+    'SyntheticCorpus', 'path ontology datasets ssds map_file link_file labels_file'
+)
+
+# the columns of a dataset and the classes, data properties and links they map to
+SyntheticSource = collections.namedtuple('SyntheticSource', 'name columns mappings links')
+
+
+class SyntheticGenerator(object):
+    """
+    Builds a synthetic corpus. All the output is determined by the
+    parameters and the seed.
+    """
+    def __init__(self,
+                 num_classes=10,
+                 num_props=2,
+                 depth=1,
+                 num_datasets=1,
+                 num_columns=10,
+                 num_rows=100,
+                 namespace=SYNTHETIC_NS,
+                 seed=0):
+        """
+        :param num_classes: The number of classes in the ontology
+        :param num_props: The number of data properties of each class
+        :param depth: The maximum length of the subclass chains, 1 for no subclasses
+        :param num_datasets: The number of datasets
+        :param num_columns: The number of columns of each dataset
+        :param num_rows: The number of rows of each dataset
+        :param namespace: The namespace of the ontology
+        :param seed: The seed of the dataset values
+        """
+        if num_classes < 1 or num_props < 1 or depth < 1:
+            raise ValueError("The ontology needs at least 1 class, property and level")
+        if num_columns > num_classes * num_props:
+            msg = "{} columns need more than {} classes with {} properties"
+            raise ValueError(msg.format(num_columns, num_classes, num_props))
+
+        self.num_classes = num_classes
+        self.num_props = num_props
+        self.depth = depth
+        self.num_datasets = num_datasets
+        self.num_columns = num_columns
+        self.num_rows = num_rows
+        self.namespace = namespace
+        self.seed = seed
+
+    # ontology
+
+    @staticmethod
+    def class_name(i):
+        return "Class{}".format(i)
+
+    @staticmethod
+    def prop_name(i, j):
+        return "prop{}_{}".format(i, j)
+
+    @staticmethod
+    def link_name(i):
+        return "rel{}".format(i)
+
+    def parent(self, i):
+        """The index of the superclass of class i, or None"""
+        return i - 1 if i % self.depth else None
+
+    def prop_type(self, i, j):
+        """The xsd range of data property j of class i"""
+        return XSD_TYPES[(i + j) % len(XSD_TYPES)]
+
+    def ontology_turtle(self):
+        """The ontology as turtle text"""
+        lines = [
+            "@prefix : <{}> .".format(self.namespace),
+            "@prefix owl: <http://www.w3.org/2002/07/owl#> .",
+            "@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .",
+            "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .",
+            "@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .",
+            "",
+            "<{}> rdf:type owl:Ontology .".format(self.namespace.rstrip('#/')),
+            ""
+        ]
+        for i in range(self.num_classes):
+            name = self.class_name(i)
+            parent = self.parent(i)
+            if parent is None:
+                lines.append(":{} rdf:type owl:Class .".format(name))
+            else:
+                lines.append(":{} rdf:type owl:Class ; rdfs:subClassOf :{} .".format(
+                    name, self.class_name(parent)))
+            for j in range(self.num_props):
+                lines.append(":{} rdf:type owl:DatatypeProperty ; rdfs:domain :{} ; rdfs:range xsd:{} .".format(
+                    self.prop_name(i, j), name, self.prop_type(i, j)))
+            if i + 1 < self.num_classes:
+                lines.append(":{} rdf:type owl:ObjectProperty ; rdfs:domain :{} ; rdfs:range :{} .".format(
+                    self.link_name(i), name, self.class_name(i + 1)))
+        return "\n".join(lines) + "\n"
+
+    # datasets
+
+    def source(self, k):
+        """
+        The columns of dataset k and what they map to. The columns take
+        the data properties of consecutive classes, starting at a class
+        that depends on k, and the classes are linked in a chain.
+
+        :return: SyntheticSource
+        """
+        num_used = int(math.ceil(self.num_columns / self.num_props))
+        start = (k * num_used) % (self.num_classes - num_used + 1)
+
+        columns = []
+        mappings = []
+        for c in range(self.num_columns):
+            i = start + c % num_used
+            j = c // num_used
+            columns.append("{}_col{}".format(self.prop_name(i, j), c))
+            mappings.append((i, j))
+
+        links = [(i, i + 1) for i in range(start, start + num_used - 1)]
+        return SyntheticSource("synthetic{}.csv".format(k), columns, mappings, links)
+
+    def _values(self, rng, xsd, n):
+        """n random csv values of an xsd type"""
+        if xsd == "integer":
+            return rng.randint(0, 10 ** 6, n)
+        if xsd == "double":
+            return np.round(rng.rand(n) * 1000, 3)
+        if xsd == "dateTime":
+            seconds = rng.randint(0, 50 * 365 * 86400, n).astype('timedelta64[s]')
+            return np.datetime_as_string(np.datetime64('1970-01-01T00:00:00') + seconds)
+        if xsd == "boolean":
+            return np.where(rng.rand(n) < 0.5, "true", "false")
+        return WORDS[rng.randint(0, len(WORDS), n)] + "-" + rng.randint(0, 1000, n).astype(str).astype(object)
+
+    def frames(self, k, chunk_size=100000):
+        """
+        The rows of dataset k, as DataFrames of up to chunk_size rows.
+        The values depend on the seed and the chunk size.
+
+        :return: Generator of DataFrames
+        """
+        src = self.source(k)
+        rng = np.random.RandomState([self.seed, k])
+        for start in range(0, self.num_rows, chunk_size):
+            n = min(chunk_size, self.num_rows - start)
+            data = collections.OrderedDict(
+                (name, self._values(rng, self.prop_type(i, j), n))
+                for name, (i, j) in zip(src.columns, src.mappings)
+            )
+            yield pd.DataFrame(data, columns=src.columns)
+
+    def frame(self, k):
+        """All the rows of dataset k as a DataFrame"""
+        return pd.concat(list(self.frames(k)) or [pd.DataFrame(columns=self.source(k).columns)],
+                         ignore_index=True)
+
+    def write_csv(self, k, filename, chunk_size=100000):
+        """Writes dataset k to a csv file, chunk by chunk"""
+        with open(filename, 'w', newline='') as f:
+            header = True
+            for df in self.frames(k, chunk_size):
+                df.to_csv(f, index=False, header=header)
+                header = False
+            if header:
+                csv.writer(f).writerow(self.source(k).columns)
+
+    # semantic source descriptions
+
+    def ssd_json(self, k):
+        """
+        The SSD of dataset k, in the file format read by DataSet.bind_ssd
+        (attributes bound to the columns by name, no namespaces).
+
+        :return: json dict
+        """
+        src = self.source(k)
+        nodes = []
+        links = []
+        class_ids = {}
+        mappings = []
+
+        def add_class(i):
+            if i not in class_ids:
+                class_ids[i] = len(nodes)
+                nodes.append({"id": len(nodes), "label": self.class_name(i), "type": "ClassNode"})
+            return class_ids[i]
+
+        for c, (i, j) in enumerate(src.mappings):
+            cn = add_class(i)
+            dn = len(nodes)
+            nodes.append({
+                "id": dn,
+                "label": "{}.{}".format(self.class_name(i), self.prop_name(i, j)),
+                "type": "DataNode"
+            })
+            links.append({
+                "id": len(links),
+                "source": cn,
+                "target": dn,
+                "label": self.prop_name(i, j),
+                "type": "DataPropertyLink"
+            })
+            mappings.append({"attribute": c, "node": dn})
+
+        for i, t in src.links:
+            links.append({
+                "id": len(links),
+                "source": add_class(i),
+                "target": add_class(t),
+                "label": self.link_name(i),
+                "type": "ObjectPropertyLink"
+            })
+
+        attributes = [{
+            "id": c,
+            "name": name,
+            "label": "ident",
+            "columnIds": [c],
+            "sql": "select {} from '{}'".format(name, src.name)
+        } for c, name in enumerate(src.columns)]
+
+        return {
+            "version": "0.1",
+            "name": src.name,
+            "attributes": attributes,
+            "ontologies": [],
+            "semanticModel": {"nodes": nodes, "links": links},
+            "mappings": mappings
+        }
+
+    def map_rows(self, k):
+        """The (column, filename, class.property) rows of Serene.load map files"""
+        src = self.source(k)
+        return [(name, src.name, "{}.{}".format(self.class_name(i), self.prop_name(i, j)))
+                for name, (i, j) in zip(src.columns, src.mappings)]
+
+    def link_rows(self, k):
+        """The (filename, src, link, dst) rows of Serene.load link files"""
+        src = self.source(k)
+        return [(src.name, self.class_name(i), self.link_name(i), self.class_name(t))
+                for i, t in src.links]
+
+    def write(self, path, chunk_size=100000):
+        """
+        Writes the corpus into the directory `path`: ontology.ttl,
+        data/ with the dataset csv files and the labels.csv read by
+        load_specs_from_dir, ssd/<dataset>.ssd, and the map.csv and
+        link.csv files of Serene.load.
+
+        :return: SyntheticCorpus of the file paths
+        """
+        data_dir = os.path.join(path, 'data')
+        os.makedirs(data_dir, exist_ok=True)
+        os.makedirs(os.path.join(path, 'ssd'), exist_ok=True)
+
+        ontology = os.path.join(path, 'ontology.ttl')
+        with open(ontology, 'w') as f:
+            f.write(self.ontology_turtle())
+
+        datasets = []
+        ssds = []
+        map_rows = []
+        link_rows = []
+        for k in range(self.num_datasets):
+            name = self.source(k).name
+            datasets.append(os.path.join(data_dir, name))
+            self.write_csv(k, datasets[-1], chunk_size)
+
+            ssds.append(os.path.join(path, 'ssd', name + '.ssd'))
+            with open(ssds[-1], 'w') as f:
+                json.dump(self.ssd_json(k), f, indent=4)
+
+            map_rows.extend(self.map_rows(k))
+            link_rows.extend(self.link_rows(k))
+
+        map_file = os.path.join(path, 'map.csv')
+        link_file = os.path.join(path, 'link.csv')
+        labels_file = os.path.join(data_dir, 'labels.csv')
+        self._write_rows(map_file, ('column', 'filename', 'class'), map_rows)
+        self._write_rows(link_file, ('filename', 'src', 'link', 'dst'), link_rows)
+        self._write_rows(labels_file,
+                         ('dataset', 'column', 'label'),
+                         [(filename, column, label) for column, filename, label in map_rows])
+
+        return SyntheticCorpus(path, ontology, datasets, ssds, map_file, link_file, labels_file)
+
+    @staticmethod
+    def _write_rows(filename, header, rows):
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
@@ -0,0 +1,48 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the benchmark runner
+"""
+import io
+import tempfile
+
+import unittest2 as unittest
+
+from benchmarks import run
+
+
+class Bench(object):
+    params = [[1, 2], ['a', 'b', 'c']]
+    param_names = ['x', 'y']
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+    def test_param_sets(self):
+        self.assertEqual(len(run.param_sets(Bench)), 6)
+        self.assertEqual(run.param_sets(Bench, quick=True), [(1, 'a')])
+        self.assertEqual(run.param_sets(object), [()])
+
+    def test_discover(self):
+        names = [name for name, _, _ in run.discover('metrics')]
+        self.assertIn('bench_metrics.TimeMetrics.time_mrr', names)
+        self.assertTrue(all('metrics' in name for name in names))
+
+    def test_measure(self):
+        result = run.measure(lambda: None, repeat=3, min_time=0.001)
+        self.assertEqual(result['repeat'], 3)
+        self.assertLessEqual(result['min'], result['median'])
+
+    def test_compare(self):
+        base = {'a': {'min': 1.0}, 'b': {'min': 1.0}, 'c': {'min': 1.0}}
+        current = {'a': {'min': 1.5}, 'b': {'min': 1.0}}
+        regressed = run.compare(base, current, threshold=1.2, out=io.StringIO())
+        self.assertEqual(regressed, ['a'])
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as results_dir:
+            run.save({'a': {'min': 1.0}}, 'abc123', results_dir)
+            path = run.save({'b': {'min': 2.0}}, 'abc123', results_dir)
+            stored = run.load(path)
+        self.assertEqual(stored['commit'], 'abc123')
+        self.assertEqual(set(stored['results']), {'a', 'b'})
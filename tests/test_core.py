@@ -7,6 +7,7 @@ Tests the core module
 import unittest2 as unittest
 import serene
 import os
+from mock import Mock, patch
 from .utils import TestWithServer
 
 
@@ -69,3 +70,98 @@ class TestSerene(TestWithServer):
         self.assertEqual(len(ds), 5)
         self.assertEqual(len(on), 1)
         self.assertEqual(len(ssds), 5)
+
+
+class TestLoadPipeline(unittest.TestCase):
+    """
+    Tests the pipelined load, without a server
+    """
+    def setUp(self):
+        path = os.path.join(os.path.dirname(__file__), "resources")
+        self._test_owl = os.path.join(path, 'owl', 'dataintegration_report_ontology.ttl')
+        self._datasets = [os.path.join(path, 'data', f) for f in [
+            'businessInfo.csv',
+            'getCities.csv',
+            'getEmployees.csv',
+            'postalCodeLookup.csv',
+            'EmployeeAddressesSingleName.csv'
+        ]]
+        self._map_file = os.path.join(path, 'data', 'example-map-file.csv')
+        self._link_file = os.path.join(path, 'data', 'example-link-file.csv')
+
+        # a Serene object with mock endpoints...
+        self._serene = serene.Serene.__new__(serene.Serene)
+        self._serene._ontologies = Mock()
+        self._serene._ontologies.upload.side_effect = lambda o: Mock(id=1)
+        self._serene._datasets = Mock()
+        self._serene._datasets.upload.side_effect = \
+            lambda d, dedup: Mock(id=d, filename=os.path.basename(d), column_ids=lambda: [])
+        self._serene._ssds = Mock()
+        self._serene._ssds.upload.side_effect = lambda ssd, context: ssd
+
+    def test_load(self):
+        with patch.object(serene.Serene, "_build_ssd", side_effect=lambda ds, on, m, l: (ds, m)):
+            ds, on, ssds = self._serene.load(self._test_owl,
+                                             self._datasets,
+                                             self._map_file,
+                                             self._link_file,
+                                             max_workers=3)
+
+        # the results are in the order of the inputs...
+        self.assertEqual([d.id for d in ds], self._datasets)
+        self.assertEqual(len(on), 1)
+        self.assertEqual([s[0] for s in ssds], ds)
+        # ...with the mapping rows of each file
+        self.assertEqual(set(ssds[4][1]['column']), {'name', 'address', 'postcode'})
+
+        context = self._serene._ssds.upload.call_args[0][1]
+        self.assertIs(context.dataset(ds[2].id), ds[2])
+        self.assertEqual(self._serene._datasets.upload.call_count, 5)
+
+        timings = self._serene.load_timings
+        self.assertEqual(set(timings.index), {'ontologies', 'datasets', 'build', 'ssds', 'total'})
+        self.assertEqual(timings.loc['ssds', 'count'], 5)
+
+    def test_load_dedup(self):
+        # the deduplicated datasets keep the filename of their first upload...
+        self._serene._datasets.upload.side_effect = \
+            lambda d, dedup: Mock(id=d, filename='first.csv', column_ids=lambda: [])
+        with patch.object(serene.Serene, "_build_ssd", side_effect=lambda ds, on, m, l: (ds, m)):
+            ds, on, ssds = self._serene.load(self._test_owl,
+                                             self._datasets,
+                                             self._map_file,
+                                             self._link_file,
+                                             dedup=True)
+
+        for path, (_, rows) in zip(self._datasets, ssds):
+            self.assertEqual(set(rows['filename']), {os.path.basename(path)})
+
+    def test_bad_map_file(self):
+        self.assertRaises(Exception,
+                          self._serene.load,
+                          self._test_owl,
+                          self._datasets[:2],
+                          self._map_file,
+                          self._link_file)
+        self._serene._datasets.upload.assert_not_called()
+
+
+class TestPurge(unittest.TestCase):
+    """
+    Tests the server purge, without a server
+    """
+    def test_dependency_order(self):
+        calls = []
+        sn = serene.Serene.__new__(serene.Serene)
+        for name in ['_octopii', '_models', '_ssds', '_datasets', '_ontologies']:
+            endpoint = Mock()
+            endpoint._api.keys.return_value = [1, 2]
+            endpoint.remove_many.side_effect = lambda keys, max_workers, name=name: calls.append(name) or keys
+            setattr(sn, name, endpoint)
+
+        removed = sn.purge()
+        for name in ['_octopii', '_models', '_ssds', '_datasets', '_ontologies']:
+            getattr(sn, name).remove_many.assert_called_once_with([1, 2], max_workers=8)
+        self.assertEqual(calls[:3], ['_octopii', '_models', '_ssds'])
+        self.assertEqual(set(calls[3:]), {'_datasets', '_ontologies'})
+        self.assertEqual(list(removed), ['octopii', 'models', 'ssds', 'datasets', 'ontologies'])
@@ -5,10 +5,20 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 Tests the core module
 """
 import datetime
+import itertools
+import json
 import os
+import shutil
 import sys
+import tempfile
 from io import StringIO
 
+import pandas as pd
+
+import unittest2 as unittest
+from mock import Mock
+
+from serene.elements import Class
 from serene.elements.elements import ClassNode, Column, DataNode
 from serene.elements.octopus import Octopus
 from serene.elements.semantics.ontology import Ontology
@@ -565,3 +575,247 @@ class TestModelEndpoint(TestWithServer):
 
     def test_items(self):
         self.assertEqual(len(self.modelEndpoint.items), 1)
+
+
+class TestEndpointIndex(unittest.TestCase):
+    """
+    Tests the id index of the endpoints, without a server
+    """
+    @staticmethod
+    def dataset_json(key):
+        return {
+            'dateCreated': '2017-03-16T15:29:03.388',
+            'dateModified': '2017-03-16T15:29:03.388',
+            'description': '',
+            'filename': 'test.csv',
+            'id': key,
+            'path': 'test.csv',
+            'typeMap': {},
+            'columns': []
+        }
+
+    def setUp(self):
+        self.session = Mock()
+        self.api = self.session.dataset_api
+        self.api.keys.return_value = [1, 2]
+        self.api.item.side_effect = self.dataset_json
+        self.endpoint = DataSetEndpoint(self.session)
+        DataSetEndpoint.items.fget.cache_clear()
+
+    def test_get_from_items(self):
+        items = self.endpoint.items
+        self.assertIs(self.endpoint.get(2, refresh=False), items[1])
+        self.assertEqual(self.api.item.call_count, 2)
+
+    def test_get_miss(self):
+        ds = self.endpoint.get(5, refresh=False)
+        self.assertEqual(ds.id, 5)
+        self.assertIs(self.endpoint.get(5, refresh=False), ds)
+        self.api.item.assert_called_once_with(5)
+
+    def test_get_fresh(self):
+        # the datasets are fetched again by default...
+        ds = self.endpoint.get(5)
+        fresh = self.endpoint.get(5)
+        self.assertIsNot(fresh, ds)
+        self.assertEqual(self.api.item.call_count, 2)
+        self.assertIs(self.endpoint.get(5, refresh=False), fresh)
+
+    def test_summary(self):
+        summary = self.endpoint.summary
+        self.assertEqual(list(summary['id']), [1, 2])
+        self.assertEqual(list(summary['cols']), [0, 0])
+        # the items are not loaded...
+        self.assertEqual(self.endpoint._index, {})
+
+    def test_remove(self):
+        items = self.endpoint.items
+        self.endpoint.remove(items[0])
+        self.api.delete.assert_called_with(1)
+
+        self.endpoint.get(1)
+        self.assertEqual(self.api.item.call_args[0][0], 1)
+        self.assertEqual(self.api.item.call_count, 3)
+
+
+    def test_remove_many(self):
+        items = self.endpoint.items
+        self.assertEqual(self.endpoint.remove_many(items), [1, 2])
+        self.assertEqual(sorted(c[0][0] for c in self.api.delete.call_args_list), [1, 2])
+        self.assertEqual(self.endpoint._index, {})
+
+        # the items are listed again after the removal...
+        self.assertIsNot(self.endpoint.items, items)
+
+    def test_remove_many_errors(self):
+        self.api.delete.side_effect = lambda key: 1 / (key - 2)
+        self.assertRaises(Exception, self.endpoint.remove_many, [1, 2])
+        self.assertEqual(self.api.delete.call_count, 2)
+
+        # nothing is removed by default...
+        self.assertRaises(TypeError, self.endpoint.remove_many)
+        self.assertEqual(self.api.delete.call_count, 2)
+
+class TestOntologyUpload(unittest.TestCase):
+    """
+    Tests the in-memory ontology upload, without a server
+    """
+    @staticmethod
+    def ontology_json(key):
+        return {
+            'id': key,
+            'name': 'test.ttl',
+            'description': '',
+            'dateCreated': '2017-03-16T15:29:03.388',
+            'dateModified': '2017-03-16T15:29:03.388'
+        }
+
+    def setUp(self):
+        self.session = Mock()
+        self.api = self.session.ontology_api
+        self.api.post.side_effect = lambda **kwargs: self.ontology_json(7)
+        self.api.update.side_effect = lambda key, **kwargs: self.ontology_json(key)
+        self.endpoint = OntologyEndpoint(self.session)
+
+        self.ontology = Ontology().uri("http://test.com/ns")
+        self.ontology.add_class_node(Class("Person"))
+
+    def test_upload_buffer(self):
+        result = self.endpoint.upload(self.ontology)
+        self.assertIs(result, self.ontology)
+        self.assertTrue(result.stored)
+        self.assertEqual(result.server, str(self.api._uri))
+
+        kwargs = self.api.post.call_args[1]
+        self.assertEqual(kwargs["owl_format"], "ttl")
+        self.assertEqual(kwargs["file_path"].getvalue(), self.ontology.to_bytes())
+
+    def test_unchanged_upload_skipped(self):
+        self.endpoint.upload(self.ontology)
+        self.endpoint.upload(self.ontology)
+        self.assertEqual(self.api.post.call_count, 1)
+
+        # a changed ontology is uploaded again...
+        self.ontology.add_class_node(Class("Place"))
+        self.endpoint.upload(self.ontology)
+        self.assertEqual(self.api.post.call_count, 2)
+
+    def test_file_uploads(self):
+        path = os.path.join(os.path.dirname(__file__), "resources", "owl", "dataintegration_report_ontology.ttl")
+        self.endpoint.upload(path)
+        self.endpoint.upload(path)
+        self.assertEqual(self.api.post.call_count, 2)
+        self.assertEqual(self.api.post.call_args[1]["file_path"], path)
+
+    def test_unchanged_update_skipped(self):
+        self.endpoint.upload(self.ontology)
+        self.endpoint.update(self.ontology)
+        self.api.update.assert_not_called()
+
+        self.endpoint.update(self.ontology, description="new")
+        self.assertEqual(self.api.update.call_args[0][0], 7)
+
+    def test_removed_upload(self):
+        self.endpoint.upload(self.ontology)
+        self.endpoint.remove(self.ontology)
+        self.endpoint.upload(self.ontology)
+        self.assertEqual(self.api.post.call_count, 2)
+
+
+class TestDataSetDedup(unittest.TestCase):
+    """
+    Tests the content hash deduplication of the dataset uploads
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.temp_dir, "index.json")
+        self.session = Mock()
+        self.api = self.session.dataset_api
+
+        self.uploads = {}
+        self.rows = {}
+        self.posted = {}
+        keys = itertools.count(1)
+
+        def post(file_path, description, type_map):
+            key = next(keys)
+            self.posted[key] = pd.read_csv(file_path)
+            self.rows[key] = len(self.posted[key])
+            self.uploads[key] = TestEndpointIndex.dataset_json(key)
+            self.uploads[key]["typeMap"] = type_map
+            return self.uploads[key]
+
+        self.api.post.side_effect = post
+        self.api.item.side_effect = lambda key: self.uploads[key]
+        self.endpoint = DataSetEndpoint(self.session, index_path=self.index_path)
+        self.df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_frame_and_file(self):
+        first = self.endpoint.upload(self.df, dedup=True)
+        self.assertEqual(self.endpoint.upload(self.df, dedup=True).id, first.id)
+
+        # the same content from a file, read by a new endpoint...
+        path = os.path.join(self.temp_dir, "test.csv")
+        self.df.to_csv(path, index=False)
+        endpoint = DataSetEndpoint(self.session, index_path=self.index_path)
+        self.assertEqual(endpoint.upload(path, dedup=True).id, first.id)
+        self.assertEqual(self.api.post.call_count, 1)
+
+    def test_type_map(self):
+        first = self.endpoint.upload(self.df, dedup=True)
+        second = self.endpoint.upload(self.df, type_map={"a": "string"}, dedup=True)
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(self.endpoint.upload(self.df, type_map={"a": "string"}, dedup=True).id, second.id)
+        self.assertEqual(self.api.post.call_count, 2)
+
+    def test_removed_dataset(self):
+        first = self.endpoint.upload(self.df, dedup=True)
+        self.endpoint.remove(first)
+        del self.uploads[first.id]
+
+        self.endpoint.upload(self.df, dedup=True)
+        self.assertEqual(self.api.post.call_count, 2)
+        with open(self.index_path) as f:
+            self.assertEqual(list(json.load(f).values()), [[2]])
+
+    def test_removed_elsewhere(self):
+        # removed by another client, the index still holds it...
+        first = self.endpoint.upload(self.df, dedup=True)
+        del self.uploads[first.id]
+
+        self.assertNotEqual(self.endpoint.upload(self.df, dedup=True).id, first.id)
+        self.assertEqual(self.api.post.call_count, 2)
+
+    def test_no_dedup(self):
+        self.endpoint.upload(self.df)
+        self.endpoint.upload(self.df)
+        self.assertEqual(self.api.post.call_count, 2)
+        self.assertFalse(os.path.exists(self.index_path))
+
+    def test_sample(self):
+        path = os.path.join(self.temp_dir, "test.csv")
+        pd.DataFrame({"a": range(100), "b": ["x", "y"] * 50}).to_csv(path, index=False)
+
+        first = self.endpoint.upload(path, sample=10, seed=1, dedup=True)
+        self.assertEqual(self.rows[first.id], 10)
+        # the same seed gives the same sample...
+        self.assertEqual(self.endpoint.upload(path, sample=10, seed=1, dedup=True).id, first.id)
+        self.assertNotEqual(self.endpoint.upload(path, sample=10, seed=2, dedup=True).id, first.id)
+        # the full file for prediction...
+        full = self.endpoint.upload(path, dedup=True)
+        self.assertEqual(self.rows[full.id], 100)
+        self.assertEqual(self.api.post.call_count, 3)
+
+    def test_sample_frame(self):
+        df = pd.DataFrame({"a": range(1000), "b": ["rare"] + ["common"] * 999})
+        dataset = self.endpoint.upload(df, sample=20, seed=3, stratify="b")
+
+        posted = self.posted[dataset.id]
+        self.assertEqual(list(posted.columns), ["a", "b"])
+        self.assertEqual(len(posted), 20)
+        self.assertIn("rare", set(posted["b"]))
+        # the rows are uploaded as they are in the source...
+        self.assertEqual(list(posted["b"]), list(df["b"][posted["a"]]))
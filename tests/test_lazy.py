@@ -0,0 +1,66 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the lazy imports of the package
+"""
+import json
+import subprocess
+import sys
+
+import unittest2 as unittest
+
+import serene
+
+# the libraries that `import serene` should leave until they are needed
+HEAVY_MODULES = ('pandas', 'numpy', 'networkx', 'rdflib', 'sklearn', 'pygraphviz', 'requests')
+
+SCRIPT = """
+import json, sys
+before = set(sys.modules)
+{}
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def new_modules(statement):
+    """The top level modules that `statement` imports in a fresh interpreter"""
+    out = subprocess.check_output([sys.executable, '-c', SCRIPT.format(statement)])
+    return {name.split('.')[0] for name in json.loads(out.decode('utf-8'))}
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_import_is_light(self):
+        modules = new_modules("import serene")
+        self.assertIn('serene', modules)
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+
+    def test_session_is_light(self):
+        modules = new_modules("from serene import Session")
+        self.assertIn('requests', modules)
+        self.assertNotIn('pandas', modules)
+
+    def test_attributes(self):
+        from serene.elements.semantics.ssd import SSD
+        from serene.matcher.model import Model
+        self.assertIs(serene.SSD, SSD)
+        self.assertIs(serene.elements.SSD, SSD)
+        self.assertIs(serene.Model, Model)
+        self.assertIn('SSD', dir(serene))
+
+    def test_subpackages(self):
+        # a fresh interpreter, where no other import has loaded the subpackages...
+        statement = ("import serene; "
+                     "ssd = serene.elements.SSD; "
+                     "session = serene.api.Session; "
+                     "model = serene.matcher.Model; "
+                     "from serene.elements.semantics.ssd import SSD; "
+                     "assert ssd is SSD")
+        subprocess.check_call([sys.executable, '-c', statement])
+        self.assertRaises(AttributeError, getattr, serene, 'notamodule')
+
+    def test_missing(self):
+        self.assertRaises(AttributeError, getattr, serene, 'NotAClass')
+        with self.assertRaises(ImportError):
+            from serene import NotAClass
@@ -0,0 +1,70 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the row sampling
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import unittest2 as unittest
+
+from serene.sampling import RowSampler
+
+
+class TestRowSampler(unittest.TestCase):
+    def setUp(self):
+        n = 5000
+        classes = np.where(np.arange(n) % 2 == 0, 'even', 'odd').astype(object)
+        classes[1234] = 'rare'
+        self.df = pd.DataFrame({'id': np.arange(n), 'class': classes})
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tempdir.name, 'data.csv')
+        self.df.to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_sample(self):
+        sample = RowSampler(100, seed=1, chunk_size=300).sample(self.path)
+        self.assertEqual(len(sample), 100)
+        self.assertEqual(list(sample.columns), ['id', 'class'])
+        ids = sample['id'].astype(int)
+        # in the source order, without repeats...
+        self.assertTrue(ids.is_monotonic_increasing and ids.is_unique)
+        self.assertEqual(list(sample['class']), list(self.df['class'][ids]))
+
+    def test_seed(self):
+        sample = RowSampler(100, seed=1).sample(self.path)
+        # the same rows whatever the chunk size or source...
+        pd.testing.assert_frame_equal(sample, RowSampler(100, seed=1, chunk_size=77).sample(self.path))
+        frame = RowSampler(100, seed=1, chunk_size=1000).sample(self.df)
+        self.assertEqual(list(frame['id']), list(sample['id'].astype(int)))
+        self.assertFalse(sample.equals(RowSampler(100, seed=2).sample(self.path)))
+
+    def test_uniform(self):
+        # every row is as likely to be sampled...
+        counts = np.zeros(10)
+        for seed in range(400):
+            sample = RowSampler(3, seed=seed, chunk_size=4).sample(self.df.head(10))
+            counts[sample['id']] += 1
+        self.assertLess(np.max(np.abs(counts - 120)), 40)
+
+    def test_stratify(self):
+        sample = RowSampler(100, seed=1, stratify='class').sample(self.path)
+        self.assertEqual(len(sample), 100)
+        self.assertIn('rare', set(sample['class']))
+        self.assertTrue(sample['id'].astype(int).is_unique)
+
+        # more values than rows...
+        sample = RowSampler(10, stratify=['class', 'id']).sample(self.df)
+        self.assertEqual(len(sample), 10)
+
+        self.assertRaises(ValueError, RowSampler(10, stratify='name').sample, self.df)
+        self.assertRaises(ValueError, RowSampler, 0)
+
+    def test_small(self):
+        sample = RowSampler(100).sample(self.df.head(20))
+        pd.testing.assert_frame_equal(sample, self.df.head(20))
@@ -0,0 +1,49 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the in-process stand-in server
+"""
+import os
+import time
+
+import unittest2 as unittest
+
+from serene import Serene
+from serene.api.exceptions import NotFoundError
+from .standin import StandInServer
+
+
+class TestStandInServer(unittest.TestCase):
+    def setUp(self):
+        path = os.path.join(os.path.dirname(__file__), "resources")
+        self._business_file = os.path.join(path, 'data', 'businessInfo.csv')
+        self._test_owl = os.path.join(path, 'owl', 'dataintegration_report_ontology.ttl')
+        self.server = StandInServer(seed=0).start()
+        self.sn = Serene(self.server.host, self.server.port, None, None, False)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_dataset(self):
+        dataset = self.sn.datasets.upload(self._business_file, description="business")
+        self.assertEqual(dataset.description, "business")
+        self.assertGreater(len(dataset.columns), 0)
+        self.assertEqual(self.sn.datasets.get(dataset.id).id, dataset.id)
+
+        self.sn.datasets.remove(dataset)
+        self.assertEqual(len(self.sn.datasets.items), 0)
+
+    def test_ontology(self):
+        ontology = self.sn.ontologies.upload(self._test_owl)
+        with open(self._test_owl, 'rb') as f:
+            self.assertEqual(self.server.store.owl_file(ontology.id), f.read())
+
+    def test_not_found(self):
+        self.assertRaises(NotFoundError, self.sn.session.dataset_api.item, 1)
+
+    def test_latency(self):
+        self.server.latency = 0.05
+        start = time.time()
+        self.sn.session.dataset_api.keys()
+        self.assertGreaterEqual(time.time() - start, 0.05)
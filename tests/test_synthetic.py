@@ -0,0 +1,104 @@
+"""
+Copyright (C) 2017 Data61 CSIRO
+Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
+
+Tests the synthetic corpus generator
+"""
+import os
+import tempfile
+
+import pandas as pd
+import unittest2 as unittest
+
+from serene import Serene
+from serene.elements import SSD
+from serene.elements.semantics.ontology import RDFReader
+from serene.matcher.eval import load_specs_from_dir
+from .standin import StandInServer
+from .synthetic import SyntheticGenerator, SYNTHETIC_NS
+
+
+class TestSyntheticGenerator(unittest.TestCase):
+    def setUp(self):
+        self.gen = SyntheticGenerator(num_classes=12,
+                                      num_props=3,
+                                      depth=3,
+                                      num_datasets=3,
+                                      num_columns=7,
+                                      num_rows=25)
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.corpus = self.gen.write(self._tempdir.name, chunk_size=10)
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, SyntheticGenerator, num_classes=2, num_props=2, num_columns=5)
+
+    def test_ontology(self):
+        ontology = RDFReader().to_ontology(self.corpus.ontology)
+        self.assertEqual(len(ontology.class_nodes), 12)
+        self.assertEqual(str(ontology.namespace), SYNTHETIC_NS)
+
+        parents = {c.label: c.parent.label for c in ontology.class_nodes if c.parent is not None}
+        self.assertEqual(parents, {
+            "Class1": "Class0", "Class2": "Class1",
+            "Class4": "Class3", "Class5": "Class4",
+            "Class7": "Class6", "Class8": "Class7",
+            "Class10": "Class9", "Class11": "Class10"
+        })
+
+    def test_datasets(self):
+        df = pd.read_csv(self.corpus.datasets[1])
+        self.assertEqual(df.shape, (25, 7))
+        self.assertEqual(list(df.columns), self.gen.source(1).columns)
+        # the chunks give the same rows as the written file...
+        chunks = pd.concat(self.gen.frames(1, chunk_size=10), ignore_index=True)
+        self.assertTrue(chunks.astype(str).equals(pd.read_csv(self.corpus.datasets[1], dtype=str)))
+
+    def test_deterministic(self):
+        other = SyntheticGenerator(num_classes=12, num_props=3, num_columns=7, num_rows=25)
+        self.assertTrue(other.frame(2).equals(self.gen.frame(2)))
+
+    def test_labels(self):
+        datasets, labels = load_specs_from_dir(os.path.dirname(self.corpus.labels_file))
+        self.assertEqual(len(datasets), 3)
+        self.assertEqual(len(labels), 21)
+        self.assertIn(("synthetic0.csv", "prop0_0_col0", "Class0.prop0_0"), labels)
+
+    def test_ssd_json(self):
+        blob = self.gen.ssd_json(0)
+        self.assertEqual(len(blob['mappings']), 7)
+        # 3 classes with 7 data nodes, linked in a chain
+        self.assertEqual(len(blob['semanticModel']['nodes']), 10)
+        self.assertEqual(len(blob['semanticModel']['links']), 9)
+
+
+class TestSyntheticUpload(unittest.TestCase):
+    def setUp(self):
+        self.gen = SyntheticGenerator(num_classes=8, num_props=2, num_datasets=2, num_columns=5, num_rows=10)
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.corpus = self.gen.write(self._tempdir.name)
+        self.server = StandInServer(seed=0).start()
+        self.sn = Serene(self.server.host, self.server.port, None, None, False)
+
+    def tearDown(self):
+        self.server.stop()
+        self._tempdir.cleanup()
+
+    def test_load(self):
+        datasets, ontologies, ssds = self.sn.load(self.corpus.ontology,
+                                                  self.corpus.datasets,
+                                                  self.corpus.map_file,
+                                                  self.corpus.link_file)
+        self.assertEqual(len(ssds), 2)
+        self.assertEqual(len(ssds[0].mappings), 5)
+
+    def test_bind_ssd(self):
+        dataset = self.sn.datasets.upload(self.corpus.datasets[0])
+        ontology = self.sn.ontologies.upload(self.corpus.ontology)
+        blob = dataset.bind_ssd(self.corpus.ssds[0], [ontology], SYNTHETIC_NS)
+
+        ssd = SSD(dataset, [ontology]).update(blob, self.sn.datasets, self.sn.ontologies)
+        self.assertEqual(len(ssd.mappings), 5)
+        self.assertEqual(len(ssd.class_nodes), 3)
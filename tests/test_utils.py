@@ -4,8 +4,14 @@ Licensed under http://www.apache.org/licenses/LICENSE-2.0 <see LICENSE file>
 
 Tests the core module
 """
+import hashlib
+import io
+
+import pandas as pd
 import unittest2 as unittest
 
+from serene.utils import HashWriter, flatten_dict
+
 
 class TestDateConverter(unittest.TestCase):
     """
@@ -13,4 +19,27 @@ class TestDateConverter(unittest.TestCase):
     """
 
     def test_junk(self):
-        raise NotImplementedError("Test not implemented")
\ No newline at end of file
+        raise NotImplementedError("Test not implemented")
+
+class TestFlattenDict(unittest.TestCase):
+    def test_flatten(self):
+        nested = {'a': 1, 'c': {'a': 2, 'b': {'x': 5, 'y': 10}}, 'd': [1, 2, 3]}
+        self.assertEqual(flatten_dict(nested), {'a': 1, 'c_a': 2, 'c_b_x': 5, 'c_b_y': 10, 'd': [1, 2, 3]})
+        self.assertEqual(flatten_dict({'a': {'b': 1}}, sep='.'), {'a.b': 1})
+
+
+class TestHashWriter(unittest.TestCase):
+    """
+    Tests the hashing text writer
+    """
+    def test_to_csv(self):
+        df = pd.DataFrame({"a": [1, 2], "b": ["x", "\u00e9"]})
+        f = io.BytesIO()
+        writer = HashWriter(f)
+        # pandas takes it as a file object...
+        df.to_csv(writer, index=False)
+
+        data = df.to_csv(index=False).encode('utf-8')
+        self.assertEqual(f.getvalue(), data)
+        self.assertEqual(writer.hexdigest(), hashlib.sha256(data).hexdigest())
+        self.assertTrue(writer.writable())
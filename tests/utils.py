@@ -12,6 +12,7 @@ import requests
 import time
 
 from serene import Session, Serene
+from .standin import StandInServer
 
 
 class SereneTestServer(object):
@@ -26,12 +27,22 @@ class SereneTestServer(object):
         self.host = None
         self.port = None
         self.SERENE_TEST_SERVER_PATH = 'SERENE_TEST_SERVER_PATH'
+        self.SERENE_TEST_STANDIN = 'SERENE_TEST_STANDIN'
 
     def setup(self):
         path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests")
         with open(os.path.join(path, 'config.yaml'), 'r') as stream:
             config = yaml.load(stream)
 
+        # The in-process stand-in server replaces the Serene backend if
+        # use-standin-server is true, or SERENE_TEST_STANDIN is defined
+        if config.get('use-standin-server') or self.SERENE_TEST_STANDIN in os.environ:
+            self.server = StandInServer(latency=float(config.get('standin-latency', 0.0))).start()
+            self.host = self.server.host
+            self.port = self.server.port
+            print("Started stand-in server at {}".format(self.server.uri))
+            return
+
         # Test if we need to launch a server here...
         launch_server = config['launch-test-server']
 
@@ -93,7 +104,10 @@ class SereneTestServer(object):
         return False
 
     def tear_down(self):
-        self.server.kill()
+        if isinstance(self.server, StandInServer):
+            self.server.stop()
+        else:
+            self.server.kill()
 
 
 class TestWithServer(unittest.TestCase):